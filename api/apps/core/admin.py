@@ -41,3 +41,4 @@ class UserAdmin(BaseUserAdmin):
 admin.site.register(models.User, UserAdmin)
 admin.site.register(models.Resource)
 admin.site.register(models.Allocation)
+admin.site.register(models.Reservation)
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.apps.core'
+
+    def ready(self):
+        from django.db.models import CharField
+
+        from api.apps.core.lookups import ImmutableUnaccent
+
+        CharField.register_lookup(ImmutableUnaccent)
@@ -0,0 +1,9 @@
+from django.db.models import Transform
+
+
+class ImmutableUnaccent(Transform):
+    """``unaccent()`` wrapped in a function PostgreSQL accepts in indexes."""
+
+    bilateral = True
+    lookup_name = 'immutable_unaccent'
+    function = 'immutable_unaccent'
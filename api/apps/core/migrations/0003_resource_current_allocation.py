@@ -0,0 +1,37 @@
+# Generated by Django 4.1.5 on 2026-10-18 10:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_current_allocation(apps, schema_editor):
+    Resource = apps.get_model('core', 'Resource')
+    Allocation = apps.get_model('core', 'Allocation')
+
+    Resource.objects.update(
+        current_allocation=models.Subquery(
+            Allocation.objects.filter(
+                resource_id=models.OuterRef('pk'),
+                return_date__isnull=True
+            ).order_by('-allocation_date', '-id').values('id')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_allocation_allocation_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resource',
+            name='current_allocation',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.allocation'),
+        ),
+        migrations.RunPython(
+            backfill_current_allocation,
+            migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 4.1.5 on 2026-10-18 10:22
+
+from django.db import migrations, models
+
+
+def close_duplicate_open_allocations(apps, schema_editor):
+    # Concurrent requests could double-allocate a resource before this
+    # constraint existed. Keep the newest open allocation and close each
+    # older one when the next one started.
+    Allocation = apps.get_model('core', 'Allocation')
+
+    resource_ids = Allocation.objects.filter(
+        return_date__isnull=True
+    ).values('resource_id').annotate(
+        open_allocations=models.Count('id')
+    ).filter(open_allocations__gt=1).values_list('resource_id', flat=True)
+
+    for resource_id in resource_ids:
+        allocations = list(
+            Allocation.objects.filter(
+                resource_id=resource_id,
+                return_date__isnull=True
+            ).order_by('-allocation_date', '-id')
+        )
+
+        for newer, older in zip(allocations, allocations[1:]):
+            older.return_date = newer.allocation_date
+            older.save(update_fields=['return_date'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_resource_current_allocation'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            close_duplicate_open_allocations,
+            migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='allocation',
+            constraint=models.UniqueConstraint(condition=models.Q(('return_date__isnull', True)), fields=('resource',), name='unique_open_allocation_per_resource'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.1.5 on 2026-10-18 10:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_unique_open_allocation_per_resource'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='allocation',
+            index=models.Index(fields=['resource', '-allocation_date', 'id'], name='allocation_resource_date_idx'),
+        ),
+        migrations.AlterField(
+            model_name='allocation',
+            name='resource',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, to='core.resource'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.1.5 on 2026-10-18 10:24
+
+import api.apps.core.lookups
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_allocation_resource_date_idx'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # unaccent() is only STABLE, so it cannot be used in an index
+        # expression. Pinning the dictionary makes the wrapper immutable.
+        migrations.RunSQL(
+            sql=(
+                "CREATE OR REPLACE FUNCTION immutable_unaccent(text) "
+                "RETURNS text AS "
+                "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$ "  # noqa: E501
+                "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT"
+            ),
+            reverse_sql="DROP FUNCTION IF EXISTS immutable_unaccent(text)"
+        ),
+        migrations.AddIndex(
+            model_name='resource',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(api.apps.core.lookups.ImmutableUnaccent('name')), name='gin_trgm_ops'), name='resource_name_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper(api.apps.core.lookups.ImmutableUnaccent('name')), name='gin_trgm_ops'), name='user_name_trgm_idx'),
+        ),
+    ]
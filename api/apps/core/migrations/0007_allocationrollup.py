@@ -0,0 +1,31 @@
+# Generated by Django 4.1.5 on 2026-10-18 10:42
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_trigram_name_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AllocationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('allocated_time', models.DurationField()),
+                ('allocations', models.PositiveIntegerField()),
+                ('started', models.PositiveIntegerField()),
+                ('resource', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.resource')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='allocationrollup',
+            constraint=models.UniqueConstraint(fields=('day', 'resource', 'user'), name='unique_allocation_rollup'),
+        ),
+    ]
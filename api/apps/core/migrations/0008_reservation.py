@@ -0,0 +1,39 @@
+# Generated by Django 4.1.5 on 2026-10-18 10:45
+
+from django.conf import settings
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_allocationrollup'),
+    ]
+
+    operations = [
+        # The exclusion constraint compares the resource ids with GiST.
+        BtreeGistExtension(),
+        migrations.CreateModel(
+            name='Reservation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('period', django.contrib.postgres.fields.ranges.DateTimeRangeField()),
+                ('resource', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='core.resource')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='reservation',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(expressions=(('resource', '='), ('period', '&&')), name='exclude_overlapping_reservations'),
+        ),
+        migrations.AddConstraint(
+            model_name='reservation',
+            constraint=models.CheckConstraint(check=models.Q(('period__isempty', False), ('period__lower_inf', False), ('period__upper_inf', False)), name='bounded_reservation_period'),
+        ),
+    ]
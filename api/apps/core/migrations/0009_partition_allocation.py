@@ -0,0 +1,205 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# The allocations are copied into a table partitioned by month of
+# ``allocation_date``, with partitions from the first allocation up to three
+# months ahead and a default partition for anything outside of them. Later
+# partitions are created by the ``allocation_partitions`` command.
+PARTITION_SQL = '''
+CREATE SEQUENCE core_allocation_partitioned_id_seq;
+
+CREATE TABLE core_allocation_partitioned (
+    id bigint NOT NULL
+        DEFAULT nextval('core_allocation_partitioned_id_seq'),
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    return_date timestamp with time zone NULL,
+    resource_id bigint NOT NULL,
+    user_id bigint NOT NULL,
+    allocation_date timestamp with time zone NOT NULL,
+    PRIMARY KEY (id, allocation_date)
+) PARTITION BY RANGE (allocation_date);
+
+CREATE TABLE core_allocation_default
+    PARTITION OF core_allocation_partitioned DEFAULT;
+
+DO $$
+DECLARE
+    month timestamp;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc(
+                'month',
+                COALESCE(
+                    (SELECT min(allocation_date) FROM core_allocation),
+                    now()
+                ) AT TIME ZONE 'UTC'
+            ),
+            date_trunc('month', now() AT TIME ZONE 'UTC')
+                + interval '3 months',
+            interval '1 month'
+        )
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF core_allocation_partitioned '
+            'FOR VALUES FROM (%L) TO (%L)',
+            'core_allocation_p' || to_char(month, 'YYYY_MM'),
+            month AT TIME ZONE 'UTC',
+            (month + interval '1 month') AT TIME ZONE 'UTC'
+        );
+    END LOOP;
+END
+$$;
+
+INSERT INTO core_allocation_partitioned (
+    id, created_at, updated_at, return_date, resource_id, user_id,
+    allocation_date
+)
+SELECT
+    id, created_at, updated_at, return_date, resource_id, user_id,
+    allocation_date
+FROM core_allocation;
+
+SELECT setval(
+    'core_allocation_partitioned_id_seq',
+    COALESCE((SELECT max(id) FROM core_allocation), 0) + 1,
+    false
+);
+
+DROP TABLE core_allocation;
+
+ALTER TABLE core_allocation_partitioned RENAME TO core_allocation;
+ALTER TABLE core_allocation
+    RENAME CONSTRAINT core_allocation_partitioned_pkey TO core_allocation_pkey;
+ALTER SEQUENCE core_allocation_partitioned_id_seq
+    RENAME TO core_allocation_id_seq;
+ALTER SEQUENCE core_allocation_id_seq OWNED BY core_allocation.id;
+
+ALTER TABLE core_allocation
+    ADD CONSTRAINT core_allocation_resource_id_b21cb1ae_fk_core_resource_id
+    FOREIGN KEY (resource_id) REFERENCES core_resource (id)
+    DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE core_allocation
+    ADD CONSTRAINT core_allocation_user_id_28edf040_fk_core_user_id
+    FOREIGN KEY (user_id) REFERENCES core_user (id)
+    DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX core_allocation_user_id_28edf040
+    ON core_allocation (user_id);
+CREATE INDEX allocation_resource_date_idx
+    ON core_allocation (resource_id, allocation_date DESC, id);
+CREATE INDEX open_allocation_resource_idx
+    ON core_allocation (resource_id) WHERE return_date IS NULL;
+
+-- Concurrent writers of open allocations of a resource are serialized by
+-- its row lock, which the allocation views already hold.
+CREATE FUNCTION unique_open_allocation_per_resource() RETURNS trigger AS $$
+BEGIN
+    IF NEW.return_date IS NULL THEN
+        PERFORM 1 FROM core_resource
+        WHERE id = NEW.resource_id
+        FOR NO KEY UPDATE;
+
+        IF EXISTS (
+            SELECT 1 FROM core_allocation
+            WHERE resource_id = NEW.resource_id
+                AND return_date IS NULL
+                AND id <> NEW.id
+        ) THEN
+            RAISE unique_violation USING MESSAGE = format(
+                'Resource %s already has an open allocation.',
+                NEW.resource_id
+            );
+        END IF;
+    END IF;
+
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER unique_open_allocation_per_resource
+    BEFORE INSERT OR UPDATE OF return_date, resource_id ON core_allocation
+    FOR EACH ROW EXECUTE FUNCTION unique_open_allocation_per_resource();
+'''
+
+UNPARTITION_SQL = '''
+DROP TRIGGER unique_open_allocation_per_resource ON core_allocation;
+DROP FUNCTION unique_open_allocation_per_resource();
+
+ALTER SEQUENCE core_allocation_id_seq OWNED BY NONE;
+
+CREATE TABLE core_allocation_unpartitioned (
+    id bigint NOT NULL DEFAULT nextval('core_allocation_id_seq'),
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL,
+    return_date timestamp with time zone NULL,
+    resource_id bigint NOT NULL,
+    user_id bigint NOT NULL,
+    allocation_date timestamp with time zone NOT NULL
+);
+
+INSERT INTO core_allocation_unpartitioned
+SELECT
+    id, created_at, updated_at, return_date, resource_id, user_id,
+    allocation_date
+FROM core_allocation;
+
+DROP TABLE core_allocation;
+
+ALTER TABLE core_allocation_unpartitioned RENAME TO core_allocation;
+ALTER TABLE core_allocation
+    ADD CONSTRAINT core_allocation_pkey PRIMARY KEY (id);
+ALTER SEQUENCE core_allocation_id_seq OWNED BY core_allocation.id;
+
+ALTER TABLE core_allocation
+    ADD CONSTRAINT core_allocation_resource_id_b21cb1ae_fk_core_resource_id
+    FOREIGN KEY (resource_id) REFERENCES core_resource (id)
+    DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE core_allocation
+    ADD CONSTRAINT core_allocation_user_id_28edf040_fk_core_user_id
+    FOREIGN KEY (user_id) REFERENCES core_user (id)
+    DEFERRABLE INITIALLY DEFERRED;
+
+CREATE INDEX core_allocation_user_id_28edf040
+    ON core_allocation (user_id);
+CREATE INDEX allocation_resource_date_idx
+    ON core_allocation (resource_id, allocation_date DESC, id);
+CREATE UNIQUE INDEX unique_open_allocation_per_resource
+    ON core_allocation (resource_id) WHERE return_date IS NULL;
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_reservation'),
+    ]
+
+    operations = [
+        # Drops the foreign key constraint, which needs a unique ``id``.
+        migrations.AlterField(
+            model_name='resource',
+            name='current_allocation',
+            field=models.ForeignKey(blank=True, db_constraint=False, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.allocation'),
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(
+                    sql=PARTITION_SQL,
+                    reverse_sql=UNPARTITION_SQL
+                )
+            ],
+            state_operations=[
+                migrations.RemoveConstraint(
+                    model_name='allocation',
+                    name='unique_open_allocation_per_resource',
+                ),
+                migrations.AddIndex(
+                    model_name='allocation',
+                    index=models.Index(condition=models.Q(('return_date__isnull', True)), fields=['resource'], name='open_allocation_resource_idx'),
+                ),
+            ]
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 4.1.5 on 2026-10-18 11:26
+
+from datetime import (
+    date,
+    timedelta
+)
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# Rollups refreshed before the coverage was tracked are assumed to cover
+# every day between the first and the last one.
+def add_rollup_days(apps, schema_editor):
+    AllocationRollup = apps.get_model('core', 'AllocationRollup')
+    AllocationRollupDay = apps.get_model('core', 'AllocationRollupDay')
+
+    days = AllocationRollup.objects.aggregate(
+        first=models.Min('day'),
+        last=models.Max('day')
+    )
+
+    if days['first'] is None:
+        return
+
+    now = timezone.now()
+
+    AllocationRollupDay.objects.bulk_create(
+        AllocationRollupDay(
+            day=days['first'] + timedelta(days=offset),
+            refreshed_at=now
+        )
+        for offset in range((days['last'] - days['first']).days + 1)
+    )
+
+
+# Partitions detached before are still there as plain tables.
+def add_detached_months(apps, schema_editor):
+    DetachedAllocationMonth = apps.get_model(
+        'core',
+        'DetachedAllocationMonth'
+    )
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relname FROM pg_class "
+            "WHERE relkind = 'r' AND NOT relispartition "
+            "AND relnamespace = current_schema()::regnamespace "
+            "AND relname ~ '^core_allocation_p[0-9]{4}_[0-9]{2}$'"
+        )
+
+        DetachedAllocationMonth.objects.bulk_create(
+            DetachedAllocationMonth(
+                month=date(int(name[-7:-3]), int(name[-2:]), 1)
+            )
+            for name, in cursor.fetchall()
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_partition_allocation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AllocationRollupDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DetachedAllocationMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(unique=True)),
+                ('detached_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RunPython(add_rollup_days, migrations.RunPython.noop),
+        migrations.RunPython(add_detached_months, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,27 @@
-from django.db import models
+from django.db import (
+    models,
+    transaction
+)
 from django.conf import settings
 from django.utils.timezone import now
+from django.db.models.functions import Upper
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import (
+    DateTimeRangeField,
+    RangeOperators
+)
+from django.contrib.postgres.indexes import (
+    GinIndex,
+    OpClass
+)
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin
 )
 
+from api.apps.core.lookups import ImmutableUnaccent
+
 
 class UserManager(BaseUserManager):
 
@@ -43,6 +58,17 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     USERNAME_FIELD = 'email'
 
+    class Meta:
+        indexes = [
+            GinIndex(
+                OpClass(
+                    Upper(ImmutableUnaccent('name')),
+                    name='gin_trgm_ops'
+                ),
+                name='user_name_trgm_idx'
+            )
+        ]
+
     def __str__(self):
         return self.name
 
@@ -58,23 +84,203 @@ class Base(models.Model):
 class Resource(Base):
     name = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
+    # Allocation ids are not unique on their own in the partitioned table,
+    # so the database cannot enforce this reference.
+    current_allocation = models.ForeignKey(
+        'Allocation',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        blank=True,
+        null=True,
+        editable=False,
+        db_constraint=False
+    )
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                OpClass(
+                    Upper(ImmutableUnaccent('name')),
+                    name='gin_trgm_ops'
+                ),
+                name='resource_name_trgm_idx'
+            )
+        ]
 
     @property
     def is_allocated(self):
-        return Allocation.objects.filter(
-            resource_id=self.id,
-            return_date__isnull=True
-        ).exists()
+        return self.current_allocation_id is not None
+
+    def save(self, *args, **kwargs):
+        # The pointer is only written along with the allocations, see
+        # ``Allocation.sync_resource_current_allocation``, so an edit of a row
+        # read before an allocation or return commits does not overwrite it.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'current_allocation'
+            ]
+
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
 
 
 class Allocation(Base):
-    resource = models.ForeignKey(Resource, on_delete=models.PROTECT)
+    """
+    The table is range partitioned by month of ``allocation_date``, see
+    the ``allocation_partitions`` command. Its primary key is
+    ``(id, allocation_date)``.
+    """
+
+    # Lookups by resource are served by ``allocation_resource_date_idx``.
+    resource = models.ForeignKey(
+        Resource,
+        on_delete=models.PROTECT,
+        db_index=False
+    )
     allocation_date = models.DateTimeField(default=now, blank=True)
     return_date = models.DateTimeField(blank=True, null=True)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.PROTECT
     )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=('resource', '-allocation_date', 'id'),
+                name='allocation_resource_date_idx'
+            ),
+            # Partitioned tables only have unique indexes that include the
+            # partition key, so a single open allocation per resource is
+            # enforced by the ``unique_open_allocation_per_resource``
+            # trigger, which looks it up through this index.
+            models.Index(
+                fields=('resource',),
+                condition=models.Q(return_date__isnull=True),
+                name='open_allocation_resource_idx'
+            )
+        ]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.sync_resource_current_allocation()
+
+    def sync_resource_current_allocation(self):
+        """
+        Point the resource at this allocation while it is open.
+
+        The resource row is updated after the allocation row, so callers
+        changing allocations lock the resource first, with
+        ``select_for_update()``, to keep a single lock order.
+        """
+        resources = Resource.objects.filter(id=self.resource_id)
+
+        if self.return_date is None:
+            current_allocation_id = self.id
+        else:
+            current_allocation_id = None
+            resources = resources.filter(current_allocation_id=self.id)
+
+        updated = resources.update(
+            current_allocation_id=current_allocation_id,
+            updated_at=now()
+        )
+
+        if updated and Allocation.resource.is_cached(self):
+            self.resource.current_allocation_id = current_allocation_id
+
+
+class AllocationRollup(models.Model):
+    """
+    Time allocated per resource and user on each day, in ``TIME_ZONE``.
+
+    Rows are derived from the allocations by the
+    ``refresh_allocation_rollup`` command.
+    """
+
+    day = models.DateField()
+    resource = models.ForeignKey(
+        Resource,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    allocated_time = models.DurationField()
+    # Allocations that overlap the day and those that started on it, so the
+    # allocations of a range are the first day ones plus the later starts.
+    allocations = models.PositiveIntegerField()
+    started = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=('day', 'resource', 'user'),
+                name='unique_allocation_rollup'
+            )
+        ]
+
+
+class AllocationRollupDay(models.Model):
+    """
+    A day whose rollups were computed, so days without rollup rows can be
+    told apart from days without allocations.
+    """
+
+    day = models.DateField(unique=True)
+    refreshed_at = models.DateTimeField()
+
+
+class DetachedAllocationMonth(models.Model):
+    """
+    A month, in UTC, whose allocation partition was detached, so its
+    rollups can no longer be computed.
+    """
+
+    month = models.DateField(unique=True)
+    detached_at = models.DateTimeField(auto_now_add=True)
+
+
+class Reservation(Base):
+    """A booking of a resource for a future period."""
+
+    # Lookups by resource are served by ``exclude_overlapping_reservations``.
+    resource = models.ForeignKey(
+        Resource,
+        on_delete=models.CASCADE,
+        db_index=False
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.PROTECT
+    )
+    # Half-open ``[start, end)``, so back-to-back reservations do not
+    # overlap.
+    period = DateTimeRangeField()
+
+    class Meta:
+        constraints = [
+            # Also the GiST index on the periods of each resource.
+            ExclusionConstraint(
+                name='exclude_overlapping_reservations',
+                expressions=(
+                    ('resource', RangeOperators.EQUAL),
+                    ('period', RangeOperators.OVERLAPS)
+                )
+            ),
+            models.CheckConstraint(
+                check=models.Q(
+                    period__isempty=False,
+                    period__lower_inf=False,
+                    period__upper_inf=False
+                ),
+                name='bounded_reservation_period'
+            )
+        ]
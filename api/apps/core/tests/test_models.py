@@ -1,6 +1,8 @@
 from api.apps.core import models
 
+from django.db import IntegrityError
 from django.test import TestCase
+from django.utils.timezone import now
 from django.contrib.auth import get_user_model
 
 
@@ -65,3 +67,83 @@ class ModelTests(TestCase):
         )
 
         self.assertTrue(resource.is_allocated)
+
+    def test_return_allocation_releases_resource(self):
+        resource = models.Resource.objects.create(name='Notebook')
+
+        allocation = models.Allocation.objects.create(
+            user=sample_user(),
+            resource=resource
+        )
+
+        allocation.return_date = now()
+        allocation.save()
+
+        resource.refresh_from_db()
+
+        self.assertFalse(resource.is_allocated)
+        self.assertIsNone(resource.current_allocation)
+
+    def test_resource_is_allocated_without_query(self):
+        resource = models.Resource.objects.create(name='Notebook')
+
+        allocation = models.Allocation.objects.create(
+            user=sample_user(),
+            resource=resource
+        )
+
+        resource = models.Resource.objects.get(id=resource.id)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(resource.is_allocated)
+
+        self.assertEqual(resource.current_allocation_id, allocation.id)
+
+    def test_resource_save_keeps_allocation(self):
+        """Test saving a resource read before an allocation keeps it."""
+        resource = models.Resource.objects.create(name='Notebook')
+        stale = models.Resource.objects.get(id=resource.id)
+
+        allocation = models.Allocation.objects.create(
+            user=sample_user(),
+            resource=resource
+        )
+
+        stale.name = 'Laptop'
+        stale.save()
+
+        resource.refresh_from_db()
+
+        self.assertEqual(resource.name, 'Laptop')
+        self.assertEqual(resource.current_allocation_id, allocation.id)
+
+    def test_resource_save_keeps_return(self):
+        """Test saving a resource read before a return keeps it free."""
+        resource = models.Resource.objects.create(name='Notebook')
+
+        allocation = models.Allocation.objects.create(
+            user=sample_user(),
+            resource=resource
+        )
+
+        stale = models.Resource.objects.get(id=resource.id)
+
+        allocation.return_date = now()
+        allocation.save()
+
+        stale.is_active = False
+        stale.save()
+
+        resource.refresh_from_db()
+
+        self.assertFalse(resource.is_active)
+        self.assertIsNone(resource.current_allocation_id)
+
+    def test_resource_cannot_have_two_open_allocations(self):
+        resource = models.Resource.objects.create(name='Notebook')
+        user = sample_user()
+
+        models.Allocation.objects.create(user=user, resource=resource)
+
+        with self.assertRaises(IntegrityError):
+            models.Allocation.objects.create(user=user, resource=resource)
@@ -0,0 +1,217 @@
+from datetime import (
+    datetime,
+    time,
+    timedelta,
+    timezone as dt_timezone
+)
+
+from api.apps.core.models import (
+    Allocation,
+    AllocationRollup,
+    AllocationRollupDay,
+    DetachedAllocationMonth
+)
+
+from django.db import (
+    connection,
+    transaction
+)
+from django.db.models import (
+    Q,
+    F,
+    Case,
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    Sum,
+    Value,
+    When
+)
+from django.db.models.functions import (
+    Coalesce,
+    Greatest,
+    Least
+)
+from django.conf import settings
+from django.utils import timezone
+
+
+# Column and name of each grouping.
+GROUPS = {
+    'resource': ('resource_id', 'resource__name'),
+    'user': ('user_id', 'user__name')
+}
+
+REFRESH_SQL = '''
+INSERT INTO {rollup} (
+    day, resource_id, user_id, allocated_time, allocations, started
+)
+SELECT
+    day.day,
+    allocation.resource_id,
+    allocation.user_id,
+    SUM(
+        LEAST(COALESCE(allocation.return_date, %(now)s), day.end_at)
+        - GREATEST(allocation.allocation_date, day.start_at)
+    ),
+    COUNT(*),
+    COUNT(*) FILTER (WHERE allocation.allocation_date >= day.start_at)
+FROM (
+    SELECT
+        day::date AS day,
+        day AT TIME ZONE %(time_zone)s AS start_at,
+        (day + interval '1 day') AT TIME ZONE %(time_zone)s AS end_at
+    FROM generate_series(
+        %(start_day)s::timestamp,
+        %(end_day)s::timestamp,
+        interval '1 day'
+    ) AS day
+) AS day
+JOIN {allocation} AS allocation
+    ON allocation.allocation_date < LEAST(day.end_at, %(now)s)
+    AND (
+        allocation.return_date IS NULL
+        OR allocation.return_date > day.start_at
+    )
+GROUP BY day.day, allocation.resource_id, allocation.user_id
+'''
+
+
+class DetachedAllocationsError(Exception):
+    pass
+
+
+def overlapping(queryset, start, end):
+    return queryset.filter(
+        Q(return_date__isnull=True) | Q(return_date__gt=start),
+        allocation_date__lt=end
+    )
+
+
+def live_utilization(group, start, end):
+    """
+    Aggregate the allocations of each group clipped to ``start`` and
+    ``end``, which must not be in the future so open allocations are
+    clipped to it.
+    """
+    key, name = GROUPS[group]
+
+    duration = ExpressionWrapper(
+        Least(Coalesce('return_date', Value(end)), Value(end))
+        - Greatest('allocation_date', Value(start)),
+        output_field=DurationField()
+    )
+
+    return overlapping(Allocation.objects, start, end).values(
+        group_id=F(key),
+        group_name=F(name)
+    ).annotate(
+        total_time=Sum(duration),
+        count=Count('id')
+    )
+
+
+def rollup_utilization(group, start_day, end_day):
+    """Aggregate the daily rollups of each group between both days."""
+    key, name = GROUPS[group]
+
+    return AllocationRollup.objects.filter(
+        day__range=(start_day, end_day)
+    ).values(
+        group_id=F(key),
+        group_name=F(name)
+    ).annotate(
+        total_time=Sum('allocated_time'),
+        # Allocations carried into the range are counted on its first day.
+        count=Sum(
+            Case(
+                When(day=start_day, then='allocations'),
+                default='started'
+            )
+        )
+    )
+
+
+def missing_rollup_days(start_day, end_day):
+    """Return the days between both, inclusive, never refreshed."""
+    refreshed = set(
+        AllocationRollupDay.objects.filter(
+            day__range=(start_day, end_day)
+        ).values_list('day', flat=True)
+    )
+
+    return [
+        day for day in (
+            start_day + timedelta(days=offset)
+            for offset in range((end_day - start_day).days + 1)
+        )
+        if day not in refreshed
+    ]
+
+
+def detached_months(start_day, end_day):
+    """Return the detached months, in UTC, overlapping both days."""
+    start = timezone.make_aware(datetime.combine(start_day, time.min))
+    end = timezone.make_aware(
+        datetime.combine(end_day + timedelta(days=1), time.min)
+    ) - timedelta(microseconds=1)
+
+    return list(
+        DetachedAllocationMonth.objects.filter(
+            month__range=(
+                start.astimezone(dt_timezone.utc).date().replace(day=1),
+                end.astimezone(dt_timezone.utc).date()
+            )
+        ).order_by('month').values_list('month', flat=True)
+    )
+
+
+@transaction.atomic
+def refresh_rollup(start_day, end_day, now):
+    """
+    Recompute the daily rollups between both days, inclusive.
+
+    Days of detached partitions are refused, as their allocations are gone
+    and their rollups would be replaced with empty ones.
+    """
+    if months := detached_months(start_day, end_day):
+        raise DetachedAllocationsError(
+            'The allocations of '
+            f'{", ".join(f"{month:%Y-%m}" for month in months)} '
+            'were detached.'
+        )
+
+    AllocationRollup.objects.filter(day__range=(start_day, end_day)).delete()
+
+    sql = REFRESH_SQL.format(
+        rollup=connection.ops.quote_name(AllocationRollup._meta.db_table),
+        allocation=connection.ops.quote_name(Allocation._meta.db_table)
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql,
+            {
+                'now': now,
+                'time_zone': settings.TIME_ZONE,
+                'start_day': start_day,
+                'end_day': end_day
+            }
+        )
+
+        rows = cursor.rowcount
+
+    AllocationRollupDay.objects.bulk_create(
+        [
+            AllocationRollupDay(
+                day=start_day + timedelta(days=offset),
+                refreshed_at=now
+            )
+            for offset in range((end_day - start_day).days + 1)
+        ],
+        update_conflicts=True,
+        unique_fields=('day',),
+        update_fields=('refreshed_at',)
+    )
+
+    return rows
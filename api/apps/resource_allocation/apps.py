@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class ResourceAllocationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.apps.resource_allocation'
+
+    def ready(self):
+        from api.apps.resource_allocation import signals  # noqa: F401
+        from api.apps.resource_allocation.cache import (
+            check_allocation_status_cache
+        )
+
+        check_allocation_status_cache()
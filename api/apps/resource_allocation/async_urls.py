@@ -0,0 +1,23 @@
+from django.urls import path
+
+from api.apps.resource_allocation import async_views
+
+app_name = 'resource_allocation_async'
+
+urlpatterns = [
+    path(
+        'resources/',
+        async_views.resource_list,
+        name='resource-list'
+    ),
+    path(
+        'resources/<int:pk>/',
+        async_views.resource_detail,
+        name='resource-detail'
+    ),
+    path(
+        'resources/<int:resource_pk>/allocations/',
+        async_views.allocation_list,
+        name='allocation-list'
+    )
+]
@@ -0,0 +1,104 @@
+from api.apps.utils.async_views import async_api_view
+from api.apps.utils.search import search_queryset
+from api.apps.utils.pagination import (
+    AllocationCursorPagination,
+    SearchCursorPagination,
+    CursorPagination,
+    KeysetPagination
+)
+from api.apps.resource_allocation.filters import (
+    filter_resources,
+    visible_resources
+)
+from api.apps.resource_allocation.serializers import (
+    ResourceSerializer,
+    ResourceListSerializer,
+    AllocationSerializer
+)
+from api.apps.core.models import (
+    Resource,
+    Allocation
+)
+
+from django.http import JsonResponse
+
+from rest_framework.exceptions import NotFound
+
+
+@async_api_view()
+async def resource_list(request):
+    queryset = filter_resources(
+        Resource.objects.all(),
+        request.GET,
+        request.user
+    )
+
+    fields = ResourceListSerializer.get_values(request.user)
+    search = request.GET.get('search')
+
+    if search:
+        queryset = search_queryset(queryset, search)
+        fields = (*fields, 'similarity')
+        paginator = KeysetPagination(SearchCursorPagination.ordering)
+    else:
+        paginator = KeysetPagination(CursorPagination.ordering)
+
+    page = await paginator.paginate_queryset(
+        visible_resources(queryset.values(*fields), request.user),
+        request
+    )
+
+    serializer = ResourceListSerializer(
+        page,
+        many=True,
+        context={'request': request}
+    )
+
+    return JsonResponse(paginator.get_paginated_data(serializer.data))
+
+
+@async_api_view()
+async def resource_detail(request, pk):
+    queryset = visible_resources(Resource.objects.all(), request.user)
+
+    try:
+        resource = await queryset.aget(pk=pk)
+    except Resource.DoesNotExist:
+        raise NotFound
+
+    serializer = ResourceSerializer(resource, context={'request': request})
+
+    return JsonResponse(serializer.data)
+
+
+@async_api_view()
+async def allocation_list(request, resource_pk):
+    resources = visible_resources(
+        Resource.objects.filter(pk=resource_pk),
+        request.user
+    )
+
+    if not await resources.aexists():
+        raise NotFound
+
+    queryset = Allocation.objects.filter(
+        resource_id=resource_pk
+    ).select_related('user').only(
+        'id',
+        'resource_id',
+        'allocation_date',
+        'return_date',
+        'user__id',
+        'user__name'
+    )
+
+    paginator = KeysetPagination(AllocationCursorPagination.ordering)
+    page = await paginator.paginate_queryset(queryset, request)
+
+    serializer = AllocationSerializer(
+        page,
+        many=True,
+        context={'request': request}
+    )
+
+    return JsonResponse(paginator.get_paginated_data(serializer.data))
@@ -0,0 +1,105 @@
+from api.apps.core.models import (
+    Resource,
+    Allocation,
+    Reservation
+)
+
+from django.db import (
+    connections,
+    router
+)
+
+
+# Each resource is busy during its reservations and allocations, plus two
+# sentinels around the range. Ordered by start, a resource is free from the
+# latest end seen so far until the next start. The running maximum, rather
+# than the previous end alone, handles periods nested in earlier ones.
+AVAILABILITY_SQL = '''
+WITH resource AS (
+    SELECT id
+    FROM {resource}
+    WHERE id = ANY(%(resources)s) {visibility}
+),
+busy AS (
+    SELECT
+        resource.id AS resource_id,
+        '-infinity'::timestamptz AS start_at,
+        %(start)s::timestamptz AS end_at
+    FROM resource
+    UNION ALL
+    SELECT resource.id, %(end)s::timestamptz, 'infinity'::timestamptz
+    FROM resource
+    UNION ALL
+    SELECT reservation.resource_id, lower(reservation.period),
+        upper(reservation.period)
+    FROM {reservation} AS reservation
+    JOIN resource ON resource.id = reservation.resource_id
+    WHERE reservation.period && tstzrange(%(start)s, %(end)s)
+    UNION ALL
+    SELECT allocation.resource_id, allocation.allocation_date,
+        COALESCE(allocation.return_date, 'infinity'::timestamptz)
+    FROM {allocation} AS allocation
+    JOIN resource ON resource.id = allocation.resource_id
+    WHERE allocation.allocation_date < %(end)s
+        AND (
+            allocation.return_date IS NULL
+            OR allocation.return_date > %(start)s
+        )
+),
+edge AS (
+    SELECT
+        resource_id,
+        MAX(end_at) OVER (
+            PARTITION BY resource_id
+            ORDER BY start_at, end_at
+            ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+        ) AS free_from,
+        start_at AS free_until
+    FROM busy
+)
+SELECT resource.id, edge.free_from, edge.free_until
+FROM resource
+LEFT JOIN edge
+    ON edge.resource_id = resource.id
+    AND edge.free_from < edge.free_until
+ORDER BY resource.id, edge.free_until
+'''
+
+
+def free_windows(resource_ids, start, end, user):
+    """
+    Return the periods between ``start`` and ``end`` in which each resource
+    has neither reservations nor allocations, keyed by resource id.
+
+    Resources the user cannot see are left out.
+    """
+    # Raw queries skip the database routers.
+    connection = connections[router.db_for_read(Reservation)]
+
+    sql = AVAILABILITY_SQL.format(
+        resource=connection.ops.quote_name(Resource._meta.db_table),
+        reservation=connection.ops.quote_name(Reservation._meta.db_table),
+        allocation=connection.ops.quote_name(Allocation._meta.db_table),
+        visibility='' if user.is_staff else 'AND is_active'
+    )
+
+    windows = {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql,
+            {
+                'resources': list(resource_ids),
+                'start': start,
+                'end': end
+            }
+        )
+
+        for resource_id, free_from, free_until in cursor.fetchall():
+            resource_windows = windows.setdefault(resource_id, [])
+
+            # Fully busy resources come back as a single row of nulls.
+            if free_from is not None:
+                resource_windows.append((free_from, free_until))
+
+    return windows
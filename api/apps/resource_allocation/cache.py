@@ -0,0 +1,162 @@
+import time
+
+from api.apps.core.models import Resource
+from api.apps.utils.caches import is_shared
+from api.apps.utils.prometheus import CACHE_REQUESTS
+from api.apps.utils.routers import primary
+
+from django.db import transaction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import cached_property
+
+
+class AllocationStatusCache:
+    """
+    Cache of the allocation status of each resource, keyed by resource id.
+
+    Entries are written on read, tagged with the generation of the resource,
+    which is bumped once the transaction that changes the status commits.
+    Entries written by a lookup that read the row before the commit carry
+    an older generation and are ignored, where deleting them could race with
+    that lookup writing them back.
+
+    Disabled unless ``ALLOCATION_STATUS_CACHE`` names a cache, in which case
+    every lookup reads the database.
+    """
+
+    key_prefix = 'allocation-status'
+    generation_prefix = 'allocation-status-generation'
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    # Bound on first use, so lookups do not resolve the labels and nothing is
+    # written to PROMETHEUS_MULTIPROC_DIR on import.
+    @cached_property
+    def hit_counter(self):
+        return CACHE_REQUESTS.labels('allocation_status', 'hit')
+
+    @cached_property
+    def miss_counter(self):
+        return CACHE_REQUESTS.labels('allocation_status', 'miss')
+
+    @property
+    def enabled(self):
+        return bool(settings.ALLOCATION_STATUS_CACHE)
+
+    @property
+    def cache(self):
+        return caches[settings.ALLOCATION_STATUS_CACHE]
+
+    def get_key(self, resource_id):
+        return f'{self.key_prefix}:{resource_id}'
+
+    def get_generation_key(self, resource_id):
+        return f'{self.generation_prefix}:{resource_id}'
+
+    def get(self, resource_id):
+        if not self.enabled:
+            return self.load(resource_id)
+
+        key = self.get_key(resource_id)
+        generation_key = self.get_generation_key(resource_id)
+
+        entries = self.cache.get_many((key, generation_key))
+        generation = entries.get(generation_key)
+        entry = entries.get(key)
+
+        if entry is not None and entry[0] == generation:
+            self.hits += 1
+
+            if settings.PROMETHEUS_METRICS:
+                self.hit_counter.inc()
+
+            return entry[1]
+
+        self.misses += 1
+
+        if settings.PROMETHEUS_METRICS:
+            self.miss_counter.inc()
+
+        status = self.load(resource_id)
+
+        if status is not None:
+            self.cache.set(
+                key,
+                (generation, status),
+                timeout=settings.ALLOCATION_STATUS_CACHE_TIMEOUT
+            )
+
+        return status
+
+    def load(self, resource_id):
+        # A status read from a lagging replica would be cached until the
+        # entry expires.
+        with primary():
+            resource = Resource.objects.filter(id=resource_id).values(
+                'is_active',
+                'current_allocation__user_id',
+                'current_allocation__user__name'
+            ).first()
+
+        if resource is None:
+            return None
+
+        holder = None
+
+        if resource['current_allocation__user_id'] is not None:
+            holder = {
+                'id': resource['current_allocation__user_id'],
+                'name': resource['current_allocation__user__name']
+            }
+
+        return {
+            'is_active': resource['is_active'],
+            'is_allocated': holder is not None,
+            'holder': holder
+        }
+
+    def invalidate(self, resource_id):
+        if not self.enabled:
+            return
+
+        transaction.on_commit(lambda: self.bump(resource_id))
+
+    def bump(self, resource_id):
+        key = self.get_generation_key(resource_id)
+
+        # Generations start from the current time, so one recreated after an
+        # eviction does not match entries written before it. add() and incr()
+        # are atomic, so concurrent bumps are all counted.
+        self.cache.add(key, time.time_ns() // 1000, timeout=None)
+
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # Evicted in between.
+            self.cache.delete(self.get_key(resource_id))
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+allocation_status_cache = AllocationStatusCache()
+
+
+def check_allocation_status_cache():
+    """
+    Refuse a per-process status cache, whose invalidations would not reach
+    the other workers, which would serve a stale status until it expires.
+    """
+    if allocation_status_cache.enabled and \
+            not is_shared(allocation_status_cache.cache):
+        raise ImproperlyConfigured(
+            'ALLOCATION_STATUS_CACHE must be a cache shared by every process, '
+            'such as Redis or Memcached.'
+        )
@@ -0,0 +1,143 @@
+import io
+import csv
+import json
+
+from api.apps.core.models import Allocation
+
+
+FIELDS = (
+    'id',
+    'resource_id',
+    'resource_name',
+    'user_id',
+    'user_name',
+    'user_email',
+    'allocation_date',
+    'return_date'
+)
+
+LOOKUPS = (
+    'id',
+    'resource_id',
+    'resource__name',
+    'user_id',
+    'user__name',
+    'user__email',
+    'allocation_date',
+    'return_date'
+)
+
+# Rows fetched, and written, at a time.
+CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson'
+}
+
+
+def export_queryset(start=None, end=None, resource=None, user=None):
+    """
+    Return the rows of the allocations made between ``start``, inclusive,
+    and ``end``, exclusive, optionally of a resource or a user, by id.
+    """
+    queryset = Allocation.objects.order_by('id')
+
+    if start is not None:
+        queryset = queryset.filter(allocation_date__gte=start)
+
+    if end is not None:
+        queryset = queryset.filter(allocation_date__lt=end)
+
+    if resource is not None:
+        queryset = queryset.filter(resource_id=resource)
+
+    if user is not None:
+        queryset = queryset.filter(user_id=user)
+
+    return queryset.values_list(*LOOKUPS)
+
+
+def get_chunks(queryset):
+    """
+    Yield the rows a chunk at a time, paginated by id.
+
+    Each chunk is a query of its own, so memory stays constant without a
+    server-side cursor, which ``DATABASE_PGBOUNCER`` disables.
+    """
+    last_id = 0
+
+    while chunk := list(queryset.filter(id__gt=last_id)[:CHUNK_SIZE]):
+        yield chunk
+
+        last_id = chunk[-1][0]
+
+
+async def aget_chunks(queryset):
+    last_id = 0
+
+    while chunk := [
+        row async for row in queryset.filter(id__gt=last_id)[:CHUNK_SIZE]
+    ]:
+        yield chunk
+
+        last_id = chunk[-1][0]
+
+
+def format_row(row):
+    return (
+        *row[:-2],
+        row[-2].isoformat(),
+        row[-1] and row[-1].isoformat()
+    )
+
+
+class CSVExporter:
+    def header(self):
+        return self.format([FIELDS])
+
+    def format(self, rows):
+        buffer = io.StringIO()
+
+        csv.writer(buffer).writerows(rows)
+
+        return buffer.getvalue()
+
+
+class JSONLinesExporter:
+    def header(self):
+        return ''
+
+    def format(self, rows):
+        return ''.join(
+            json.dumps(dict(zip(FIELDS, row))) + '\n'
+            for row in rows
+        )
+
+
+EXPORTERS = {
+    'csv': CSVExporter,
+    'jsonl': JSONLinesExporter
+}
+
+
+def export_allocations(output, **filters):
+    """Yield the allocations as CSV or JSON Lines, a chunk at a time."""
+    exporter = EXPORTERS[output]()
+
+    if header := exporter.header():
+        yield header
+
+    for chunk in get_chunks(export_queryset(**filters)):
+        yield exporter.format(map(format_row, chunk))
+
+
+async def aexport_allocations(output, **filters):
+    """Async version of ``export_allocations``."""
+    exporter = EXPORTERS[output]()
+
+    if header := exporter.header():
+        yield header
+
+    async for chunk in aget_chunks(export_queryset(**filters)):
+        yield exporter.format(map(format_row, chunk))
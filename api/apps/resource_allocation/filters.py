@@ -0,0 +1,29 @@
+from django.db.models import Q
+
+
+def filter_resources(queryset, params, user):
+    """Apply the ``name`` and ``status`` list filters of the query params."""
+    status_list = params.getlist('status')
+    name = params.get('name')
+
+    query = Q()
+
+    if name:
+        query &= Q(name__immutable_unaccent__icontains=name)
+
+    if status_list:
+        if 'active' in status_list and user.is_staff:
+            query &= Q(is_active=True)
+        elif 'inactive' in status_list and user.is_staff:
+            query &= Q(is_active=False)
+
+        if 'allocated' in status_list:
+            query &= Q(current_allocation__isnull=False)
+        elif 'unallocated' in status_list:
+            query &= Q(current_allocation__isnull=True)
+
+    return queryset.filter(query)
+
+
+def visible_resources(queryset, user):
+    return queryset if user.is_staff else queryset.filter(is_active=True)
@@ -0,0 +1,97 @@
+"""
+Django command to maintain the monthly partitions of the allocations.
+"""
+from pathlib import Path
+
+from api.apps.resource_allocation.partitions import (
+    OpenAllocationsError,
+    add_months,
+    archive_partition,
+    create_partition,
+    detach_partition,
+    get_partitions,
+    partition_name
+)
+
+from django.utils import timezone
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+
+class Command(BaseCommand):
+    """Django command to create, detach and archive allocation partitions."""
+
+    help = 'Creates the allocation partitions of the coming months and ' \
+        'detaches, or archives to gzipped JSON Lines, the old ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ahead',
+            type=int,
+            default=3,
+            help='Number of months after the current one to create.'
+        )
+        parser.add_argument(
+            '--retain',
+            type=int,
+            help='Detach the partitions of months ending more than this '
+            'number of months ago. Nothing is detached by default.'
+        )
+        parser.add_argument(
+            '--archive-dir',
+            type=Path,
+            help='Write each detached partition to '
+            '<name>.jsonl.gz in this directory and drop it.'
+        )
+
+    def handle(self, *args, **options):
+        if options['ahead'] < 0:
+            raise CommandError('--ahead must not be negative.')
+        elif options['retain'] is not None and options['retain'] < 0:
+            raise CommandError('--retain must not be negative.')
+        elif options['archive_dir'] and not options['archive_dir'].is_dir():
+            raise CommandError(
+                f'{options["archive_dir"]} is not a directory.'
+            )
+
+        # Partitions are bounded by UTC months.
+        current = timezone.now().date().replace(day=1)
+        partitions = get_partitions()
+
+        for months in range(options['ahead'] + 1):
+            month = add_months(current, months)
+
+            if month not in partitions:
+                create_partition(month)
+
+                self.stdout.write(f'Created {partition_name(month)}.')
+
+        if options['retain'] is None:
+            return
+
+        cutoff = add_months(current, -options['retain'])
+
+        for month, partition in sorted(partitions.items()):
+            if month >= cutoff:
+                continue
+
+            if partition.attached:
+                try:
+                    detach_partition(partition.name)
+                except OpenAllocationsError as error:
+                    self.stderr.write(f'Skipped {partition.name}: {error}')
+                    continue
+
+                self.stdout.write(f'Detached {partition.name}.')
+
+            if options['archive_dir']:
+                path = options['archive_dir'] / f'{partition.name}.jsonl.gz'
+
+                rows = archive_partition(partition.name, path)
+
+                self.stdout.write(
+                    f'Archived {rows} allocations of {partition.name} '
+                    f'to {path}.'
+                )
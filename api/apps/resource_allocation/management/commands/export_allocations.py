@@ -0,0 +1,84 @@
+"""
+Django command to export the allocation history.
+"""
+import gzip
+
+from datetime import datetime
+
+from api.apps.resource_allocation.export import (
+    EXPORTERS,
+    export_allocations
+)
+
+from django.utils import timezone
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+
+def parse_datetime(value):
+    value = datetime.fromisoformat(value)
+
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+
+    return value
+
+
+class Command(BaseCommand):
+    """Django command to write the allocations as CSV or JSON Lines."""
+
+    help = 'Writes the allocations made in a range, optionally of a ' \
+        'resource or a user, as CSV or JSON Lines. Rows are read a chunk ' \
+        'at a time, so memory does not grow with the history.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start',
+            type=parse_datetime,
+            help='Export allocations made from this ISO date and time.'
+        )
+        parser.add_argument(
+            '--end',
+            type=parse_datetime,
+            help='Export allocations made before this ISO date and time.'
+        )
+        parser.add_argument('--resource', type=int)
+        parser.add_argument('--user', type=int)
+        parser.add_argument(
+            '--format',
+            choices=tuple(EXPORTERS),
+            default='csv'
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the export to a file, gzipped if it ends in .gz.'
+        )
+
+    def handle(self, *args, **options):
+        if options['start'] and options['end'] and \
+                options['start'] >= options['end']:
+            raise CommandError('--start must be before --end.')
+
+        chunks = export_allocations(
+            options['format'],
+            start=options['start'],
+            end=options['end'],
+            resource=options['resource'],
+            user=options['user']
+        )
+
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+
+        if options['output'].endswith('.gz'):
+            file = gzip.open(options['output'], 'wt', newline='')
+        else:
+            file = open(options['output'], 'w', newline='')
+
+        with file:
+            for chunk in chunks:
+                file.write(chunk)
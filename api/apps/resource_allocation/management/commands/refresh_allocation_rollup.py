@@ -0,0 +1,66 @@
+"""
+Django command to refresh the daily allocation rollups.
+"""
+from datetime import (
+    date,
+    timedelta
+)
+
+from api.apps.resource_allocation.analytics import (
+    DetachedAllocationsError,
+    refresh_rollup
+)
+
+from django.utils import timezone
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+
+class Command(BaseCommand):
+    """Django command to recompute the allocation rollups of some days."""
+
+    help = 'Recomputes the daily allocation rollups used by the ' \
+        'utilization analytics of long ranges.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--start',
+            type=date.fromisoformat,
+            help='First day to refresh, YYYY-MM-DD.'
+        )
+        parser.add_argument(
+            '--end',
+            type=date.fromisoformat,
+            help='Last day to refresh, YYYY-MM-DD, today by default.'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=2,
+            help='Number of days up to --end to refresh without --start.'
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        today = timezone.localdate(now)
+
+        # Days after today have no allocated time yet.
+        end_day = min(options['end'] or today, today)
+        start_day = options['start'] or \
+            end_day - timedelta(days=options['days'] - 1)
+
+        if start_day > end_day:
+            raise CommandError('--start must not be after --end or today.')
+
+        try:
+            rows = refresh_rollup(start_day, end_day, now)
+        except DetachedAllocationsError as error:
+            raise CommandError(f'{error} Their rollups are kept.')
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{rows} rollups refreshed from {start_day} to {end_day}.'
+            )
+        )
@@ -0,0 +1,171 @@
+import re
+import gzip
+
+from collections import namedtuple
+from datetime import (
+    date,
+    datetime,
+    timezone
+)
+
+from api.apps.core.models import (
+    Allocation,
+    DetachedAllocationMonth
+)
+
+from django.db import (
+    connection,
+    transaction
+)
+
+
+PARENT = Allocation._meta.db_table
+
+DEFAULT_PARTITION = f'{PARENT}_default'
+
+# Monthly partitions are named after the month of their lower bound, in UTC.
+PARTITION_NAME = re.compile(rf'^{PARENT}_p(\d{{4}})_(\d{{2}})$')
+
+# Detached partitions are kept as plain tables until they are archived.
+PARTITIONS_SQL = '''
+SELECT relname, relispartition
+FROM pg_class
+WHERE relkind = 'r'
+    AND relnamespace = current_schema()::regnamespace
+    AND starts_with(relname, %s)
+'''
+
+# Rows of the month that landed in the default partition are moved into the
+# new partition, since a partition cannot be created over them.
+CREATE_SQL = '''
+CREATE TABLE {partition} (LIKE {parent} INCLUDING DEFAULTS);
+
+WITH moved AS (
+    DELETE FROM {default}
+    WHERE allocation_date >= %(lower)s AND allocation_date < %(upper)s
+    RETURNING *
+)
+INSERT INTO {partition} SELECT * FROM moved;
+
+ALTER TABLE {parent} ATTACH PARTITION {partition}
+    FOR VALUES FROM (%(lower)s) TO (%(upper)s);
+'''
+
+
+Partition = namedtuple('Partition', ('name', 'attached'))
+
+
+class OpenAllocationsError(Exception):
+    pass
+
+
+def add_months(month, months):
+    months += month.year * 12 + month.month - 1
+
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def month_bounds(month):
+    return (
+        datetime.combine(month, datetime.min.time(), tzinfo=timezone.utc),
+        datetime.combine(
+            add_months(month, 1),
+            datetime.min.time(),
+            tzinfo=timezone.utc
+        )
+    )
+
+
+def partition_name(month):
+    return f'{PARENT}_p{month:%Y_%m}'
+
+
+def get_partitions():
+    """Return the monthly partitions keyed by their first day."""
+    with connection.cursor() as cursor:
+        cursor.execute(PARTITIONS_SQL, [f'{PARENT}_p'])
+
+        tables = cursor.fetchall()
+
+    partitions = {}
+
+    for name, attached in tables:
+        match = PARTITION_NAME.match(name)
+
+        if match:
+            year, month = map(int, match.groups())
+            partitions[date(year, month, 1)] = Partition(name, attached)
+
+    return partitions
+
+
+@transaction.atomic
+def create_partition(month):
+    lower, upper = month_bounds(month)
+    quote_name = connection.ops.quote_name
+
+    sql = CREATE_SQL.format(
+        partition=quote_name(partition_name(month)),
+        parent=quote_name(PARENT),
+        default=quote_name(DEFAULT_PARTITION)
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, {'lower': lower, 'upper': upper})
+
+
+@transaction.atomic
+def detach_partition(name):
+    """
+    Detach a partition, unless it holds open allocations, and record its
+    month, whose rollups can no longer be refreshed.
+
+    Detaching locks the whole table until the transaction ends.
+    """
+    quote_name = connection.ops.quote_name
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'ALTER TABLE {quote_name(PARENT)} '
+            f'DETACH PARTITION {quote_name(name)}'
+        )
+        # Checked once detached, so no allocation can be reopened meanwhile.
+        cursor.execute(
+            f'SELECT EXISTS (SELECT 1 FROM {quote_name(name)} '
+            f'WHERE return_date IS NULL)'
+        )
+
+        if cursor.fetchone()[0]:
+            raise OpenAllocationsError(
+                'The partition has allocations that were not returned.'
+            )
+
+    year, month = map(int, PARTITION_NAME.match(name).groups())
+
+    DetachedAllocationMonth.objects.create(month=date(year, month, 1))
+
+
+def archive_partition(name, path):
+    """
+    Write the rows of a detached partition to a gzipped JSON Lines file
+    and drop it. Return the number of rows written.
+    """
+    quote_name = connection.ops.quote_name
+    rows = 0
+
+    with gzip.open(path, 'wt', encoding='utf-8') as file:
+        with transaction.atomic(), connection.chunked_cursor() as cursor:
+            cursor.execute(
+                f'SELECT row_to_json(allocation)::text '
+                f'FROM {quote_name(name)} AS allocation ORDER BY id'
+            )
+
+            for row, in cursor:
+                file.write(row)
+                file.write('\n')
+                rows += 1
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE {quote_name(name)}')
+
+    return rows
@@ -1,8 +1,15 @@
 from api.apps.core.models import (
     Resource,
-    Allocation
+    Allocation,
+    Reservation
 )
 
+from api.apps.utils.serializers import ValuesListSerializer
+
+from django.utils import timezone
+
+from psycopg2.extras import DateTimeTZRange
+
 from rest_framework import serializers
 
 
@@ -23,6 +30,29 @@ class ResourceSerializer(serializers.ModelSerializer):
         )
 
 
+class ResourceListSerializer(ValuesListSerializer):
+    fields = ResourceSerializer.Meta.fields
+    staff_fields = ('is_active',)
+
+    @classmethod
+    def get_values(cls, user):
+        return tuple(
+            'current_allocation_id' if field == 'is_allocated' else field
+            for field in cls.get_visible_fields(user)
+        )
+
+    def to_representation(self, row):
+        data = {}
+
+        for field in self.visible_fields:
+            if field == 'is_allocated':
+                data[field] = row['current_allocation_id'] is not None
+            else:
+                data[field] = row[field]
+
+        return data
+
+
 class AllocationSerializer(serializers.ModelSerializer):
     user = serializers.SerializerMethodField()
 
@@ -40,3 +70,163 @@ class AllocationSerializer(serializers.ModelSerializer):
             'return_date',
             'allocation_date'
         )
+
+
+class ReservationSerializer(serializers.ModelSerializer):
+    user = serializers.SerializerMethodField()
+    start = serializers.DateTimeField(source='period.lower')
+    end = serializers.DateTimeField(source='period.upper')
+
+    def get_user(self, instance):
+        return {
+            'id': instance.user.id,
+            'name': instance.user.name
+        }
+
+    def validate(self, attrs):
+        start = attrs['period']['lower']
+        end = attrs['period']['upper']
+
+        if start >= end:
+            raise serializers.ValidationError(
+                {'end': ['Must be after the start.']}
+            )
+        elif end <= timezone.now():
+            raise serializers.ValidationError(
+                {'end': ['Must be in the future.']}
+            )
+
+        attrs['period'] = DateTimeTZRange(start, end)
+
+        return attrs
+
+    class Meta:
+        model = Reservation
+        fields = (
+            'id',
+            'user',
+            'start',
+            'end'
+        )
+
+
+class AvailabilityQuerySerializer(serializers.Serializer):
+    resource = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        min_length=1,
+        max_length=100
+    )
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        if attrs['start'] >= attrs['end']:
+            raise serializers.ValidationError(
+                {'end': ['Must be after the start.']}
+            )
+
+        attrs['resource'] = list(dict.fromkeys(attrs['resource']))
+
+        return attrs
+
+
+class AvailabilitySerializer(serializers.BaseSerializer):
+    """Read-only representation of the free windows of a resource."""
+
+    datetime_field = serializers.DateTimeField()
+
+    def to_representation(self, item):
+        resource_id, windows = item
+
+        return {
+            'resource': resource_id,
+            'windows': [
+                {
+                    'start': self.datetime_field.to_representation(start),
+                    'end': self.datetime_field.to_representation(end)
+                }
+                for start, end in windows
+            ]
+        }
+
+
+class BulkAllocationSerializer(serializers.Serializer):
+    resources = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=500,
+        required=False,
+        default=list
+    )
+    allocations = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        max_length=500,
+        required=False,
+        default=list
+    )
+    atomic = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if not attrs['resources'] and not attrs['allocations']:
+            raise serializers.ValidationError(
+                'Provide resources to allocate or allocations to return.'
+            )
+
+        return attrs
+
+
+class UtilizationQuerySerializer(serializers.Serializer):
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField(required=False)
+    rollup = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        now = timezone.now()
+
+        attrs['end'] = min(attrs.get('end', now), now)
+
+        if attrs['start'] >= attrs['end']:
+            raise serializers.ValidationError(
+                {'start': ['Must be before the end and the current time.']}
+            )
+
+        return attrs
+
+
+class AllocationExportQuerySerializer(serializers.Serializer):
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    resource = serializers.IntegerField(min_value=1, required=False)
+    user = serializers.IntegerField(min_value=1, required=False)
+    output = serializers.ChoiceField(choices=('csv', 'jsonl'), default='csv')
+
+    def validate(self, attrs):
+        if 'start' in attrs and 'end' in attrs and \
+                attrs['start'] >= attrs['end']:
+            raise serializers.ValidationError(
+                {'end': ['Must be after the start.']}
+            )
+
+        return attrs
+
+
+class UtilizationSerializer(serializers.BaseSerializer):
+    """
+    Read-only representation of the utilization rows of a group.
+
+    ``range_time`` in the context is the length of the queried range. The
+    share may exceed 1 for users holding several resources at once.
+    """
+
+    def to_representation(self, row):
+        total = row['total_time'].total_seconds()
+
+        return {
+            self.context['group']: {
+                'id': row['group_id'],
+                'name': row['group_name']
+            },
+            'allocations': row['count'],
+            'allocated_time': total,
+            'average_time': total / row['count'] if row['count'] else 0,
+            'share': total / self.context['range_time'].total_seconds()
+        }
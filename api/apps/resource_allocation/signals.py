@@ -0,0 +1,31 @@
+from api.apps.core.models import Resource
+from api.apps.resource_allocation.cache import allocation_status_cache
+from api.apps.utils.routers import primary
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+
+User = get_user_model()
+
+
+@receiver(pre_save, sender=User)
+def invalidate_renamed_holder(sender, instance, raw, update_fields, **kwargs):
+    """Invalidate the status of the resources held by a renamed user."""
+    if raw or instance._state.adding:
+        return
+    elif update_fields is not None and 'name' not in update_fields:
+        return
+
+    with primary():
+        resource_ids = list(
+            Resource.objects.filter(
+                current_allocation__user=instance
+            ).exclude(
+                current_allocation__user__name=instance.name
+            ).values_list('id', flat=True)
+        )
+
+    for resource_id in resource_ids:
+        allocation_status_cache.invalidate(resource_id)
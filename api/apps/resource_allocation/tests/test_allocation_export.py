@@ -0,0 +1,206 @@
+from api.apps.core.models import (
+    Resource,
+    Allocation
+)
+
+import csv
+import gzip
+import json
+import os
+import tempfile
+
+from unittest.mock import patch
+
+from io import StringIO
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from django.urls import reverse
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+User = get_user_model()
+
+EXPORT_URL = reverse('resource_allocation:allocation-export')
+
+
+class AutenticationTests(APITestCase):
+    def test_export_without_autentication(self):
+        response = self.client.get(EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AllocationExportTests(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            name='Admin',
+            email='admin@test.com',
+            password='testpass'
+        )
+        self.user = User.objects.create_user(
+            name='User',
+            email='user@test.com',
+            password='testpass'
+        )
+
+        self.notebook = Resource.objects.create(name='Notebook')
+        self.mouse = Resource.objects.create(name='Mouse')
+
+        self.now = timezone.now()
+
+        self.returned = Allocation.objects.create(
+            resource=self.notebook,
+            user=self.admin,
+            allocation_date=self.now - timedelta(days=4),
+            return_date=self.now - timedelta(days=2)
+        )
+        self.open = Allocation.objects.create(
+            resource=self.mouse,
+            user=self.user,
+            allocation_date=self.now - timedelta(days=1)
+        )
+
+        self.client.force_authenticate(self.admin)
+
+    def get_content(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def get_async_content(self, response):
+        async def read():
+            return b''.join(
+                [part async for part in response.async_streaming_content]
+            )
+
+        return async_to_sync(read)()
+
+    def test_export_csv(self):
+        response = self.client.get(EXPORT_URL)
+
+        rows = list(csv.DictReader(StringIO(self.get_content(response))))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(
+            [int(row['id']) for row in rows],
+            [self.returned.id, self.open.id]
+        )
+        self.assertEqual(rows[0]['resource_name'], 'Notebook')
+        self.assertEqual(rows[0]['user_email'], 'admin@test.com')
+        self.assertEqual(
+            rows[0]['return_date'],
+            self.returned.return_date.isoformat()
+        )
+        self.assertEqual(rows[1]['return_date'], '')
+
+    def test_export_jsonl(self):
+        response = self.client.get(EXPORT_URL, {'output': 'jsonl'})
+
+        rows = [
+            json.loads(line)
+            for line in self.get_content(response).splitlines()
+        ]
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]['user_id'], self.user.id)
+        self.assertIsNone(rows[1]['return_date'])
+
+    def test_export_filters(self):
+        response = self.client.get(
+            EXPORT_URL,
+            {
+                'output': 'jsonl',
+                'start': (self.now - timedelta(days=2)).isoformat(),
+                'user': self.user.id
+            }
+        )
+
+        rows = self.get_content(response).splitlines()
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(json.loads(rows[0])['id'], self.open.id)
+
+        response = self.client.get(EXPORT_URL, {'resource': self.mouse.id + 1})
+
+        # Only the header.
+        self.assertEqual(len(self.get_content(response).splitlines()), 1)
+
+    def test_export_gzip(self):
+        response = self.client.get(EXPORT_URL, HTTP_ACCEPT_ENCODING='gzip')
+
+        content = gzip.decompress(b''.join(response.streaming_content))
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(len(content.decode().splitlines()), 3)
+
+    def test_export_async_content(self):
+        """Test the content sent by the ASGI handler matches."""
+        sync_content = self.get_content(self.client.get(EXPORT_URL))
+        response = self.client.get(EXPORT_URL)
+
+        self.assertEqual(
+            self.get_async_content(response).decode(),
+            sync_content
+        )
+
+    def test_export_async_content_gzip(self):
+        response = self.client.get(EXPORT_URL, HTTP_ACCEPT_ENCODING='gzip')
+
+        content = gzip.decompress(self.get_async_content(response))
+
+        self.assertEqual(len(content.decode().splitlines()), 3)
+
+    @patch('api.apps.resource_allocation.export.CHUNK_SIZE', 1)
+    def test_export_in_chunks(self):
+        """Test every row is exported when paginated by id."""
+        response = self.client.get(EXPORT_URL, {'output': 'jsonl'})
+
+        self.assertEqual(
+            [
+                json.loads(line)['id']
+                for line in self.get_content(response).splitlines()
+            ],
+            [self.returned.id, self.open.id]
+        )
+
+    def test_export_with_invalid_range(self):
+        response = self.client.get(
+            EXPORT_URL,
+            {
+                'start': self.now.isoformat(),
+                'end': (self.now - timedelta(days=1)).isoformat()
+            }
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_without_permission(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'allocations.jsonl.gz')
+
+            call_command(
+                'export_allocations',
+                format='jsonl',
+                resource=self.notebook.id,
+                output=path
+            )
+
+            with gzip.open(path, 'rt') as file:
+                rows = [json.loads(line) for line in file]
+
+        self.assertEqual([row['id'] for row in rows], [self.returned.id])
@@ -1,12 +1,19 @@
 from api.apps.core.models import (
     Resource,
-    Allocation
+    Allocation,
+    Reservation
 )
 
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from django.urls import reverse
 
+from psycopg2.extras import DateTimeTZRange
+
 from rest_framework.test import APITestCase
 from rest_framework import status
 
@@ -96,7 +103,58 @@ class ListAllocationsTests(APITestCase):
         response = self.client.get(url)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_list_allocations_query_count_does_not_grow_with_rows(self):
+        users = [
+            User.objects.create_user(
+                name=f'User {index}',
+                email=f'user{index}@test.com',
+                password='testpass'
+            )
+            for index in range(5)
+        ]
+
+        Allocation.objects.bulk_create(
+            [
+                Allocation(
+                    resource=self.resource,
+                    return_date=timezone.now(),
+                    user=user
+                )
+                for user in users
+            ]
+        )
+
+        url = allocations_url(self.resource.id)
+
+        # The resource, the conditional GET validators and the page.
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 7)
+
+    def test_paginate_allocations_by_most_recent(self):
+        url = allocations_url(self.resource.id)
+        response = self.client.get(url, {'page_size': 1})
+
+        first_page = response.data['results']
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(first_page), 1)
+
+        response = self.client.get(response.data['next'])
+
+        second_page = response.data['results']
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(second_page), 1)
+        self.assertGreaterEqual(
+            first_page[0]['allocation_date'],
+            second_page[0]['allocation_date']
+        )
+        self.assertIsNone(response.data['next'])
 
     def test_list_allocations_for_inactive_resource_with_common_user(self):
         self.user.is_staff = False
@@ -142,6 +200,88 @@ class CreateAllocationTests(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_create_allocation_query_count(self):
+        url = allocations_url(self.resource.id)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                url,
+                data=json.dumps({}),
+                content_type='application/json'
+            )
+
+        queries = [
+            query['sql'] for query in context.captured_queries
+            if not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))
+        ]
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['user']['id'], self.user.id)
+        # Lock the resource, look up its reservations, insert the
+        # allocation and move the pointer.
+        self.assertEqual(len(queries), 4)
+
+    def test_create_allocation_to_allocated_resource(self):
+        Allocation.objects.create(
+            resource=self.resource,
+            user=self.user
+        )
+
+        url = allocations_url(self.resource.id)
+        response = self.client.post(
+            url,
+            data=json.dumps({}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            Allocation.objects.filter(resource=self.resource).count(),
+            1
+        )
+
+    def test_create_allocation_to_resource_reserved_by_another_user(self):
+        now = timezone.now()
+        other = User.objects.create_user(
+            name='other',
+            email='other@test.com',
+            password='testpass'
+        )
+
+        Reservation.objects.create(
+            resource=self.resource,
+            user=other,
+            period=DateTimeTZRange(
+                now - timedelta(hours=1),
+                now + timedelta(hours=1)
+            )
+        )
+
+        url = allocations_url(self.resource.id)
+        response = self.client.post(
+            url,
+            data=json.dumps({}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data['detail'],
+            'Resource reserved by another user.'
+        )
+        self.assertFalse(Allocation.objects.exists())
+
+        # The holder of the reservation can allocate it.
+        self.client.force_authenticate(other)
+
+        response = self.client.post(
+            url,
+            data=json.dumps({}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
     def test_create_allocation_to_resource_with_invalid_allocation_date(self):
         payload = {
             'allocation_date': "",
@@ -310,6 +450,28 @@ class UpdateAllocationTests(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_update_allocation_locks_resource_first(self):
+        url = detail_url(self.resource.id, self.allocation.id)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(
+                url,
+                data=json.dumps({'return_date': timezone.now().isoformat()}),
+                content_type='application/json'
+            )
+
+        statements = [query['sql'] for query in queries]
+        resource_lock = next(
+            index for index, sql in enumerate(statements)
+            if 'FOR UPDATE' in sql and '"core_resource"' in sql
+        )
+        allocation_update = next(
+            index for index, sql in enumerate(statements)
+            if sql.startswith('UPDATE "core_allocation"')
+        )
+
+        self.assertLess(resource_lock, allocation_update)
+
     def test_update_allocation_with_invalid_allocation_date(self):
         payload = {
             'allocation_date': '',
@@ -340,6 +502,24 @@ class UpdateAllocationTests(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_reopen_allocation_of_allocated_resource(self):
+        self.allocation.return_date = timezone.now()
+        self.allocation.save()
+
+        Allocation.objects.create(
+            resource=self.resource,
+            user=self.user
+        )
+
+        url = detail_url(self.resource.id, self.allocation.id)
+        response = self.client.patch(
+            url,
+            data=json.dumps({'return_date': None}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_edit_invalid_allocation(self):
         url = detail_url(self.resource.id, 99)
         response = self.client.patch(url)
@@ -354,3 +534,42 @@ class UpdateAllocationTests(APITestCase):
         response = self.client.patch(url)
 
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ConditionalGetAllocationTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            name='Test',
+            email='test@test.com',
+            password='testpass'
+        )
+
+        self.resource = Resource.objects.create(name='Bar')
+
+        self.allocation = Allocation.objects.create(
+            resource=self.resource,
+            user=self.user
+        )
+
+        self.client.force_authenticate(self.user)
+
+    def test_list_allocations_not_modified(self):
+        url = allocations_url(self.resource.id)
+        etag = self.client.get(url)['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_returned_allocation(self):
+        url = detail_url(self.resource.id, self.allocation.id)
+        etag = self.client.get(url)['ETag']
+
+        self.allocation.return_date = timezone.now()
+        self.allocation.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data['return_date'])
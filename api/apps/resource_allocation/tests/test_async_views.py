@@ -0,0 +1,173 @@
+from api.apps.user.serializers import TokenObtainPairSerializer
+from api.apps.core.models import (
+    Resource,
+    Allocation
+)
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+
+RESOURCES_URL = reverse('resource_allocation_async:resource-list')
+
+User = get_user_model()
+
+
+def detail_url(resource_id):
+    return reverse(
+        'resource_allocation_async:resource-detail',
+        args=[resource_id]
+    )
+
+
+def allocations_url(resource_id):
+    return reverse(
+        'resource_allocation_async:allocation-list',
+        args=[resource_id]
+    )
+
+
+class AutenticationTests(APITestCase):
+    def test_list_resources_without_autentication(self):
+        response = self.client.get(RESOURCES_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('WWW-Authenticate', response)
+
+    def test_list_resources_with_invalid_token(self):
+        response = self.client.get(
+            RESOURCES_URL,
+            HTTP_AUTHORIZATION='Bearer invalid'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AsyncResourceTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            name='test',
+            email='test@test.com',
+            password='testpass'
+        )
+
+        self.resources = Resource.objects.bulk_create(
+            [
+                Resource(name='Notebook'),
+                Resource(name='Mouse'),
+                Resource(name='Monitor', is_active=False)
+            ]
+        )
+
+        self.authenticate()
+
+    def authenticate(self):
+        token = TokenObtainPairSerializer.get_token(self.user).access_token
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_list_active_resources_with_common_user(self):
+        response = self.client.get(RESOURCES_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [resource['name'] for resource in response.json()['results']],
+            ['Notebook', 'Mouse']
+        )
+
+    def test_list_resources_with_admin_user(self):
+        self.user.is_staff = True
+        self.user.save()
+
+        self.authenticate()
+
+        response = self.client.get(RESOURCES_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['results']), 3)
+        self.assertIn('is_active', response.json()['results'][0])
+
+    def test_paginate_resources_with_cursor(self):
+        response = self.client.get(RESOURCES_URL, {'page_size': 1})
+
+        self.assertEqual(len(response.json()['results']), 1)
+
+        response = self.client.get(response.json()['next'])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'][0]['name'], 'Mouse')
+        self.assertIsNone(response.json()['next'])
+
+    def test_paginate_search_results_with_tied_similarities(self):
+        resources = Resource.objects.bulk_create(
+            [Resource(name=f'Notebook {number}') for number in range(5)]
+        )
+
+        # The misspelled term gives every notebook the same fractional
+        # similarity.
+        response = self.client.get(
+            RESOURCES_URL,
+            {'search': 'notebok', 'page_size': 2}
+        )
+        ids = [resource['id'] for resource in response.json()['results']]
+
+        while response.json()['next']:
+            response = self.client.get(response.json()['next'])
+            ids += [resource['id'] for resource in response.json()['results']]
+
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(
+            set(ids),
+            {resource.id for resource in [self.resources[0], *resources]}
+        )
+
+    def test_list_resources_with_invalid_cursor(self):
+        response = self.client.get(RESOURCES_URL, {'cursor': 'invalid'})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_filter_resources_by_name(self):
+        response = self.client.get(RESOURCES_URL, {'name': 'mouse'})
+
+        self.assertEqual(len(response.json()['results']), 1)
+
+    def test_get_resource(self):
+        response = self.client.get(detail_url(self.resources[0].id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['name'], 'Notebook')
+
+    def test_get_inactive_resource_with_common_user(self):
+        response = self.client.get(detail_url(self.resources[2].id))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_create_resource_not_allowed(self):
+        response = self.client.post(RESOURCES_URL)
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_405_METHOD_NOT_ALLOWED
+        )
+
+    def test_list_allocations(self):
+        Allocation.objects.create(resource=self.resources[0], user=self.user)
+
+        response = self.client.get(allocations_url(self.resources[0].id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json()['results'][0]['user'],
+            {'id': self.user.id, 'name': self.user.name}
+        )
+
+    def test_list_allocations_of_inactive_resource_with_common_user(self):
+        response = self.client.get(allocations_url(self.resources[2].id))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,176 @@
+from api.apps.core.models import (
+    Resource,
+    Allocation,
+    Reservation
+)
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.urls import reverse
+
+from psycopg2.extras import DateTimeTZRange
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+import json
+
+User = get_user_model()
+
+BULK_URL = reverse('resource_allocation:allocation-bulk')
+
+
+class AutenticationTests(APITestCase):
+    def test_bulk_allocation_without_autentication(self):
+        response = self.client.post(BULK_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class BulkAllocationTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            name='test',
+            email='test@test.com',
+            password='testpass'
+        )
+
+        self.resources = Resource.objects.bulk_create(
+            [Resource(name=f'Resource {index}') for index in range(3)]
+        )
+
+        self.client.force_authenticate(self.user)
+
+    def post(self, payload):
+        return self.client.post(
+            BULK_URL,
+            data=json.dumps(payload),
+            content_type='application/json'
+        )
+
+    def test_bulk_allocate_resources(self):
+        resource_ids = [resource.id for resource in self.resources]
+
+        response = self.post({'resources': resource_ids})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result['status'] for result in response.data['allocated']],
+            ['allocated'] * 3
+        )
+        self.assertEqual(
+            Resource.objects.filter(current_allocation__isnull=False).count(),
+            3
+        )
+
+    def test_bulk_return_allocations(self):
+        allocation = Allocation.objects.create(
+            resource=self.resources[0],
+            user=self.user
+        )
+
+        response = self.post({'allocations': [allocation.id]})
+
+        allocation.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['returned'][0]['status'], 'returned')
+        self.assertIsNotNone(allocation.return_date)
+        self.assertFalse(
+            Resource.objects.get(id=self.resources[0].id).is_allocated
+        )
+
+    def test_bulk_return_and_reallocate_resource(self):
+        allocation = Allocation.objects.create(
+            resource=self.resources[0],
+            user=self.user
+        )
+
+        response = self.post(
+            {
+                'resources': [self.resources[0].id],
+                'allocations': [allocation.id]
+            }
+        )
+
+        resource = Resource.objects.get(id=self.resources[0].id)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            resource.current_allocation_id,
+            response.data['allocated'][0]['allocation']
+        )
+
+    def test_bulk_allocation_reports_partial_failures(self):
+        Allocation.objects.create(resource=self.resources[0], user=self.user)
+
+        response = self.post(
+            {'resources': [self.resources[0].id, self.resources[1].id, 99]}
+        )
+
+        allocated = response.data['allocated']
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(allocated[0]['error'], 'Resource already allocated.')
+        self.assertEqual(allocated[1]['status'], 'allocated')
+        self.assertEqual(allocated[2]['error'], 'Not found.')
+
+    def test_bulk_allocate_resource_reserved_by_another_user(self):
+        now = timezone.now()
+
+        Reservation.objects.create(
+            resource=self.resources[0],
+            user=User.objects.create_user(
+                name='other',
+                email='other@test.com',
+                password='testpass'
+            ),
+            period=DateTimeTZRange(
+                now - timedelta(hours=1),
+                now + timedelta(hours=1)
+            )
+        )
+
+        response = self.post(
+            {'resources': [self.resources[0].id, self.resources[1].id]}
+        )
+
+        allocated = response.data['allocated']
+
+        self.assertEqual(
+            allocated[0]['error'],
+            'Resource reserved by another user.'
+        )
+        self.assertEqual(allocated[1]['status'], 'allocated')
+
+    def test_bulk_allocation_all_or_nothing(self):
+        Allocation.objects.create(resource=self.resources[0], user=self.user)
+
+        response = self.post(
+            {
+                'resources': [self.resources[0].id, self.resources[1].id],
+                'atomic': True
+            }
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['allocated'][1]['status'], 'skipped')
+        self.assertEqual(Allocation.objects.count(), 1)
+
+    def test_bulk_allocate_inactive_resource_with_common_user(self):
+        Resource.objects.filter(id=self.resources[0].id).update(
+            is_active=False
+        )
+
+        response = self.post({'resources': [self.resources[0].id]})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['allocated'][0]['error'], 'Not found.')
+
+    def test_bulk_allocation_without_items(self):
+        response = self.post({})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
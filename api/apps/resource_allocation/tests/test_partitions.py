@@ -0,0 +1,164 @@
+from api.apps.core.models import (
+    Resource,
+    Allocation
+)
+from api.apps.resource_allocation.partitions import (
+    DEFAULT_PARTITION,
+    add_months,
+    create_partition,
+    get_partitions,
+    month_bounds,
+    partition_name
+)
+
+import gzip
+import json
+
+from io import StringIO
+from pathlib import Path
+from datetime import timedelta
+from tempfile import TemporaryDirectory
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+User = get_user_model()
+
+
+class AllocationPartitionsTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            name='Test Báz',
+            email='test@test.com',
+            password='testpass'
+        )
+        self.resource = Resource.objects.create(name='Projector')
+
+        self.current = timezone.now().date().replace(day=1)
+
+    def get_partition_of(self, allocation):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT tableoid::regclass::text FROM core_allocation '
+                'WHERE id = %s',
+                [allocation.id]
+            )
+
+            return cursor.fetchone()[0]
+
+    def allocate(self, month, returned=True):
+        allocation_date = month_bounds(month)[0] + timedelta(days=1)
+
+        return Allocation.objects.create(
+            resource=self.resource,
+            user=self.user,
+            allocation_date=allocation_date,
+            return_date=allocation_date + timedelta(hours=1)
+            if returned else None
+        )
+
+    def archive(self, archive_dir):
+        stdout = StringIO()
+        stderr = StringIO()
+
+        call_command(
+            'allocation_partitions',
+            retain=12,
+            archive_dir=Path(archive_dir),
+            stdout=stdout,
+            stderr=stderr
+        )
+
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_allocations_are_routed_to_monthly_partitions(self):
+        allocation = self.allocate(self.current)
+
+        self.assertEqual(
+            self.get_partition_of(allocation),
+            partition_name(self.current)
+        )
+
+    def test_create_partitions_ahead(self):
+        call_command('allocation_partitions', ahead=6, stdout=StringIO())
+
+        partitions = get_partitions()
+
+        for months in range(7):
+            self.assertTrue(
+                partitions[add_months(self.current, months)].attached
+            )
+
+    def test_create_partition_moves_default_rows(self):
+        month = add_months(self.current, 24)
+        allocation = self.allocate(month)
+
+        self.assertEqual(self.get_partition_of(allocation), DEFAULT_PARTITION)
+
+        create_partition(month)
+
+        self.assertEqual(
+            self.get_partition_of(allocation),
+            partition_name(month)
+        )
+
+    def test_archive_old_partitions(self):
+        month = add_months(self.current, -24)
+        allocation = self.allocate(month)
+        recent = self.allocate(self.current)
+
+        create_partition(month)
+
+        with TemporaryDirectory() as archive_dir:
+            stdout, _ = self.archive(archive_dir)
+
+            path = Path(archive_dir) / f'{partition_name(month)}.jsonl.gz'
+
+            with gzip.open(path, 'rt') as file:
+                rows = [json.loads(line) for line in file]
+
+        self.assertIn('Archived 1 allocations', stdout)
+        self.assertEqual([row['id'] for row in rows], [allocation.id])
+        self.assertNotIn(month, get_partitions())
+        self.assertEqual(
+            list(Allocation.objects.values_list('id', flat=True)),
+            [recent.id]
+        )
+
+    def test_refresh_rollups_of_detached_partition(self):
+        """Test the rollups of archived months are not replaced."""
+        month = add_months(self.current, -24)
+
+        self.allocate(month)
+        create_partition(month)
+
+        with TemporaryDirectory() as archive_dir:
+            self.archive(archive_dir)
+
+        with self.assertRaises(CommandError):
+            call_command(
+                'refresh_allocation_rollup',
+                start=month + timedelta(days=10),
+                end=month + timedelta(days=12),
+                stdout=StringIO()
+            )
+
+    def test_keep_partitions_with_open_allocations(self):
+        month = add_months(self.current, -24)
+        allocation = self.allocate(month, returned=False)
+
+        create_partition(month)
+
+        with TemporaryDirectory() as archive_dir:
+            _, stderr = self.archive(archive_dir)
+
+            self.assertFalse(any(Path(archive_dir).iterdir()))
+
+        self.assertIn(f'Skipped {partition_name(month)}', stderr)
+        self.assertTrue(get_partitions()[month].attached)
+        self.assertTrue(Allocation.objects.filter(id=allocation.id).exists())
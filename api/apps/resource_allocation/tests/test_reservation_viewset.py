@@ -0,0 +1,332 @@
+from api.apps.core.models import (
+    Resource,
+    Allocation,
+    Reservation
+)
+
+from datetime import (
+    datetime,
+    timedelta
+)
+
+from django.contrib.auth import get_user_model
+from django.db import (
+    IntegrityError,
+    transaction
+)
+from django.utils import timezone
+from django.urls import reverse
+
+from psycopg2.extras import DateTimeTZRange
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+User = get_user_model()
+
+AVAILABILITY_URL = reverse('resource_allocation:resource-availability')
+
+
+def reservations_url(resource_id):
+    return reverse(
+        'resource_allocation:reservation-list',
+        args=[resource_id]
+    )
+
+
+def detail_url(resource_id, reservation_id):
+    return reverse(
+        'resource_allocation:reservation-detail',
+        args=[
+            resource_id,
+            reservation_id
+        ]
+    )
+
+
+def parse(value):
+    return datetime.fromisoformat(value)
+
+
+class ReservationTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            name='Test Báz',
+            email='test@test.com',
+            password='testpass'
+        )
+        self.other_user = User.objects.create_user(
+            name='Other',
+            email='other@test.com',
+            password='testpass'
+        )
+
+        self.resource = Resource.objects.create(name='Projector')
+
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+
+        self.client.force_authenticate(self.user)
+
+    def reserve(self, start, end, user=None):
+        return Reservation.objects.create(
+            resource=self.resource,
+            user=user or self.user,
+            period=DateTimeTZRange(start, end)
+        )
+
+    def test_create_reservation(self):
+        end = self.start + timedelta(hours=2)
+
+        response = self.client.post(
+            reservations_url(self.resource.id),
+            {
+                'start': self.start.isoformat(),
+                'end': end.isoformat()
+            }
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            response.data['user'],
+            {
+                'id': self.user.id,
+                'name': self.user.name
+            }
+        )
+
+        reservation = Reservation.objects.get(id=response.data['id'])
+
+        self.assertEqual(reservation.period.lower, self.start)
+        self.assertEqual(reservation.period.upper, end)
+
+    def test_create_overlapping_reservation(self):
+        self.reserve(self.start, self.start + timedelta(hours=2))
+
+        response = self.client.post(
+            reservations_url(self.resource.id),
+            {
+                'start': (self.start + timedelta(hours=1)).isoformat(),
+                'end': (self.start + timedelta(hours=3)).isoformat()
+            }
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data['detail'],
+            'Resource already reserved for this period.'
+        )
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_back_to_back_reservations(self):
+        self.reserve(self.start, self.start + timedelta(hours=2))
+
+        response = self.client.post(
+            reservations_url(self.resource.id),
+            {
+                'start': (self.start + timedelta(hours=2)).isoformat(),
+                'end': (self.start + timedelta(hours=3)).isoformat()
+            }
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_exclusion_constraint(self):
+        self.reserve(self.start, self.start + timedelta(hours=2))
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.reserve(
+                self.start - timedelta(hours=1),
+                self.start + timedelta(hours=1),
+                user=self.other_user
+            )
+
+        other_resource = Resource.objects.create(name='Screen')
+
+        Reservation.objects.create(
+            resource=other_resource,
+            user=self.user,
+            period=DateTimeTZRange(self.start, self.start + timedelta(hours=2))
+        )
+
+    def test_create_reservation_invalid_period(self):
+        response = self.client.post(
+            reservations_url(self.resource.id),
+            {
+                'start': self.start.isoformat(),
+                'end': self.start.isoformat()
+            }
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('end', response.data)
+
+    def test_create_reservation_inactive_resource(self):
+        self.resource.is_active = False
+        self.resource.save()
+
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.post(
+            reservations_url(self.resource.id),
+            {
+                'start': self.start.isoformat(),
+                'end': (self.start + timedelta(hours=1)).isoformat()
+            }
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_reservations_ordered_by_start(self):
+        later = self.reserve(
+            self.start + timedelta(days=1),
+            self.start + timedelta(days=2)
+        )
+        sooner = self.reserve(self.start, self.start + timedelta(hours=1))
+
+        response = self.client.get(reservations_url(self.resource.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [reservation['id'] for reservation in response.data['results']],
+            [sooner.id, later.id]
+        )
+
+    def test_cancel_reservation(self):
+        reservation = self.reserve(self.start, self.start + timedelta(hours=1))
+
+        response = self.client.delete(
+            detail_url(self.resource.id, reservation.id)
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_cancel_reservation_of_other_user(self):
+        reservation = self.reserve(
+            self.start,
+            self.start + timedelta(hours=1),
+            user=self.other_user
+        )
+
+        response = self.client.delete(
+            detail_url(self.resource.id, reservation.id)
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(Reservation.objects.exists())
+
+
+class AvailabilityTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            name='Test Báz',
+            email='test@test.com',
+            password='testpass'
+        )
+
+        self.projector = Resource.objects.create(name='Projector')
+        self.screen = Resource.objects.create(name='Screen')
+
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.end = self.start + timedelta(hours=10)
+
+        self.client.force_authenticate(self.user)
+
+    def hours(self, hours):
+        return self.start + timedelta(hours=hours)
+
+    def reserve(self, resource, start, end):
+        Reservation.objects.create(
+            resource=resource,
+            user=self.user,
+            period=DateTimeTZRange(self.hours(start), self.hours(end))
+        )
+
+    def get_windows(self, *resources):
+        response = self.client.get(
+            AVAILABILITY_URL,
+            {
+                'resource': [resource.id for resource in resources],
+                'start': self.start.isoformat(),
+                'end': self.end.isoformat()
+            }
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return {
+            item['resource']: [
+                (parse(window['start']), parse(window['end']))
+                for window in item['windows']
+            ]
+            for item in response.data
+        }
+
+    def test_free_windows(self):
+        self.reserve(self.projector, -2, 1)
+        self.reserve(self.projector, 3, 6)
+        # Nested in the previous reservation's period.
+        Allocation.objects.create(
+            resource=self.projector,
+            user=self.user,
+            allocation_date=self.hours(4),
+            return_date=self.hours(5)
+        )
+        self.reserve(self.projector, 8, 12)
+
+        windows = self.get_windows(self.projector, self.screen)
+
+        self.assertEqual(
+            windows[self.projector.id],
+            [
+                (self.hours(1), self.hours(3)),
+                (self.hours(6), self.hours(8))
+            ]
+        )
+        self.assertEqual(
+            windows[self.screen.id],
+            [(self.start, self.end)]
+        )
+
+    def test_open_allocation_is_busy_until_returned(self):
+        Allocation.objects.create(
+            resource=self.projector,
+            user=self.user,
+            allocation_date=self.hours(2)
+        )
+
+        windows = self.get_windows(self.projector)
+
+        self.assertEqual(
+            windows[self.projector.id],
+            [(self.start, self.hours(2))]
+        )
+
+    def test_fully_busy_resource(self):
+        self.reserve(self.projector, -1, 11)
+
+        windows = self.get_windows(self.projector)
+
+        self.assertEqual(windows, {self.projector.id: []})
+
+    def test_inactive_resource_not_found(self):
+        self.screen.is_active = False
+        self.screen.save()
+
+        response = self.client.get(
+            AVAILABILITY_URL,
+            {
+                'resource': [self.projector.id, self.screen.id],
+                'start': self.start.isoformat(),
+                'end': self.end.isoformat()
+            }
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data['detail'],
+            f'Resources not found: {self.screen.id}.'
+        )
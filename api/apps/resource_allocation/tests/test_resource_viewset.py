@@ -1,11 +1,28 @@
+from api.apps.resource_allocation.cache import (
+    allocation_status_cache,
+    check_allocation_status_cache
+)
+from api.apps.resource_allocation.serializers import ResourceSerializer
 from api.apps.core.models import (
     Resource,
     Allocation
 )
 
+from datetime import timedelta
+
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import (
+    SimpleTestCase,
+    override_settings
+)
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
 
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 from rest_framework import status
 
@@ -20,6 +37,13 @@ def detail_url(resource_id):
     return reverse('resource_allocation:resource-detail', args=[resource_id])
 
 
+def allocation_status_url(resource_id):
+    return reverse(
+        'resource_allocation:resource-allocation-status',
+        args=[resource_id]
+    )
+
+
 class AutenticationTests(APITestCase):
     def test_list_resources_without_autentication(self):
         response = self.client.get(RESOURCES_URL)
@@ -86,7 +110,7 @@ class ListResourcesTests(APITestCase):
         response = self.client.get(RESOURCES_URL)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 3)
+        self.assertEqual(len(response.data['results']), 3)
 
     def test_list_resources_with_common_user(self):
         self.user.is_staff = False
@@ -95,7 +119,52 @@ class ListResourcesTests(APITestCase):
         response = self.client.get(RESOURCES_URL)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def assertListMatchesSerializer(self, response, queryset):
+        """Assert the lean list renders like ResourceSerializer."""
+        context = {'request': response.wsgi_request}
+        context['request'].user = self.user
+
+        expected = ResourceSerializer(queryset, many=True, context=context)
+
+        self.assertEqual(
+            response.content,
+            JSONRenderer().render({**response.data, 'results': expected.data})
+        )
+
+    def test_list_resources_matches_serializer(self):
+        Allocation.objects.create(
+            resource=Resource.objects.get(name='Foo Báz'),
+            user=self.user
+        )
+
+        response = self.client.get(RESOURCES_URL)
+
+        self.assertListMatchesSerializer(
+            response,
+            Resource.objects.order_by('id')
+        )
+
+    def test_list_resources_matches_serializer_with_common_user(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.client.get(RESOURCES_URL)
+
+        self.assertNotIn('is_active', response.data['results'][0])
+        self.assertListMatchesSerializer(
+            response,
+            Resource.objects.filter(is_active=True).order_by('id')
+        )
+
+    def test_search_resources_omits_similarity(self):
+        response = self.client.get(RESOURCES_URL, {'search': 'baz'})
+
+        self.assertEqual(
+            list(response.data['results'][0]),
+            ['id', 'name', 'is_active', 'is_allocated']
+        )
 
     def test_filter_resources_by_name(self):
         response = self.client.get(
@@ -104,7 +173,34 @@ class ListResourcesTests(APITestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_search_resources_by_name_similarity(self):
+        response = self.client.get(
+            RESOURCES_URL,
+            {'search': 'bar'}
+        )
+
+        results = response.data['results']
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['name'], 'Bar')
+
+    def test_search_resources_with_accents(self):
+        response = self.client.get(
+            RESOURCES_URL,
+            {'search': 'BÁZ', 'page_size': 1}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+        response = self.client.get(response.data['next'])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
 
     def test_filter_active_resources(self):
         response = self.client.get(
@@ -113,7 +209,7 @@ class ListResourcesTests(APITestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_filter_inactive_resources(self):
         response = self.client.get(
@@ -122,7 +218,7 @@ class ListResourcesTests(APITestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_filter_allocated_resources(self):
         Allocation.objects.create(
@@ -136,7 +232,7 @@ class ListResourcesTests(APITestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_filter_unallocated_resources(self):
         Allocation.objects.create(
@@ -150,7 +246,40 @@ class ListResourcesTests(APITestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_list_resources_query_count_does_not_grow_with_rows(self):
+        for resource in Resource.objects.all():
+            Allocation.objects.create(resource=resource, user=self.user)
+
+        Resource.objects.bulk_create(
+            [Resource(name=f'Resource {index}') for index in range(10)]
+        )
+
+        # The conditional GET validators and the page.
+        with self.assertNumQueries(2):
+            response = self.client.get(RESOURCES_URL)
+
+        results = response.data['results']
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sum(resource['is_allocated'] for resource in results),
+            3
+        )
+
+    def test_paginate_resources_with_cursor(self):
+        response = self.client.get(RESOURCES_URL, {'page_size': 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        self.assertEqual(len(response.data['results']), 2)
+
+        response = self.client.get(response.data['next'])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
 
 
 class CreateResourceTests(APITestCase):
@@ -347,3 +476,306 @@ class DeleteResourceTests(APITestCase):
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+SHARED_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': '/tmp/allocation-status'
+    }
+}
+
+
+@override_settings(ALLOCATION_STATUS_CACHE='shared', CACHES=SHARED_CACHES)
+class AllocationStatusTests(APITestCase):
+    def setUp(self):
+        allocation_status_cache.cache.clear()
+
+        self.user = User.objects.create_superuser(
+            name='test',
+            email='test@test.com',
+            password='testpass'
+        )
+
+        self.resource = Resource.objects.create(name='Foo')
+
+        self.client.force_authenticate(self.user)
+
+    def test_get_allocation_status_from_cache(self):
+        url = allocation_status_url(self.resource.id)
+        stats = allocation_status_cache.stats()
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['is_allocated'])
+        self.assertIsNone(response.data['holder'])
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            allocation_status_cache.stats(),
+            {
+                'hits': stats['hits'] + 1,
+                'misses': stats['misses'] + 1
+            }
+        )
+
+    def test_allocation_invalidates_status(self):
+        url = allocation_status_url(self.resource.id)
+
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse(
+                    'resource_allocation:allocation-list',
+                    args=[self.resource.id]
+                ),
+                data=json.dumps({}),
+                content_type='application/json'
+            )
+
+        response = self.client.get(url)
+
+        self.assertTrue(response.data['is_allocated'])
+        self.assertEqual(
+            response.data['holder'],
+            {'id': self.user.id, 'name': self.user.name}
+        )
+
+    def test_stale_status_is_not_served(self):
+        url = allocation_status_url(self.resource.id)
+
+        # A lookup that read the row before the allocation committed writes
+        # its entry after the invalidation.
+        stale = allocation_status_cache.load(self.resource.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse(
+                    'resource_allocation:allocation-list',
+                    args=[self.resource.id]
+                ),
+                data=json.dumps({}),
+                content_type='application/json'
+            )
+
+        allocation_status_cache.cache.set(
+            allocation_status_cache.get_key(self.resource.id),
+            (None, stale)
+        )
+
+        response = self.client.get(url)
+
+        self.assertTrue(response.data['is_allocated'])
+
+    def test_rename_invalidates_holder(self):
+        url = allocation_status_url(self.resource.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse(
+                    'resource_allocation:allocation-list',
+                    args=[self.resource.id]
+                ),
+                data=json.dumps({}),
+                content_type='application/json'
+            )
+
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.name = 'renamed'
+            self.user.save()
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.data['holder']['name'], 'renamed')
+
+    @override_settings(ALLOCATION_STATUS_CACHE='')
+    def test_get_allocation_status_without_cache(self):
+        url = allocation_status_url(self.resource.id)
+
+        self.client.get(url)
+
+        Allocation.objects.create(resource=self.resource, user=self.user)
+
+        response = self.client.get(url)
+
+        self.assertTrue(response.data['is_allocated'])
+
+    def test_get_allocation_status_of_invalid_resource(self):
+        response = self.client.get(allocation_status_url(99))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_inactive_resource_status_with_common_user(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        self.resource.is_active = False
+        self.resource.save()
+
+        response = self.client.get(allocation_status_url(self.resource.id))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class AllocationStatusCacheTests(SimpleTestCase):
+
+    @override_settings(ALLOCATION_STATUS_CACHE='default')
+    def test_local_memory_cache_is_refused(self):
+        """Test invalidations must reach every process."""
+        with self.assertRaises(ImproperlyConfigured):
+            check_allocation_status_cache()
+
+    @override_settings(ALLOCATION_STATUS_CACHE='shared', CACHES=SHARED_CACHES)
+    def test_shared_cache_is_accepted(self):
+        check_allocation_status_cache()
+
+    @override_settings(ALLOCATION_STATUS_CACHE='')
+    def test_disabled_cache_is_accepted(self):
+        check_allocation_status_cache()
+
+
+class ConditionalGetResourceTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            name='test',
+            email='test@test.com',
+            password='testpass'
+        )
+
+        self.resource = Resource.objects.create(name='Notebook')
+
+        self.client.force_authenticate(self.user)
+
+    def backdate(self, updated_at):
+        Resource.objects.filter(id=self.resource.id).update(
+            updated_at=updated_at
+        )
+
+    def test_get_resource_not_modified(self):
+        self.backdate(timezone.now() - timedelta(minutes=1))
+
+        url = detail_url(self.resource.id)
+        response = self.client.get(url)
+
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(
+            url,
+            HTTP_IF_NONE_MATCH=response['ETag']
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_get_resource_not_modified_since(self):
+        self.backdate(timezone.now() - timedelta(minutes=1))
+
+        url = detail_url(self.resource.id)
+        last_modified = self.client.get(url)['Last-Modified']
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_resource_updated_within_the_same_second(self):
+        """Test a second write within the second of Last-Modified."""
+        second = timezone.now().replace(microsecond=0) - timedelta(minutes=1)
+        url = detail_url(self.resource.id)
+
+        def get(milliseconds, **headers):
+            with patch(
+                'api.apps.utils.conditional.now',
+                return_value=second + timedelta(milliseconds=milliseconds)
+            ):
+                return self.client.get(url, **headers)
+
+        self.backdate(second + timedelta(milliseconds=200))
+
+        response = get(500)
+
+        # The second is not over, so only the ETag is sent.
+        self.assertNotIn('Last-Modified', response)
+
+        self.backdate(second + timedelta(milliseconds=700))
+
+        response = get(
+            800,
+            HTTP_IF_MODIFIED_SINCE=http_date(second.timestamp())
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = get(900, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_if_none_match_takes_precedence(self):
+        """Test If-Modified-Since is ignored along with If-None-Match."""
+        self.backdate(timezone.now() - timedelta(minutes=1))
+
+        url = detail_url(self.resource.id)
+        response = self.client.get(url)
+
+        response = self.client.get(
+            url,
+            HTTP_IF_NONE_MATCH='"stale"',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_updated_resource(self):
+        url = detail_url(self.resource.id)
+        etag = self.client.get(url)['ETag']
+
+        self.resource.name = 'Mouse'
+        self.resource.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'Mouse')
+
+    def test_list_resources_not_modified(self):
+        etag = self.client.get(RESOURCES_URL)['ETag']
+
+        # Only the validators are queried.
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                RESOURCES_URL,
+                HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_resources_after_change(self):
+        etag = self.client.get(RESOURCES_URL)['ETag']
+
+        Resource.objects.create(name='Mouse')
+
+        response = self.client.get(RESOURCES_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_list_validators_depend_on_filters(self):
+        etag = self.client.get(RESOURCES_URL)['ETag']
+
+        response = self.client.get(
+            RESOURCES_URL,
+            {'name': 'Mouse'},
+            HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
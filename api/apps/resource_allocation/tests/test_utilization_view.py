@@ -0,0 +1,184 @@
+from api.apps.core.models import (
+    Resource,
+    Allocation
+)
+
+from io import StringIO
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from django.urls import reverse
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+User = get_user_model()
+
+RESOURCE_UTILIZATION_URL = reverse(
+    'resource_allocation:resource-utilization'
+)
+USER_UTILIZATION_URL = reverse('resource_allocation:user-utilization')
+
+DAY = timedelta(days=1).total_seconds()
+
+
+class UtilizationTests(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            name='Admin',
+            email='admin@test.com',
+            password='testpass'
+        )
+        self.user = User.objects.create_user(
+            name='User',
+            email='user@test.com',
+            password='testpass'
+        )
+
+        self.notebook = Resource.objects.create(name='Notebook')
+        self.mouse = Resource.objects.create(name='Mouse')
+
+        now = timezone.now()
+
+        self.start = now - timedelta(days=10)
+
+        Allocation.objects.create(
+            resource=self.notebook,
+            user=self.admin,
+            allocation_date=now - timedelta(days=4),
+            return_date=now - timedelta(days=2)
+        )
+        # Open allocations are clipped to the current time.
+        Allocation.objects.create(
+            resource=self.notebook,
+            user=self.user,
+            allocation_date=now - timedelta(days=1)
+        )
+        # Outside of the range.
+        Allocation.objects.create(
+            resource=self.mouse,
+            user=self.user,
+            allocation_date=now - timedelta(days=20),
+            return_date=now - timedelta(days=15)
+        )
+
+        self.client.force_authenticate(self.admin)
+
+    def test_resource_utilization(self):
+        response = self.client.get(
+            RESOURCE_UTILIZATION_URL,
+            {'start': self.start.isoformat()}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        [result] = response.data['results']
+
+        self.assertEqual(
+            result['resource'],
+            {'id': self.notebook.id, 'name': 'Notebook'}
+        )
+        self.assertEqual(result['allocations'], 2)
+        self.assertAlmostEqual(result['allocated_time'], 3 * DAY, delta=60)
+        self.assertAlmostEqual(result['average_time'], 1.5 * DAY, delta=60)
+        self.assertAlmostEqual(result['share'], 0.3, places=3)
+
+    def test_user_utilization(self):
+        response = self.client.get(
+            USER_UTILIZATION_URL,
+            {'start': self.start.isoformat()}
+        )
+
+        results = {
+            result['user']['id']: result
+            for result in response.data['results']
+        }
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertAlmostEqual(
+            results[self.admin.id]['allocated_time'],
+            2 * DAY,
+            delta=60
+        )
+        self.assertAlmostEqual(
+            results[self.user.id]['allocated_time'],
+            DAY,
+            delta=60
+        )
+
+    def test_resource_utilization_from_rollups(self):
+        call_command(
+            'refresh_allocation_rollup',
+            start=timezone.localdate(self.start),
+            stdout=StringIO()
+        )
+
+        response = self.client.get(
+            RESOURCE_UTILIZATION_URL,
+            {'start': self.start.isoformat(), 'rollup': True}
+        )
+
+        [result] = response.data['results']
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(result['allocations'], 2)
+        self.assertAlmostEqual(result['allocated_time'], 3 * DAY, delta=60)
+
+    def test_rollups_count_allocations_carried_into_range(self):
+        call_command(
+            'refresh_allocation_rollup',
+            start=timezone.localdate(self.start),
+            stdout=StringIO()
+        )
+
+        # The notebook returned two days ago started before this range.
+        start = timezone.now() - timedelta(days=3)
+
+        response = self.client.get(
+            RESOURCE_UTILIZATION_URL,
+            {'start': start.isoformat(), 'rollup': True}
+        )
+
+        [result] = response.data['results']
+
+        self.assertEqual(result['allocations'], 2)
+
+    def test_rollups_not_refreshed_for_the_whole_range(self):
+        """Test days never refreshed are not read as unallocated."""
+        call_command(
+            'refresh_allocation_rollup',
+            start=timezone.localdate(self.start) + timedelta(days=1),
+            stdout=StringIO()
+        )
+
+        response = self.client.get(
+            RESOURCE_UTILIZATION_URL,
+            {'start': self.start.isoformat(), 'rollup': True}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertIn('1 days', response.data['detail'])
+
+    def test_utilization_with_invalid_range(self):
+        response = self.client.get(
+            RESOURCE_UTILIZATION_URL,
+            {
+                'start': timezone.now().isoformat(),
+                'end': self.start.isoformat()
+            }
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_utilization_without_permission(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(
+            RESOURCE_UTILIZATION_URL,
+            {'start': self.start.isoformat()}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -24,8 +24,33 @@ resource_router.register(
     views.AllocationViewSet,
     basename='allocation'
 )
+resource_router.register(
+    r'reservations',
+    views.ReservationViewSet,
+    basename='reservation'
+)
 
 urlpatterns = [
+    path(
+        'allocations/bulk/',
+        views.BulkAllocationView.as_view(),
+        name='allocation-bulk'
+    ),
+    path(
+        'allocations/export/',
+        views.AllocationExportView.as_view(),
+        name='allocation-export'
+    ),
+    path(
+        'analytics/resources/',
+        views.UtilizationView.as_view(group='resource'),
+        name='resource-utilization'
+    ),
+    path(
+        'analytics/users/',
+        views.UtilizationView.as_view(group='user'),
+        name='user-utilization'
+    ),
     path('', include(router.urls)),
     path('', include(resource_router.urls))
 ]
@@ -1,23 +1,86 @@
-from api.apps.utils.permissions import IsAdminOrReadOnly
+from api.apps.user.authentication import get_user_instance
+from api.apps.utils.conditional import ConditionalGetMixin
+from api.apps.utils.pagination import (
+    AllocationCursorPagination,
+    ReservationCursorPagination,
+    UtilizationCursorPagination
+)
+from api.apps.utils.permissions import (
+    IsAdminOrReadOnly,
+    IsOwnerOrAdmin
+)
+from api.apps.utils.routers import primary
+from api.apps.utils.search import TrigramSearchMixin
+from api.apps.utils.streaming import AsyncStreamingHttpResponse
+from api.apps.resource_allocation.analytics import (
+    live_utilization,
+    missing_rollup_days,
+    rollup_utilization
+)
+from api.apps.resource_allocation.availability import free_windows
+from api.apps.resource_allocation.cache import allocation_status_cache
+from api.apps.resource_allocation.export import (
+    CONTENT_TYPES,
+    aexport_allocations,
+    export_allocations
+)
+from api.apps.resource_allocation.filters import (
+    filter_resources,
+    visible_resources
+)
 from api.apps.resource_allocation.serializers import (
     ResourceSerializer,
-    AllocationSerializer
+    ResourceListSerializer,
+    AllocationSerializer,
+    ReservationSerializer,
+    AvailabilityQuerySerializer,
+    AvailabilitySerializer,
+    BulkAllocationSerializer,
+    AllocationExportQuerySerializer,
+    UtilizationQuerySerializer,
+    UtilizationSerializer
 )
 from api.apps.core.models import (
     Resource,
-    Allocation
+    Allocation,
+    Reservation
 )
 
-from django.db.models import Q
+from datetime import (
+    datetime,
+    time,
+    timedelta
+)
+
+from django.db import (
+    IntegrityError,
+    transaction
+)
+from django.db.models import F
+from django.utils import timezone
 from django.http.response import Http404
 from django.db.models.deletion import ProtectedError
 
+from psycopg2.extras import DateTimeTZRange
+
 from rest_framework.exceptions import ValidationError
-from rest_framework.permissions import IsAuthenticated
-from rest_framework import viewsets, mixins
+from rest_framework.permissions import (
+    IsAdminUser,
+    IsAuthenticated
+)
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework import (
+    generics,
+    mixins,
+    status,
+    viewsets
+)
 
 
-class ResourceViewSet(viewsets.ModelViewSet):
+class ResourceViewSet(ConditionalGetMixin,
+                      TrigramSearchMixin,
+                      viewsets.ModelViewSet):
     queryset = Resource.objects.order_by('id')
     serializer_class = ResourceSerializer
     permission_classes = (
@@ -29,40 +92,89 @@ class ResourceViewSet(viewsets.ModelViewSet):
         queryset = self.queryset
 
         if self.action == 'list':
-            status_list = self.request.query_params.getlist('status')
-            name = self.request.query_params.get('name')
+            queryset = filter_resources(
+                queryset,
+                self.request.query_params,
+                self.request.user
+            )
 
-            query = Q()
+            if self.search_term:
+                queryset = self.search_queryset(queryset)
 
-            if name:
-                query &= Q(name__unaccent__icontains=name)
+            queryset = self.values_queryset(
+                queryset,
+                ResourceListSerializer.get_values(self.request.user)
+            )
 
-            if status_list:
-                if 'active' in status_list and self.request.user.is_staff:
-                    query &= Q(is_active=True)
-                elif 'inactive' in status_list and self.request.user.is_staff:
-                    query &= Q(is_active=False)
+        return visible_resources(queryset, self.request.user)
 
-                if 'allocated' in status_list:
-                    query &= Q(
-                        id__in=Allocation.objects.filter(
-                            return_date__isnull=True
-                        ).values('resource_id')
-                    )
-                elif 'unallocated' in status_list:
-                    queryset = queryset.exclude(
-                        id__in=Allocation.objects.filter(
-                            return_date__isnull=True
-                        ).values('resource_id')
-                    )
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ResourceListSerializer
+
+        return super().get_serializer_class()
+
+    @action(detail=True, url_path='allocation-status')
+    def allocation_status(self, request, pk=None):
+        try:
+            status = allocation_status_cache.get(int(pk))
+        except ValueError:
+            status = None
+
+        if status is None:
+            raise Http404
+        elif not status['is_active'] and not request.user.is_staff:
+            raise Http404
+
+        return Response(
+            {
+                'is_allocated': status['is_allocated'],
+                'holder': status['holder']
+            }
+        )
+
+    @action(detail=False)
+    def availability(self, request):
+        params = AvailabilityQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
 
-            queryset = queryset.filter(query)
+        resource_ids = params.validated_data['resource']
+
+        windows = free_windows(
+            resource_ids,
+            params.validated_data['start'],
+            params.validated_data['end'],
+            request.user
+        )
+
+        missing = [
+            str(resource_id) for resource_id in resource_ids
+            if resource_id not in windows
+        ]
+
+        if missing:
+            raise ValidationError(
+                {'detail': f'Resources not found: {", ".join(missing)}.'}
+            )
 
-        return queryset if self.request.user.is_staff else queryset.filter(
-            is_active=True
+        serializer = AvailabilitySerializer(
+            [
+                (resource_id, windows[resource_id])
+                for resource_id in resource_ids
+            ],
+            many=True
         )
 
+        return Response(serializer.data)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+
+        allocation_status_cache.invalidate(serializer.instance.id)
+
     def perform_destroy(self, instance):
+        allocation_status_cache.invalidate(instance.id)
+
         try:
             instance.delete()
         except ProtectedError:
@@ -73,17 +185,43 @@ class ResourceViewSet(viewsets.ModelViewSet):
             )
 
 
-class AllocationViewSet(mixins.CreateModelMixin,
-                        mixins.RetrieveModelMixin,
-                        mixins.UpdateModelMixin,
-                        mixins.ListModelMixin,
-                        viewsets.GenericViewSet):
-    queryset = Allocation.objects.order_by('-allocation_date')
-    serializer_class = AllocationSerializer
+def reserved_resources(resource_ids, user, start, end=None):
+    """
+    Return the ids of the resources reserved by users other than ``user`` at
+    ``start``, or between ``start`` and ``end`` when given.
+    """
+    reservations = Reservation.objects.filter(resource_id__in=resource_ids)
+
+    if end is not None and end > start:
+        reservations = reservations.filter(
+            period__overlap=DateTimeTZRange(start, end)
+        )
+    else:
+        reservations = reservations.filter(period__contains=start)
+
+    return set(
+        reservations.exclude(
+            user_id=user.pk
+        ).values_list('resource_id', flat=True)
+    )
+
+
+class NestedResourceMixin:
+    """Resolve the resource of the views nested under a resource."""
+
+    def get_resource(self, for_update=False):
+        # The resource is resolved once per request, unless it must be
+        # fetched again to lock its row.
+        if hasattr(self, '_resource') and not for_update:
+            return self._resource
+
+        resources = Resource.objects
+
+        if for_update:
+            resources = resources.select_for_update()
 
-    def get_resource(self):
         try:
-            resource = Resource.objects.get(id=self.kwargs.get("resource_pk"))
+            resource = resources.get(id=self.kwargs.get("resource_pk"))
 
             if not resource.is_active and not self.request.user.is_staff:
                 raise Resource.DoesNotExist
@@ -91,13 +229,49 @@ class AllocationViewSet(mixins.CreateModelMixin,
         except Resource.DoesNotExist:
             raise Http404
 
+        self._resource = resource
+
         return resource
 
+
+class AllocationViewSet(NestedResourceMixin,
+                        ConditionalGetMixin,
+                        mixins.CreateModelMixin,
+                        mixins.RetrieveModelMixin,
+                        mixins.UpdateModelMixin,
+                        mixins.ListModelMixin,
+                        viewsets.GenericViewSet):
+    queryset = Allocation.objects.order_by('-allocation_date')
+    serializer_class = AllocationSerializer
+    pagination_class = AllocationCursorPagination
+
     def get_queryset(self):
-        return self.queryset.filter(resource=self.get_resource())
+        queryset = self.queryset.filter(
+            resource=self.get_resource()
+        ).select_related('user')
 
+        if self.action == 'list':
+            queryset = queryset.only(
+                'id',
+                'resource_id',
+                'allocation_date',
+                'return_date',
+                'user__id',
+                'user__name'
+            )
+
+        return queryset
+
+    def create(self, request, *args, **kwargs):
+        # The availability check must not read from a lagging replica.
+        with primary():
+            return super().create(request, *args, **kwargs)
+
+    @transaction.atomic
     def perform_create(self, serializer):
-        resource = self.get_resource()
+        # Lock the resource row so concurrent requests for the same resource
+        # run the availability check and the insert one at a time.
+        resource = self.get_resource(for_update=True)
 
         if not resource.is_active:
             raise ValidationError(
@@ -107,8 +281,350 @@ class AllocationViewSet(mixins.CreateModelMixin,
             raise ValidationError(
                 {'detail': 'Resource already allocated.'}
             )
+        elif reserved_resources(
+            [resource.id],
+            self.request.user,
+            serializer.validated_data.get('allocation_date', timezone.now()),
+            serializer.validated_data.get('return_date')
+        ):
+            raise ValidationError(
+                {'detail': 'Resource reserved by another user.'}
+            )
 
-        serializer.save(
+        self.save_allocation(
+            serializer,
             resource=resource,
-            user=self.request.user
+            user=get_user_instance(self.request.user)
+        )
+
+        allocation_status_cache.invalidate(resource.id)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        # Saving an allocation also updates its resource row. Every path
+        # locks the resource before the allocation, so a return here and a
+        # bulk return of the same resource cannot deadlock each other.
+        self.get_resource(for_update=True)
+        self.save_allocation(serializer)
+
+        if 'return_date' in serializer.validated_data:
+            allocation_status_cache.invalidate(serializer.instance.resource_id)
+
+    def save_allocation(self, serializer, **kwargs):
+        try:
+            with transaction.atomic():
+                serializer.save(**kwargs)
+        except IntegrityError:
+            raise ValidationError(
+                {'detail': 'Resource already allocated.'}
+            )
+
+
+class ReservationViewSet(NestedResourceMixin,
+                         mixins.CreateModelMixin,
+                         mixins.RetrieveModelMixin,
+                         mixins.ListModelMixin,
+                         mixins.DestroyModelMixin,
+                         viewsets.GenericViewSet):
+    queryset = Reservation.objects.annotate(
+        starts_at=F('period__startswith')
+    )
+    serializer_class = ReservationSerializer
+    pagination_class = ReservationCursorPagination
+    permission_classes = (
+        IsAuthenticated,
+        IsOwnerOrAdmin
+    )
+
+    def get_queryset(self):
+        return self.queryset.filter(
+            resource=self.get_resource()
+        ).select_related('user')
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        # Allocations check the reservations with the resource row locked,
+        # so a reservation cannot be created in between.
+        resource = self.get_resource(for_update=True)
+
+        if not resource.is_active:
+            raise ValidationError(
+                {
+                    'detail': 'Cannot create reservations for inactive resources.'  # noqa: E501
+                }
+            )
+
+        # Overlapping periods are rejected by the exclusion constraint.
+        try:
+            with transaction.atomic():
+                serializer.save(
+                    resource=resource,
+                    user=get_user_instance(self.request.user)
+                )
+        except IntegrityError:
+            raise ValidationError(
+                {'detail': 'Resource already reserved for this period.'}
+            )
+
+
+class BulkAllocationView(generics.GenericAPIView):
+    serializer_class = BulkAllocationSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        resource_ids = list(dict.fromkeys(
+            serializer.validated_data['resources']
+        ))
+        allocation_ids = list(dict.fromkeys(
+            serializer.validated_data['allocations']
+        ))
+
+        with transaction.atomic():
+            resources, allocations = self.lock(resource_ids, allocation_ids)
+            now = timezone.now()
+
+            returned = self.return_allocations(
+                allocation_ids,
+                allocations,
+                resources,
+                now
+            )
+            allocated = self.create_allocations(resource_ids, resources, now)
+
+            # Only resources whose pointer moved were stamped with ``now``.
+            changed_resources = [
+                resource for resource in resources.values()
+                if resource.updated_at == now
+            ]
+
+            Resource.objects.bulk_update(
+                changed_resources,
+                ['current_allocation', 'updated_at']
+            )
+
+            failed = any('error' in result for result in returned + allocated)
+
+            if failed and serializer.validated_data['atomic']:
+                transaction.set_rollback(True)
+
+                return Response(
+                    {
+                        'returned': self.skip(returned, 'allocation'),
+                        'allocated': self.skip(allocated, 'resource')
+                    },
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            for resource in changed_resources:
+                allocation_status_cache.invalidate(resource.id)
+
+        return Response({'returned': returned, 'allocated': allocated})
+
+    def lock(self, resource_ids, allocation_ids):
+        """
+        Lock every resource and allocation of the batch, always by id, so
+        concurrent batches cannot deadlock each other.
+
+        Resources are locked before allocations, the order of the single
+        allocation views too.
+        """
+        allocation_resources = dict(
+            Allocation.objects.filter(
+                id__in=allocation_ids
+            ).values_list('id', 'resource_id')
         )
+
+        resources = {
+            resource.id: resource
+            for resource in Resource.objects.select_for_update().filter(
+                id__in={*resource_ids, *allocation_resources.values()}
+            ).order_by('id')
+        }
+
+        allocations = {
+            allocation.id: allocation
+            for allocation in Allocation.objects.select_for_update().filter(
+                id__in=allocation_resources
+            ).order_by('id')
+        }
+
+        return resources, allocations
+
+    def is_visible(self, resource):
+        return resource.is_active or self.request.user.is_staff
+
+    def return_allocations(self, allocation_ids, allocations, resources, now):
+        results = []
+        returned_ids = []
+
+        for allocation_id in allocation_ids:
+            allocation = allocations.get(allocation_id)
+            result = {'allocation': allocation_id}
+
+            if allocation is None:
+                result['error'] = 'Not found.'
+            elif not self.is_visible(resources[allocation.resource_id]):
+                result['error'] = 'Not found.'
+            elif allocation.return_date is not None:
+                result['error'] = 'Allocation already returned.'
+            else:
+                resource = resources[allocation.resource_id]
+
+                if resource.current_allocation_id == allocation.id:
+                    resource.current_allocation_id = None
+                    resource.updated_at = now
+
+                returned_ids.append(allocation.id)
+                result['status'] = 'returned'
+
+            results.append(result)
+
+        if returned_ids:
+            Allocation.objects.filter(id__in=returned_ids).update(
+                return_date=now,
+                updated_at=now
+            )
+
+        return results
+
+    def create_allocations(self, resource_ids, resources, now):
+        results = []
+        allocations = []
+        reserved = reserved_resources(resource_ids, self.request.user, now)
+
+        for resource_id in resource_ids:
+            resource = resources.get(resource_id)
+            result = {'resource': resource_id}
+
+            if resource is None or not self.is_visible(resource):
+                result['error'] = 'Not found.'
+            elif not resource.is_active:
+                result['error'] = (
+                    'Cannot create allocations for inactive resources.'
+                )
+            elif resource.is_allocated:
+                result['error'] = 'Resource already allocated.'
+            elif resource_id in reserved:
+                result['error'] = 'Resource reserved by another user.'
+            else:
+                allocations.append(
+                    Allocation(
+                        resource=resource,
+                        user_id=self.request.user.pk,
+                        allocation_date=now
+                    )
+                )
+                result['status'] = 'allocated'
+
+            results.append(result)
+
+        Allocation.objects.bulk_create(allocations)
+
+        created = iter(allocations)
+
+        for result in results:
+            if 'status' in result:
+                allocation = next(created)
+                allocation.resource.current_allocation_id = allocation.id
+                allocation.resource.updated_at = now
+                result['allocation'] = allocation.id
+
+        return results
+
+    def skip(self, results, key):
+        return [
+            result if 'error' in result else {
+                key: result[key],
+                'status': 'skipped'
+            }
+            for result in results
+        ]
+
+
+class AllocationExportView(generics.GenericAPIView):
+    """
+    Stream the allocation history as CSV or JSON Lines, read a chunk at a
+    time so memory does not grow with the history.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, *args, **kwargs):
+        params = AllocationExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        filters = dict(params.validated_data)
+        output = filters.pop('output')
+
+        response = AsyncStreamingHttpResponse(
+            export_allocations(output, **filters),
+            aexport_allocations(output, **filters),
+            content_type=CONTENT_TYPES[output]
+        )
+        response['Content-Disposition'] = \
+            f'attachment; filename="allocations.{output}"'
+
+        response.gzip(request)
+
+        return response
+
+
+class UtilizationView(generics.GenericAPIView):
+    serializer_class = UtilizationSerializer
+    pagination_class = UtilizationCursorPagination
+    permission_classes = (IsAdminUser,)
+    group = None
+
+    def get(self, request, *args, **kwargs):
+        params = UtilizationQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        start = params.validated_data['start']
+        end = params.validated_data['end']
+
+        if params.validated_data['rollup']:
+            # Rollups cover whole days of the range.
+            start_day = timezone.localdate(start)
+            end_day = timezone.localdate(end)
+
+            start = timezone.make_aware(
+                datetime.combine(start_day, time.min)
+            )
+            end = min(
+                timezone.make_aware(
+                    datetime.combine(end_day + timedelta(days=1), time.min)
+                ),
+                timezone.now()
+            )
+
+            # Days never refreshed have no rows, which would read as days
+            # without allocations.
+            if missing := missing_rollup_days(start_day, end_day):
+                return Response(
+                    {
+                        'detail': 'Rollups were not refreshed for '
+                        f'{len(missing)} days of the range, from '
+                        f'{missing[0]} to {missing[-1]}.'
+                    },
+                    status=status.HTTP_409_CONFLICT
+                )
+
+            queryset = rollup_utilization(self.group, start_day, end_day)
+        else:
+            queryset = live_utilization(self.group, start, end)
+
+        page = self.paginate_queryset(queryset)
+
+        serializer = self.get_serializer(
+            page,
+            many=True,
+            context={
+                **self.get_serializer_context(),
+                'group': self.group,
+                'range_time': end - start
+            }
+        )
+
+        return self.get_paginated_response(serializer.data)
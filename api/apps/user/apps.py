@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class UserConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.apps.user'
+
+    def ready(self):
+        from api.apps.user import signals  # noqa: F401
+        from api.apps.user.authentication import check_claims_cache
+
+        check_claims_cache()
@@ -0,0 +1,176 @@
+import time
+
+from asgiref.sync import sync_to_async
+
+from api.apps.utils.caches import is_shared
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.models import TokenUser
+
+
+CLAIMS = ('name', 'is_staff', 'is_active')
+
+REVOKED_KEY = 'jwt-claims-revoked:{}'
+
+
+def get_revocations():
+    return caches[settings.JWT_CLAIMS_CACHE]
+
+
+def check_claims_cache():
+    """
+    Refuse claims authentication when revocations would not reach the other
+    processes, which would keep trusting the claims of demoted users.
+    """
+    if settings.JWT_CLAIMS_AUTH and not is_shared(get_revocations()):
+        raise ImproperlyConfigured(
+            'JWT_CLAIMS_AUTH requires JWT_CLAIMS_CACHE to be a cache shared '
+            'by every process, such as Redis or Memcached.'
+        )
+
+
+def revoke_claims(user_id):
+    """
+    Stop trusting the claims of every token issued to the user until now.
+
+    Access tokens minted from a refresh token keep its ``iat``, so the entry
+    lives as long as a refresh token.
+    """
+    get_revocations().set(
+        REVOKED_KEY.format(user_id),
+        time.time(),
+        api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+    )
+
+
+def claims_revoked(token):
+    return is_revoked(token, get_revocations().get(revocation_key(token)))
+
+
+async def aclaims_revoked(token):
+    return is_revoked(
+        token,
+        await get_revocations().aget(revocation_key(token))
+    )
+
+
+def revocation_key(token):
+    return REVOKED_KEY.format(token[api_settings.USER_ID_CLAIM])
+
+
+def is_revoked(token, revoked_at):
+    if revoked_at is None:
+        return False
+
+    # ``iat`` has a one second resolution, so a token issued in the same
+    # second as the revocation is not trusted either.
+    return token.get('iat', 0) <= revoked_at
+
+
+def get_user_instance(user):
+    """
+    Return a ``User`` that can be assigned to foreign keys.
+
+    Claims users are turned into an instance carrying only the claims, so
+    the user row is not fetched.
+    """
+    User = get_user_model()
+
+    if isinstance(user, User):
+        return user
+
+    instance = User(
+        id=user.id,
+        name=user.name,
+        is_staff=user.is_staff,
+        is_active=user.is_active
+    )
+    instance._state.adding = False
+
+    return instance
+
+
+class ClaimsUser(TokenUser):
+    """A user backed by the claims of an access token."""
+
+    @cached_property
+    def name(self):
+        return self.token.get('name', '')
+
+    @cached_property
+    def is_active(self):
+        return self.token.get('is_active', True)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Authenticate requests from the access token claims.
+
+    The user row is only loaded for tokens without the claims or whose
+    claims were revoked after they were issued, and for every token unless
+    ``JWT_CLAIMS_AUTH`` is set.
+    """
+
+    def get_user(self, validated_token):
+        if not self.use_claims(validated_token):
+            return super().get_user(validated_token)
+        elif claims_revoked(validated_token):
+            return super().get_user(validated_token)
+
+        return self.get_claims_user(validated_token)
+
+    async def aauthenticate(self, request):
+        """Authenticate a plain Django request from an async view."""
+        header = self.get_header(request)
+
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        if not self.use_claims(validated_token):
+            user = await sync_to_async(super().get_user)(validated_token)
+        elif await aclaims_revoked(validated_token):
+            user = await sync_to_async(super().get_user)(validated_token)
+        else:
+            user = self.get_claims_user(validated_token)
+
+        return user, validated_token
+
+    def use_claims(self, validated_token):
+        return settings.JWT_CLAIMS_AUTH and self.has_claims(validated_token)
+
+    def has_claims(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(
+                'Token contained no recognizable user identification'
+            )
+
+        return all(claim in validated_token for claim in CLAIMS)
+
+    def get_claims_user(self, validated_token):
+        user = ClaimsUser(validated_token)
+
+        if not user.is_active:
+            raise AuthenticationFailed(
+                'User is inactive',
+                code='user_inactive'
+            )
+
+        return user
@@ -0,0 +1,213 @@
+import io
+import csv
+import json
+import django
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.db import (
+    IntegrityError,
+    transaction
+)
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+
+from rest_framework import serializers
+
+
+FORMATS = ('csv', 'jsonl')
+
+EMAIL_TAKEN = {'email': ['User with this email already exists.']}
+
+
+class UserImportSerializer(serializers.Serializer):
+    email = serializers.EmailField(max_length=255)
+    name = serializers.CharField(max_length=255)
+    password = serializers.CharField()
+    is_active = serializers.BooleanField(default=True)
+    is_staff = serializers.BooleanField(default=False)
+
+    def validate_email(self, value):
+        return get_user_model().objects.normalize_email(value)
+
+    def validate(self, attrs):
+        User = get_user_model()
+
+        try:
+            validate_password(
+                attrs['password'],
+                user=User(email=attrs['email'], name=attrs['name'])
+            )
+        except DjangoValidationError as error:
+            raise serializers.ValidationError({'password': error.messages})
+
+        return attrs
+
+
+def _init_worker():
+    # Spawned workers import this module before the app registry is ready,
+    # so nothing here resolves models at import time.
+    django.setup()
+
+
+def read_rows(stream, file_format):
+    """Yield ``(row, data, error)`` for each record of a text stream."""
+    if file_format == 'csv':
+        reader = csv.DictReader(stream)
+
+        for row, data in enumerate(reader, start=2):
+            # Empty cells fall back to the serializer defaults.
+            yield row, {
+                key: value for key, value in data.items()
+                if key is not None and value != ''
+            }, None
+    else:
+        for row, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                data = json.loads(line)
+            except ValueError:
+                yield row, None, {'non_field_errors': ['Invalid JSON.']}
+                continue
+
+            if not isinstance(data, dict):
+                yield row, None, {'non_field_errors': ['Expected an object.']}
+            else:
+                yield row, data, None
+
+
+def import_users(file, file_format, batch_size=None, workers=None):
+    """
+    Create the users of a CSV or JSONL file in batches.
+
+    ``file`` is a binary file object that is read one record at a time, so
+    only one batch is held in memory. Passwords are hashed in a process pool
+    when ``workers`` is greater than one, which only the management command
+    does, as forking a server worker inside a request is unsafe. Returns the
+    number of created users and the errors of each rejected row.
+    """
+    batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+    workers = workers or settings.USER_IMPORT_WORKERS
+
+    stream = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    rows = read_rows(stream, file_format)
+
+    created = 0
+    errors = []
+
+    executor = None
+
+    if workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker
+        )
+
+    try:
+        for batch in iter(lambda: list(islice(rows, batch_size)), []):
+            users = validate_batch(batch, errors)
+
+            passwords = [user.password for row, user in users]
+
+            if executor is None:
+                hashes = map(make_password, passwords)
+            else:
+                hashes = executor.map(
+                    make_password,
+                    passwords,
+                    chunksize=max(1, len(passwords) // (workers * 4))
+                )
+
+            for (row, user), password in zip(users, hashes):
+                user.password = password
+
+            created += create_batch(users, errors)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+        stream.detach()
+
+    return {
+        'created': created,
+        'errors': errors
+    }
+
+
+def create_batch(users, errors):
+    """
+    Create the ``(row, user)`` pairs of a batch and return how many were
+    created.
+
+    Emails taken by another process after the batch was validated fail the
+    whole insert, so the batch is then created one user at a time and those
+    rows are reported as errors.
+    """
+    User = get_user_model()
+
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create([user for row, user in users])
+    except IntegrityError:
+        pass
+    else:
+        return len(users)
+
+    created = 0
+
+    for row, user in users:
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create([user])
+        except IntegrityError:
+            errors.append({'row': row, 'errors': EMAIL_TAKEN})
+        else:
+            created += 1
+
+    return created
+
+
+def validate_batch(batch, errors):
+    """Return ``(row, user)`` pairs of unsaved users for the valid rows."""
+    User = get_user_model()
+
+    valid = []
+    emails = set()
+
+    for row, data, error in batch:
+        if error is None:
+            serializer = UserImportSerializer(data=data)
+
+            if serializer.is_valid():
+                email = serializer.validated_data['email']
+
+                if email in emails:
+                    error = {'email': ['Duplicated in the file.']}
+                else:
+                    emails.add(email)
+                    valid.append((row, serializer.validated_data))
+                    continue
+            else:
+                error = serializer.errors
+
+        errors.append({'row': row, 'errors': error})
+
+    existing = set(
+        User.objects.filter(email__in=emails).values_list('email', flat=True)
+    )
+
+    users = []
+
+    for row, data in valid:
+        if data['email'] in existing:
+            errors.append({'row': row, 'errors': EMAIL_TAKEN})
+        else:
+            users.append((row, User(**data)))
+
+    return users
@@ -0,0 +1,49 @@
+"""
+Django command to create users in bulk from a CSV or JSONL file.
+"""
+from api.apps.user.imports import (
+    FORMATS,
+    import_users
+)
+
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+
+class Command(BaseCommand):
+    """Django command to import users."""
+
+    help = 'Creates users from a CSV or JSONL file with email, name, ' \
+        'password, is_active and is_staff columns.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=FORMATS)
+        parser.add_argument('--batch-size', type=int)
+        parser.add_argument('--workers', type=int)
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or \
+            options['path'].rpartition('.')[2].lower()
+
+        if file_format not in FORMATS:
+            raise CommandError(
+                'Unable to detect the file format, use --format.'
+            )
+
+        with open(options['path'], 'rb') as file:
+            result = import_users(
+                file,
+                file_format,
+                batch_size=options['batch_size'],
+                workers=options['workers']
+            )
+
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {dict(error['errors'])}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{result['created']} users created.")
+        )
@@ -1,7 +1,12 @@
+from api.apps.utils.serializers import ValuesListSerializer
+
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth import get_user_model
 
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer as BaseTokenObtainPairSerializer
+)
 
 
 User = get_user_model()
@@ -49,3 +54,24 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class UserListSerializer(ValuesListSerializer):
+    # The password is write only.
+    fields = tuple(
+        field for field in UserSerializer.Meta.fields if field != 'password'
+    )
+    staff_fields = ('is_active', 'is_staff')
+
+
+class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+
+        # Read by ClaimsJWTAuthentication instead of loading the user.
+        token['name'] = user.name
+        token['is_staff'] = user.is_staff
+        token['is_active'] = user.is_active
+
+        return token
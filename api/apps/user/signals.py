@@ -0,0 +1,35 @@
+from api.apps.user.authentication import (
+    CLAIMS,
+    revoke_claims
+)
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    post_delete,
+    pre_save
+)
+from django.dispatch import receiver
+
+
+User = get_user_model()
+
+
+@receiver(pre_save, sender=User)
+def revoke_changed_claims(sender, instance, raw, update_fields, **kwargs):
+    if raw or instance._state.adding:
+        return
+    elif update_fields is not None and not set(CLAIMS) & set(update_fields):
+        return
+
+    current = User.objects.filter(pk=instance.pk).values(*CLAIMS).first()
+
+    if current is None:
+        return
+
+    if any(current[claim] != getattr(instance, claim) for claim in CLAIMS):
+        revoke_claims(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_claims(sender, instance, **kwargs):
+    revoke_claims(instance.pk)
@@ -0,0 +1,89 @@
+import tempfile
+
+from io import StringIO
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.apps.user.imports import import_users
+
+
+User = get_user_model()
+
+
+class ImportUsersCommandTests(TestCase):
+
+    def test_import_users(self):
+        """Test creating users from a CSV file."""
+        with tempfile.NamedTemporaryFile(suffix='.csv') as file:
+            file.write(
+                b'email,name,password\n'
+                b'foo@foo.com,Foo,Str0ng-pass\n'
+                b'bar@bar.com,Bar,Str0ng-pass\n'
+            )
+            file.flush()
+
+            out = StringIO()
+
+            call_command('import_users', file.name, workers=1, stdout=out)
+
+        self.assertIn('2 users created', out.getvalue())
+        self.assertEqual(User.objects.count(), 2)
+
+    def test_import_users_in_process_pool(self):
+        """Test hashing the passwords in worker processes."""
+        with tempfile.NamedTemporaryFile(suffix='.jsonl') as file:
+            for index in range(5):
+                file.write(
+                    f'{{"email": "user{index}@test.com", "name": "User", '
+                    f'"password": "Str0ng-pass"}}\n'.encode()
+                )
+            file.flush()
+
+            out = StringIO()
+
+            call_command(
+                'import_users',
+                file.name,
+                batch_size=2,
+                workers=2,
+                stdout=out
+            )
+
+        self.assertIn('5 users created', out.getvalue())
+        self.assertTrue(
+            User.objects.get(email='user4@test.com').check_password(
+                'Str0ng-pass'
+            )
+        )
+
+    def test_import_users_created_meanwhile(self):
+        """Test emails taken after the validation are reported by row."""
+        def create_meanwhile(password):
+            if not User.objects.filter(email='bar@bar.com').exists():
+                User.objects.create_user('bar@bar.com', 'Str0ng-pass')
+
+            return make_password(password)
+
+        with tempfile.TemporaryFile() as file:
+            file.write(
+                b'email,name,password\n'
+                b'foo@foo.com,Foo,Str0ng-pass\n'
+                b'bar@bar.com,Bar,Str0ng-pass\n'
+            )
+            file.seek(0)
+
+            with patch(
+                'api.apps.user.imports.make_password',
+                create_meanwhile
+            ):
+                result = import_users(file, 'csv', workers=1)
+
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['errors'][0]['row'], 3)
+        self.assertIn('email', result['errors'][0]['errors'])
+        self.assertTrue(User.objects.filter(email='foo@foo.com').exists())
@@ -1,14 +1,25 @@
+from api.apps.user.authentication import check_claims_cache
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import (
+    SimpleTestCase,
+    override_settings
+)
 from django.urls import reverse
 
 from rest_framework.test import APITestCase
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
 
 import json
 
 
 TOKEN_OBTAIN_PAIR_URL = reverse('user:token_obtain_pair')
 TOKEN_REFRESH_URL = reverse('user:token_refresh')
+RESOURCES_URL = reverse('resource_allocation:resource-list')
+ME_URL = reverse('user:me')
 
 User = get_user_model()
 
@@ -165,3 +176,115 @@ class JWTTests(APITestCase):
 
         self.assertNotIn('access', response.data)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(JWT_CLAIMS_AUTH=True)
+class ClaimsAuthenticationTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.payload = {
+            'email': 'test@test.com',
+            'password': 'testpass'
+        }
+
+        self.user = create_user(name='Test', is_staff=True, **self.payload)
+
+    def authenticate(self):
+        response = self.client.post(
+            TOKEN_OBTAIN_PAIR_URL,
+            data=json.dumps(self.payload),
+            content_type='application/json'
+        )
+
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.data["access"]}'
+        )
+
+        return AccessToken(response.data['access'])
+
+    def test_token_contains_user_claims(self):
+        token = self.authenticate()
+
+        self.assertEqual(token['name'], 'Test')
+        self.assertTrue(token['is_staff'])
+        self.assertTrue(token['is_active'])
+
+    def test_request_does_not_load_user(self):
+        self.authenticate()
+
+        # Only the conditional GET validators and the page are queried.
+        with self.assertNumQueries(2):
+            response = self.client.get(RESOURCES_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(JWT_CLAIMS_AUTH=False)
+    def test_request_loads_user_without_claims_auth(self):
+        self.authenticate()
+
+        with self.assertNumQueries(3):
+            response = self.client.get(RESOURCES_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_me_with_claims(self):
+        self.authenticate()
+
+        response = self.client.get(ME_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], self.user.email)
+
+    def test_deactivated_user_is_rejected(self):
+        self.authenticate()
+
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(RESOURCES_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_demoted_user_loses_staff_access(self):
+        self.authenticate()
+
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.client.post(
+            RESOURCES_URL,
+            data=json.dumps({'name': 'Resource'}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ClaimsCacheTests(SimpleTestCase):
+
+    @override_settings(JWT_CLAIMS_AUTH=True)
+    def test_local_memory_cache_is_refused(self):
+        with self.assertRaises(ImproperlyConfigured):
+            check_claims_cache()
+
+    @override_settings(
+        JWT_CLAIMS_AUTH=True,
+        JWT_CLAIMS_CACHE='shared',
+        CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+            },
+            'shared': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': '/tmp/jwt-claims'
+            }
+        }
+    )
+    def test_shared_cache_is_accepted(self):
+        check_claims_cache()
+
+    def test_local_memory_cache_without_claims_auth(self):
+        check_claims_cache()
@@ -1,19 +1,26 @@
+from api.apps.user.serializers import UserSerializer
 from api.apps.core.models import (
     Resource,
     Allocation
 )
 
 from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.urls import reverse
 
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 from rest_framework import status
 
 import json
 
+from unittest.mock import patch
+
 User = get_user_model()
 
 USERS_URL = reverse('user:user-list')
+IMPORT_USERS_URL = reverse('user:user-import-users')
 
 
 def detail_url(user_id):
@@ -84,7 +91,24 @@ class ListUsersTests(APITestCase):
         response = self.client.get(USERS_URL)
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 3)
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_list_users_matches_serializer(self):
+        response = self.client.get(USERS_URL)
+
+        request = response.wsgi_request
+        request.user = self.user
+
+        expected = UserSerializer(
+            User.objects.order_by('id'),
+            many=True,
+            context={'request': request}
+        )
+
+        self.assertEqual(
+            response.content,
+            JSONRenderer().render({**response.data, 'results': expected.data})
+        )
 
     def test_filter_users_by_name(self):
         response = self.client.get(
@@ -93,7 +117,16 @@ class ListUsersTests(APITestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_search_users_by_name_similarity(self):
+        response = self.client.get(
+            USERS_URL,
+            {'search': 'baz'}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_filter_admin_users(self):
         response = self.client.get(
@@ -102,7 +135,7 @@ class ListUsersTests(APITestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_filter_common_users(self):
         response = self.client.get(
@@ -111,7 +144,7 @@ class ListUsersTests(APITestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_filter_active_users(self):
         response = self.client.get(
@@ -120,7 +153,7 @@ class ListUsersTests(APITestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_filter_inactive_users(self):
         response = self.client.get(
@@ -129,7 +162,7 @@ class ListUsersTests(APITestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
     def test_list_users_without_permission(self):
         self.user.is_staff = False
@@ -440,3 +473,85 @@ class DeleteUserTests(APITestCase):
         response = self.client.delete(url)
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ImportUsersTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            name='test',
+            email='test@test.com',
+            password='testpass'
+        )
+
+        self.client.force_authenticate(self.user)
+
+    def upload(self, name, content, **data):
+        return self.client.post(
+            IMPORT_USERS_URL,
+            data={'file': SimpleUploadedFile(name, content), **data},
+            format='multipart'
+        )
+
+    def test_import_users_from_csv(self):
+        content = (
+            b'email,name,password,is_staff\n'
+            b'foo@foo.com,Foo,Str0ng-pass,true\n'
+            b'bar@bar.com,Bar,Str0ng-pass,\n'
+        )
+
+        response = self.upload('users.csv', content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['errors'], [])
+        self.assertTrue(User.objects.get(email='foo@foo.com').is_staff)
+        self.assertTrue(
+            User.objects.get(email='bar@bar.com').check_password('Str0ng-pass')
+        )
+
+    @override_settings(USER_IMPORT_WORKERS=4)
+    @patch('api.apps.user.imports.ProcessPoolExecutor')
+    def test_import_users_without_process_pool(self, executor):
+        """Test requests hash the passwords without forking the server."""
+        response = self.upload(
+            'users.csv',
+            b'email,name,password\nfoo@foo.com,Foo,Str0ng-pass\n'
+        )
+
+        self.assertEqual(response.data['created'], 1)
+        executor.assert_not_called()
+
+    def test_import_users_from_jsonl_reports_row_errors(self):
+        rows = [
+            {'email': 'foo@foo.com', 'name': 'Foo', 'password': 'Str0ng-pass'},
+            {'email': 'test@test.com', 'name': 'Test', 'password': 'Str0ng-p'},
+            {'email': 'bar@bar.com', 'name': 'Bar', 'password': '123'}
+        ]
+        content = '\n'.join(json.dumps(row) for row in rows) + '\nnot json\n'
+
+        response = self.upload('users.jsonl', content.encode())
+
+        errors = {
+            error['row']: error['errors']
+            for error in response.data['errors']
+        }
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(set(errors), {2, 3, 4})
+        self.assertIn('email', errors[2])
+        self.assertIn('password', errors[3])
+
+    def test_import_users_with_unknown_format(self):
+        response = self.upload('users.txt', b'')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_users_without_permission(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.upload('users.csv', b'')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
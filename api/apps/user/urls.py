@@ -1,4 +1,3 @@
-from rest_framework_simplejwt import views as jwt_views
 from rest_framework.routers import DefaultRouter
 from django.urls import (
     path,
@@ -23,13 +22,13 @@ urlpatterns = [
 
     path(
         'token/',
-        jwt_views.TokenObtainPairView.as_view(),
+        views.TokenObtainPairView.as_view(),
         name='token_obtain_pair'
     ),
 
     path(
         'token/refresh/',
-        jwt_views.TokenRefreshView.as_view(),
+        views.TokenRefreshView.as_view(),
         name='token_refresh'
     ),
 
@@ -1,27 +1,71 @@
+from api.apps.utils.prometheus import JWT_TOKENS
+from api.apps.utils.search import TrigramSearchMixin
+from api.apps.user.imports import (
+    FORMATS,
+    import_users
+)
 from api.apps.user.serializers import (
+    TokenObtainPairSerializer,
+    UserListSerializer,
     UserSerializer
 )
 
+from django.conf import settings
 from django.db.models import Q
+from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 from django.db.models.deletion import ProtectedError
 
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAdminUser
+from rest_framework.parsers import MultiPartParser
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework import (
     generics,
     viewsets
 )
+from rest_framework_simplejwt import views as jwt_views
+
+
+class TokenMetricsMixin:
+    """Count the access tokens issued by the view."""
+
+    grant = None
+
+    def post(self, request, *args, **kwargs):
+        # Invalid credentials and tokens raise, so this is a new token.
+        response = super().post(request, *args, **kwargs)
+
+        if settings.PROMETHEUS_METRICS:
+            JWT_TOKENS.labels(self.grant).inc()
+
+        return response
+
+
+class TokenObtainPairView(TokenMetricsMixin, jwt_views.TokenObtainPairView):
+    serializer_class = TokenObtainPairSerializer
+    grant = 'password'
+
+
+class TokenRefreshView(TokenMetricsMixin, jwt_views.TokenRefreshView):
+    grant = 'refresh'
 
 
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
 
     def get_object(self):
-        return self.request.user
+        user = self.request.user
+
+        # Users authenticated from token claims have no database row.
+        if isinstance(user, get_user_model()):
+            return user
+
+        return get_object_or_404(get_user_model(), pk=user.pk)
 
 
-class ManageUsersViewSet(viewsets.ModelViewSet):
+class ManageUsersViewSet(TrigramSearchMixin, viewsets.ModelViewSet):
     queryset = get_user_model().objects.all()
     serializer_class = UserSerializer
     permission_classes = (IsAdminUser,)
@@ -37,7 +81,7 @@ class ManageUsersViewSet(viewsets.ModelViewSet):
             query = Q()
 
             if name:
-                query &= Q(name__unaccent__icontains=name)
+                query &= Q(name__immutable_unaccent__icontains=name)
 
             if status:
                 if 'active' == status:
@@ -53,8 +97,22 @@ class ManageUsersViewSet(viewsets.ModelViewSet):
 
             queryset = queryset.filter(query)
 
+            if self.search_term:
+                queryset = self.search_queryset(queryset)
+
+            queryset = self.values_queryset(
+                queryset,
+                UserListSerializer.get_values(self.request.user)
+            )
+
         return queryset.order_by('id')
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return UserListSerializer
+
+        return super().get_serializer_class()
+
     def perform_destroy(self, instance):
         try:
             instance.delete()
@@ -64,3 +122,28 @@ class ManageUsersViewSet(viewsets.ModelViewSet):
                     "detail": "Unable to delete as there are user-linked allocations."  # noqa: E501
                 }
             )
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='import',
+        parser_classes=(MultiPartParser,)
+    )
+    def import_users(self, request):
+        file = request.FILES.get('file')
+
+        if file is None:
+            raise ValidationError({'file': ['No file was submitted.']})
+
+        file_format = request.data.get(
+            'file_format',
+            file.name.rpartition('.')[2].lower()
+        )
+
+        if file_format not in FORMATS:
+            raise ValidationError(
+                {'file_format': [f'Expected one of: {", ".join(FORMATS)}.']}
+            )
+
+        # A process pool would fork the server worker inside the request.
+        return Response(import_users(file.file, file_format, workers=1))
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class UtilsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api.apps.utils'
+
+    def ready(self):
+        from api.apps.utils.middleware import check_sticky_cache
+
+        check_sticky_cache()
+
+        if settings.REQUEST_METRICS or settings.PROMETHEUS_METRICS:
+            from api.apps.utils import metrics
+
+            metrics.install()
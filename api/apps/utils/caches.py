@@ -0,0 +1,7 @@
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_shared(cache):
+    """Return whether the entries of the cache reach every process."""
+    return not isinstance(cache, (LocMemCache, DummyCache))
@@ -0,0 +1,104 @@
+import hashlib
+
+from django.db.models import (
+    Count,
+    Max
+)
+from django.utils.cache import get_conditional_response
+from django.utils.http import (
+    http_date,
+    quote_etag
+)
+from django.utils.timezone import now
+
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    Answer list and detail requests with ``304 Not Modified`` while the
+    client's ``If-None-Match`` or ``If-Modified-Since`` validators match.
+
+    Detail validators come from the row's ``updated_at``. List validators
+    come from the latest ``updated_at`` and the row count of the filtered
+    queryset, so the serializer only runs when the data changed.
+
+    ``If-Modified-Since`` is ignored when ``If-None-Match`` is sent, as
+    RFC 7232 §6 requires, since only the ETag tells writes made within the
+    same second apart.
+    """
+
+    def get_etag(self, *values):
+        # The representation also depends on the user and the renderer.
+        key = repr(
+            (
+                *values,
+                self.request.user.is_staff,
+                self.request.accepted_renderer.format
+            )
+        )
+
+        return quote_etag(hashlib.sha1(key.encode()).hexdigest())
+
+    def conditional_response(self, etag, last_modified, render):
+        timestamp = last_modified and int(last_modified.timestamp())
+
+        # Last-Modified has one second resolution, so it is left out until
+        # that second is over. Otherwise a later write within it would still
+        # match, and clients sending only If-Modified-Since would get a 304.
+        if timestamp and timestamp >= int(now().timestamp()):
+            timestamp = None
+
+        # Only the ETag is evaluated when the client sends one.
+        response = get_conditional_response(
+            self.request,
+            etag=etag,
+            last_modified=None if 'If-None-Match' in self.request.headers
+            else timestamp
+        )
+
+        if response is None:
+            response = render()
+
+        response['ETag'] = etag
+
+        if timestamp:
+            response['Last-Modified'] = http_date(timestamp)
+
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+
+        def render():
+            return Response(self.get_serializer(instance).data)
+
+        return self.conditional_response(
+            self.get_etag(instance.pk, instance.updated_at),
+            instance.updated_at,
+            render
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        validators = queryset.aggregate(
+            last_modified=Max('updated_at'),
+            count=Count('pk')
+        )
+
+        def render():
+            page = self.paginate_queryset(queryset)
+
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+
+                return self.get_paginated_response(serializer.data)
+
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        return self.conditional_response(
+            self.get_etag(validators['count'], validators['last_modified']),
+            validators['last_modified'],
+            render
+        )
@@ -0,0 +1,113 @@
+"""
+Django command to compare the request latency of the connection modes.
+"""
+import time
+import statistics
+
+from api.apps.core.models import Resource
+
+from django.db import connections
+from django.core.signals import (
+    request_finished,
+    request_started
+)
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+from rest_framework.settings import api_settings
+
+
+class Command(BaseCommand):
+    """Django command to benchmark database connection persistence."""
+
+    help = (
+        'Measures the database time of simulated requests when connections '
+        'are closed after each request, kept open, and pooled by PgBouncer.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Number of requests simulated for each mode.'
+        )
+        parser.add_argument(
+            '--pgbouncer',
+            metavar='HOST:PORT',
+            help='Also benchmark the connections through this PgBouncer.'
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 2:
+            raise CommandError('--requests must be at least 2.')
+
+        connection = connections['default']
+        original = dict(connection.settings_dict)
+
+        modes = [
+            ('closed after each request', {'CONN_MAX_AGE': 0}),
+            ('persistent', {'CONN_MAX_AGE': None})
+        ]
+
+        if options['pgbouncer']:
+            host, _, port = options['pgbouncer'].rpartition(':')
+
+            if not host or not port.isdigit():
+                raise CommandError('--pgbouncer must be HOST:PORT.')
+
+            modes.append(
+                (
+                    'PgBouncer',
+                    {
+                        'HOST': host,
+                        'PORT': port,
+                        'CONN_MAX_AGE': 0,
+                        'DISABLE_SERVER_SIDE_CURSORS': True
+                    }
+                )
+            )
+
+        try:
+            for name, settings in modes:
+                connection.close()
+                connection.settings_dict.update(original, **settings)
+
+                timings = self.run(options['requests'])
+
+                self.stdout.write(self.format(name, timings))
+        finally:
+            connection.close()
+            connection.settings_dict.update(original)
+
+    def run(self, requests):
+        """Return the duration in milliseconds of each simulated request."""
+        timings = []
+
+        for _ in range(requests):
+            start = time.perf_counter()
+
+            # The request signals open and close connections as the request
+            # handler does, around the query of the first resource list page.
+            request_started.send(sender=self.__class__)
+
+            try:
+                list(Resource.objects.order_by('id')[:api_settings.PAGE_SIZE])
+            finally:
+                request_finished.send(sender=self.__class__)
+
+            timings.append((time.perf_counter() - start) * 1000)
+
+        return timings
+
+    def format(self, name, timings):
+        percentiles = statistics.quantiles(timings, n=100)
+
+        return (
+            f'{name:<28} '
+            f'mean {statistics.mean(timings):7.2f} ms  '
+            f'p50 {percentiles[49]:7.2f} ms  '
+            f'p95 {percentiles[94]:7.2f} ms'
+        )
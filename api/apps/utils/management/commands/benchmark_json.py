@@ -0,0 +1,152 @@
+"""
+Django command to compare the JSON renderers and parsers of the API.
+"""
+import time
+
+from datetime import timedelta
+from types import SimpleNamespace
+
+from api.apps.utils.parsers import (
+    JSONParser,
+    orjson
+)
+from api.apps.utils.renderers import JSONRenderer
+from api.apps.resource_allocation.serializers import (
+    ResourceSerializer,
+    AllocationSerializer
+)
+from api.apps.core.models import (
+    Resource,
+    Allocation
+)
+
+from io import BytesIO
+
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from rest_framework import (
+    parsers,
+    renderers
+)
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the JSON renderer and parser."""
+
+    help = (
+        'Times REST framework\'s JSON renderer and parser against the '
+        'orjson ones on resource and allocation lists.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=10000,
+            help='Number of rows of each list.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Number of timed runs, the fastest one is reported.'
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    'orjson is not installed, both sides use the stdlib.'
+                )
+            )
+
+        for name, data in self.get_lists(options['rows']):
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+
+            content = renderers.JSONRenderer().render(data)
+
+            self.compare(
+                'render',
+                lambda: renderers.JSONRenderer().render(data),
+                lambda: JSONRenderer().render(data),
+                options['repeat']
+            )
+            self.compare(
+                'parse',
+                lambda: parsers.JSONParser().parse(BytesIO(content)),
+                lambda: JSONParser().parse(BytesIO(content)),
+                options['repeat']
+            )
+
+            identical = JSONRenderer().render(data) == content
+
+            self.stdout.write(f'  identical output: {identical}')
+
+    def get_lists(self, rows):
+        """Yield serialized list pages without touching the database."""
+        context = {
+            'request': SimpleNamespace(
+                user=get_user_model()(is_staff=True)
+            )
+        }
+
+        resources = [
+            Resource(
+                id=index,
+                name=f'Resource {index}',
+                is_active=bool(index % 10),
+                current_allocation_id=index if index % 3 else None
+            )
+            for index in range(1, rows + 1)
+        ]
+
+        yield 'resource list', self.page(
+            ResourceSerializer(resources, many=True, context=context).data
+        )
+
+        now = timezone.now()
+        user = get_user_model()(id=1, name='Usuário')
+
+        allocations = [
+            Allocation(
+                id=index,
+                user=user,
+                allocation_date=now - timedelta(hours=index),
+                return_date=now if index % 2 else None
+            )
+            for index in range(1, rows + 1)
+        ]
+
+        yield 'allocation list', self.page(
+            AllocationSerializer(allocations, many=True, context=context).data
+        )
+
+    def page(self, results):
+        return {
+            'next': None,
+            'previous': None,
+            'results': results
+        }
+
+    def compare(self, name, baseline, candidate, repeat):
+        baseline_time = self.time(baseline, repeat)
+        candidate_time = self.time(candidate, repeat)
+
+        self.stdout.write(
+            f'  {name:<8}'
+            f'stdlib {baseline_time:8.2f} ms  '
+            f'fast {candidate_time:8.2f} ms  '
+            f'speedup {baseline_time / candidate_time:5.1f}x'
+        )
+
+    def time(self, function, repeat):
+        timings = []
+
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+
+        return min(timings) * 1000
@@ -0,0 +1,100 @@
+"""
+Django command to print the execution plans of the main API queries.
+"""
+from api.apps.resource_allocation.views import (
+    ResourceViewSet,
+    AllocationViewSet
+)
+from api.apps.user.views import ManageUsersViewSet
+from api.apps.core.models import Allocation
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.http import (
+    HttpRequest,
+    QueryDict
+)
+
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+class Command(BaseCommand):
+    """Django command to explain the list queries of the API views."""
+
+    help = 'Prints EXPLAIN ANALYZE plans for the main API list queries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-analyze',
+            action='store_true',
+            help='Print the estimated plans without running the queries.'
+        )
+
+    def handle(self, *args, **options):
+        analyze = not options['no_analyze']
+
+        for name, queryset in self.get_querysets():
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+
+            if analyze:
+                plan = queryset.explain(analyze=True, buffers=True)
+            else:
+                plan = queryset.explain()
+
+            self.stdout.write(plan + '\n')
+
+    def get_querysets(self):
+        yield 'resource-list', self.get_page(ResourceViewSet)
+
+        for status in ('allocated', 'unallocated'):
+            yield f'resource-list status={status}', self.get_page(
+                ResourceViewSet,
+                query_string=f'status={status}'
+            )
+
+        yield 'resource-list name', self.get_page(
+            ResourceViewSet,
+            query_string='name=foo'
+        )
+
+        resource_id = Allocation.objects.values_list(
+            'resource_id',
+            flat=True
+        ).first()
+
+        if resource_id is not None:
+            yield 'allocation-list', self.get_page(
+                AllocationViewSet,
+                resource_pk=resource_id
+            )
+
+        yield 'user-list name', self.get_page(
+            ManageUsersViewSet,
+            query_string='name=foo'
+        )
+
+    def get_page(self, viewset, query_string='', **kwargs):
+        """Return the first page of the viewset list queryset."""
+        http_request = HttpRequest()
+        http_request.GET = QueryDict(query_string)
+
+        request = Request(http_request)
+        request.user = get_user_model()(is_staff=True)
+
+        view = viewset(
+            action='list',
+            request=request,
+            kwargs=kwargs,
+            format_kwarg=None
+        )
+
+        paginator = view.pagination_class()
+        ordering = paginator.ordering
+
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+
+        return view.get_queryset().order_by(*ordering)[
+            :api_settings.PAGE_SIZE + 1
+        ]
@@ -0,0 +1,308 @@
+"""
+Django command to measure the latency and throughput of the API routes.
+"""
+import json
+import time
+import queue
+import random
+import statistics
+
+from concurrent.futures import ThreadPoolExecutor
+
+from api.apps.utils.management.commands.seed_data import (
+    ADMIN_EMAIL,
+    BENCHMARK_EMAIL,
+    PASSWORD
+)
+from api.apps.core.models import Resource
+
+from django.conf import settings
+from django.db import (
+    close_old_connections,
+    connection
+)
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the API routes."""
+
+    help = 'Sends requests to the API routes through the full Django ' \
+        'stack and prints the latency percentiles, requests per second ' \
+        'and queries per request of each route as JSON. Allocations are ' \
+        'created, so run it against seeded data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='Number of timed requests per route.'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Number of threads sending requests.'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=10,
+            help='Number of untimed requests per route.'
+        )
+        parser.add_argument(
+            '--routes',
+            nargs='+',
+            metavar='ROUTE',
+            help='Only benchmark these routes.'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the report to a file.')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 2 or options['concurrency'] < 1:
+            raise CommandError(
+                '--requests must be at least 2 and --concurrency at least 1.'
+            )
+
+        self.random = random.Random(options['seed'])
+        self.host = next(
+            (
+                host for host in settings.ALLOWED_HOSTS
+                if host != '*' and not host.startswith('.')
+            ),
+            'localhost'
+        )
+
+        routes = self.get_routes()
+
+        if options['routes']:
+            unknown = set(options['routes']) - set(routes)
+
+            if unknown:
+                raise CommandError(
+                    f'Unknown routes: {", ".join(sorted(unknown))}. '
+                    f'Choose from {", ".join(routes)}.'
+                )
+
+            routes = {name: routes[name] for name in options['routes']}
+
+        report = {
+            'settings': {
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'warmup': options['warmup'],
+                'seed': options['seed'],
+                'page_size': settings.REST_FRAMEWORK['PAGE_SIZE'],
+                'conn_max_age': settings.DATABASES['default']['CONN_MAX_AGE']
+            },
+            'routes': {
+                name: self.run(route, options)
+                for name, route in routes.items()
+            }
+        }
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def get_routes(self):
+        """Return a request factory for each route, keyed by its name."""
+        admin_token = self.get_token(ADMIN_EMAIL)
+        user_token = self.get_token(BENCHMARK_EMAIL)
+
+        resource_ids = list(
+            Resource.objects.filter(
+                is_active=True,
+                current_allocation__isnull=False
+            ).values_list('id', flat=True)[:100]
+        )
+
+        if not resource_ids:
+            raise CommandError('No allocated resources, run seed_data first.')
+
+        # Created allocations are returned after each request, so every
+        # request takes a free resource from the pool.
+        free_resources = queue.Queue()
+
+        for resource_id in Resource.objects.filter(
+            is_active=True,
+            current_allocation__isnull=True
+        ).values_list('id', flat=True)[:100]:
+            free_resources.put(resource_id)
+
+        resource_list = reverse('resource_allocation:resource-list')
+        user_list = reverse('user:user-list')
+
+        def get(path, token, **params):
+            return lambda: ('get', path, params, token, None)
+
+        routes = {
+            'token-obtain': lambda: (
+                'post',
+                reverse('user:token_obtain_pair'),
+                {'email': BENCHMARK_EMAIL, 'password': PASSWORD},
+                None,
+                None
+            ),
+            'resource-list': get(resource_list, user_token),
+            'resource-list-admin': get(resource_list, admin_token)
+        }
+
+        for status in ('allocated', 'unallocated'):
+            routes[f'resource-list-{status}'] = get(
+                resource_list,
+                user_token,
+                status=status
+            )
+
+        for status in ('active', 'inactive'):
+            routes[f'resource-list-{status}'] = get(
+                resource_list,
+                admin_token,
+                status=status
+            )
+
+        routes['resource-list-name'] = get(
+            resource_list,
+            user_token,
+            name='note'
+        )
+        routes['allocation-list'] = lambda: (
+            'get',
+            reverse(
+                'resource_allocation:allocation-list',
+                args=[self.random.choice(resource_ids)]
+            ),
+            {},
+            user_token,
+            None
+        )
+
+        if not free_resources.empty():
+            routes['allocation-create'] = lambda: self.allocate(
+                free_resources,
+                user_token
+            )
+
+        routes['user-list'] = get(user_list, admin_token)
+
+        return routes
+
+    def get_token(self, email):
+        response = Client(HTTP_HOST=self.host).post(
+            reverse('user:token_obtain_pair'),
+            {'email': email, 'password': PASSWORD}
+        )
+
+        if response.status_code != 200:
+            raise CommandError(
+                f'Unable to sign in as {email}, run seed_data first.'
+            )
+
+        return response.json()['access']
+
+    def allocate(self, free_resources, token):
+        resource_id = free_resources.get()
+
+        def release(client, response):
+            if response.status_code == 201:
+                client.patch(
+                    reverse(
+                        'resource_allocation:allocation-detail',
+                        args=[resource_id, response.json()['id']]
+                    ),
+                    {'return_date': timezone.now().isoformat()},
+                    content_type='application/json',
+                    HTTP_AUTHORIZATION=f'Bearer {token}'
+                )
+
+            free_resources.put(resource_id)
+
+        return (
+            'post',
+            reverse('resource_allocation:allocation-list', args=[resource_id]),
+            {},
+            token,
+            release
+        )
+
+    def run(self, route, options):
+        for _ in range(options['warmup']):
+            self.send(Client(HTTP_HOST=self.host), route)
+
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(options['concurrency']) as executor:
+            results = list(
+                executor.map(
+                    lambda _: self.send_from_thread(route),
+                    range(options['requests'])
+                )
+            )
+
+        elapsed = time.perf_counter() - start
+
+        timings = [timing for timing, _, _ in results]
+        percentiles = statistics.quantiles(
+            timings,
+            n=100,
+            method='inclusive'
+        )
+
+        return {
+            'requests_per_second': round(len(results) / elapsed, 2),
+            'latency_ms': {
+                'mean': round(statistics.mean(timings), 2),
+                'p50': round(percentiles[49], 2),
+                'p95': round(percentiles[94], 2),
+                'p99': round(percentiles[98], 2)
+            },
+            'queries_per_request': round(
+                statistics.mean(queries for _, queries, _ in results),
+                2
+            ),
+            'errors': sum(status >= 400 for _, _, status in results)
+        }
+
+    def send_from_thread(self, route):
+        try:
+            return self.send(Client(HTTP_HOST=self.host), route)
+        finally:
+            # The test client keeps the connection open, so it is closed or
+            # kept as the request handler would according to CONN_MAX_AGE.
+            close_old_connections()
+
+    def send(self, client, route):
+        """Send a request and return its duration, queries and status."""
+        method, path, data, token, release = route()
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+
+            return execute(sql, params, many, context)
+
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+
+        with connection.execute_wrapper(count):
+            start = time.perf_counter()
+            response = getattr(client, method)(path, data, **headers)
+            timing = (time.perf_counter() - start) * 1000
+
+        if release is not None:
+            release(client, response)
+
+        return timing, queries, response.status_code
@@ -0,0 +1,263 @@
+"""
+Django command to fill the database with synthetic users, resources and
+allocations for benchmarks.
+"""
+import random
+
+from datetime import timedelta
+
+from api.apps.core.models import (
+    Resource,
+    Allocation
+)
+from api.apps.resource_allocation.partitions import (
+    add_months,
+    create_partition,
+    get_partitions
+)
+
+from django.db import transaction
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import (
+    BaseCommand,
+    CommandError
+)
+
+
+EMAIL = 'user{}@seed.example.com'
+
+# Created with fixed permissions, so benchmarks always sign in as the same
+# kind of user.
+ADMIN_EMAIL = 'admin@seed.example.com'
+
+BENCHMARK_EMAIL = 'benchmark@seed.example.com'
+
+PASSWORD = 'seedpass'
+
+FIRST_NAMES = (
+    'Ana', 'Antônio', 'Beatriz', 'Bruno', 'Camila', 'César', 'Débora',
+    'Fábio', 'Gabriela', 'Helena', 'João', 'José', 'Júlia', 'Letícia',
+    'Lucas', 'Márcia', 'Maria', 'Otávio', 'Patrícia', 'Sérgio'
+)
+
+LAST_NAMES = (
+    'Araújo', 'Barbosa', 'Bezerra', 'Carvalho', 'Conceição', 'Gonçalves',
+    'Lima', 'Magalhães', 'Moura', 'Oliveira', 'Pereira', 'Ribeiro',
+    'Simões', 'Souza', 'Vieira'
+)
+
+RESOURCE_NAMES = (
+    'Notebook', 'Monitor', 'Projetor', 'Câmera', 'Microfone', 'Tablet',
+    'Teclado', 'Mouse', 'Headset', 'Roteador', 'Impressora', 'Sala'
+)
+
+BRANDS = (
+    'Dell', 'Lenovo', 'Samsung', 'LG', 'Epson', 'Sony', 'Logitech', 'HP'
+)
+
+
+class Command(BaseCommand):
+    """Django command to seed the database with synthetic data."""
+
+    help = 'Creates users, resources and allocations with realistic ' \
+        'proportions of staff users, inactive resources and open ' \
+        'allocations. The same --seed always creates the same data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--resources', type=int, default=1000)
+        parser.add_argument('--allocations', type=int, default=20000)
+        parser.add_argument(
+            '--open-ratio',
+            type=float,
+            default=0.3,
+            help='Share of the active resources currently allocated.'
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='Number of past days the allocation history spans.'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+
+        if options['users'] < 2 or options['resources'] < 1:
+            raise CommandError(
+                'Seed at least 2 users, a staff one and a regular one, and '
+                '1 resource.'
+            )
+        elif not 0 <= options['open_ratio'] <= 1:
+            raise CommandError('--open-ratio must be between 0 and 1.')
+        elif User.objects.filter(email=ADMIN_EMAIL).exists():
+            raise CommandError('The database was already seeded.')
+
+        self.random = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.batch_size = options['batch_size']
+
+        start = self.now - timedelta(days=options['days'])
+
+        self.create_partitions(start)
+
+        with transaction.atomic():
+            users = self.create_users(options['users'])
+            resources = self.create_resources(options['resources'])
+            allocations = self.create_allocations(
+                users,
+                resources,
+                options['allocations'],
+                options['open_ratio'],
+                start
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{len(users)} users, {len(resources)} resources and '
+                f'{allocations} allocations created. Users sign in as '
+                f'{EMAIL.format("N")}, {ADMIN_EMAIL} (staff) or '
+                f'{BENCHMARK_EMAIL} with the password {PASSWORD}.'
+            )
+        )
+
+    def create_partitions(self, start):
+        """Create the partitions of the history, so it skips the default."""
+        partitions = get_partitions()
+        month = start.date().replace(day=1)
+
+        while month <= self.now.date():
+            if month not in partitions:
+                create_partition(month)
+
+            month = add_months(month, 1)
+
+    def create_users(self, count):
+        User = get_user_model()
+        # Hashing each password would take most of the run.
+        password = make_password(PASSWORD)
+
+        users = [
+            User(
+                email=ADMIN_EMAIL,
+                name='Admin',
+                password=password,
+                is_staff=True
+            ),
+            User(
+                email=BENCHMARK_EMAIL,
+                name='Benchmark',
+                password=password,
+                is_staff=False
+            )
+        ]
+        users += [
+            User(
+                email=EMAIL.format(index),
+                name=(
+                    f'{self.random.choice(FIRST_NAMES)} '
+                    f'{self.random.choice(LAST_NAMES)}'
+                ),
+                password=password,
+                # About 5% of the users are staff.
+                is_staff=self.random.random() < 0.05,
+                is_active=self.random.random() < 0.97
+            )
+            for index in range(count - len(users))
+        ]
+
+        return User.objects.bulk_create(users, batch_size=self.batch_size)
+
+    def create_resources(self, count):
+        resources = [
+            Resource(
+                name=(
+                    f'{self.random.choice(RESOURCE_NAMES)} '
+                    f'{self.random.choice(BRANDS)} {index:05}'
+                ),
+                is_active=self.random.random() < 0.95
+            )
+            for index in range(count)
+        ]
+
+        return Resource.objects.bulk_create(
+            resources,
+            batch_size=self.batch_size
+        )
+
+    def create_allocations(self, users, resources, count, open_ratio, start):
+        """
+        Create back-to-back allocation histories, leaving the last allocation
+        of some active resources open.
+        """
+        # Some resources are much more popular than others.
+        weights = [self.random.paretovariate(1.5) for _ in resources]
+        counts = [0] * len(resources)
+
+        for index in self.random.choices(
+            range(len(resources)),
+            weights=weights,
+            k=count
+        ):
+            counts[index] += 1
+
+        span = (self.now - start).total_seconds()
+        allocations = []
+
+        for resource, resource_count in zip(resources, counts):
+            if not resource_count:
+                continue
+
+            is_open = resource.is_active and \
+                self.random.random() < open_ratio
+
+            # Each allocation and the gap before the next take about the
+            # same share of the span.
+            slot = span / resource_count
+            allocation_date = start
+
+            for index in range(resource_count):
+                allocation_date += timedelta(
+                    seconds=self.random.uniform(0, slot / 2)
+                )
+                return_date = allocation_date + timedelta(
+                    seconds=self.random.uniform(slot / 4, slot / 2)
+                )
+
+                if index == resource_count - 1 and is_open:
+                    return_date = None
+
+                allocations.append(
+                    Allocation(
+                        resource=resource,
+                        user=self.random.choice(users),
+                        allocation_date=allocation_date,
+                        return_date=return_date
+                    )
+                )
+
+                allocation_date = return_date or allocation_date
+
+        Allocation.objects.bulk_create(
+            allocations,
+            batch_size=self.batch_size
+        )
+
+        allocated = []
+
+        for allocation in allocations:
+            if allocation.return_date is None:
+                allocation.resource.current_allocation_id = allocation.id
+                allocated.append(allocation.resource)
+
+        Resource.objects.bulk_update(
+            allocated,
+            ['current_allocation'],
+            batch_size=self.batch_size
+        )
+
+        return len(allocations)
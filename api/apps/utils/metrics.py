@@ -0,0 +1,97 @@
+import time
+
+from contextvars import ContextVar
+from contextlib import contextmanager
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from rest_framework.serializers import BaseSerializer
+
+
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    """Time spent by a request in the database and in serializers."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        # Nested serializers are only timed once.
+        self.serializer_depth = 0
+
+    @property
+    def total_time(self):
+        return time.perf_counter() - self.start
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper adding each query to the request metrics."""
+    metrics = current_metrics.get()
+
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - start
+
+
+@contextmanager
+def serializer_timer():
+    metrics = current_metrics.get()
+
+    if metrics is None:
+        yield
+        return
+
+    metrics.serializer_depth += 1
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        metrics.serializer_depth -= 1
+
+        if not metrics.serializer_depth:
+            metrics.serializer_time += time.perf_counter() - start
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    # The wrappers outlive the database connection, which may reconnect.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def timed_data(data):
+    def fget(self):
+        with serializer_timer():
+            return data.fget(self)
+
+    fget.timed = True
+
+    return property(fget, doc=data.__doc__)
+
+
+def install():
+    """
+    Record the queries of every connection and time the serialization of
+    ``serializer.data``, where REST framework serializers do their work.
+    """
+    connection_created.connect(
+        install_query_recorder,
+        dispatch_uid='install_query_recorder'
+    )
+
+    for connection in connections.all():
+        install_query_recorder(None, connection)
+
+    if not getattr(BaseSerializer.data.fget, 'timed', False):
+        BaseSerializer.data = timed_data(BaseSerializer.data)
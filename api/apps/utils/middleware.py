@@ -0,0 +1,237 @@
+import json
+import asyncio
+import logging
+
+from api.apps.utils import prometheus
+from api.apps.utils.caches import is_shared
+from api.apps.utils.metrics import (
+    RequestMetrics,
+    current_metrics
+)
+from api.apps.utils.routers import primary
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.decorators import sync_and_async_middleware
+
+from rest_framework.permissions import SAFE_METHODS
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+logger = logging.getLogger('api.requests')
+
+STICKY_KEY = 'replica-sticky:{}'
+
+authentication = JWTAuthentication()
+
+
+def get_view_name(request):
+    """
+    Return the URL name of the request view, with the viewset action in
+    place of the route suffix, e.g. ``allocation-create``.
+    """
+    match = request.resolver_match
+
+    if match is None:
+        return None
+
+    initkwargs = getattr(match.func, 'initkwargs', {})
+    actions = getattr(match.func, 'actions', None)
+
+    if actions and 'basename' in initkwargs:
+        action = actions.get(request.method.lower())
+
+        if action:
+            return f"{initkwargs['basename']}-{action.replace('_', '-')}"
+
+    return match.url_name
+
+
+def milliseconds(seconds):
+    return round(seconds * 1000, 2)
+
+
+def report(request, response, metrics):
+    view = get_view_name(request)
+    total_time = metrics.total_time
+
+    if settings.REQUEST_METRICS:
+        log_metrics(request, response, metrics, view, total_time)
+
+    if settings.PROMETHEUS_METRICS:
+        prometheus.observe_request(
+            view,
+            request.method,
+            response.status_code,
+            metrics,
+            total_time
+        )
+
+
+def log_metrics(request, response, metrics, view, total_time):
+    app_time = total_time - metrics.db_time - metrics.serializer_time
+    budget = settings.REQUEST_METRICS_QUERY_BUDGET
+    over_budget = bool(budget) and metrics.queries > budget
+
+    response['Server-Timing'] = ', '.join(
+        (
+            f'db;dur={milliseconds(metrics.db_time)};'
+            f'desc="{metrics.queries} queries"',
+            f'serializer;dur={milliseconds(metrics.serializer_time)}',
+            f'app;dur={milliseconds(app_time)}',
+            f'total;dur={milliseconds(total_time)}'
+        )
+    )
+
+    logger.log(
+        logging.WARNING if over_budget else logging.INFO,
+        json.dumps(
+            {
+                'view': view,
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'queries': metrics.queries,
+                'db_ms': milliseconds(metrics.db_time),
+                'serializer_ms': milliseconds(metrics.serializer_time),
+                'total_ms': milliseconds(total_time),
+                'over_query_budget': over_budget
+            }
+        )
+    )
+
+
+@sync_and_async_middleware
+def request_metrics_middleware(get_response):
+    """
+    Count the queries and time the database and serializers of each
+    request.
+
+    With ``REQUEST_METRICS`` they are reported in a ``Server-Timing``
+    header and a JSON log line of the ``api.requests`` logger, and requests
+    running more queries than ``REQUEST_METRICS_QUERY_BUDGET`` are logged
+    as warnings. With ``PROMETHEUS_METRICS`` they are observed by the
+    Prometheus request metrics.
+    """
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            metrics = RequestMetrics()
+            token = current_metrics.set(metrics)
+
+            try:
+                response = await get_response(request)
+            finally:
+                current_metrics.reset(token)
+
+            report(request, response, metrics)
+
+            return response
+    else:
+        def middleware(request):
+            metrics = RequestMetrics()
+            token = current_metrics.set(metrics)
+
+            try:
+                response = get_response(request)
+            finally:
+                current_metrics.reset(token)
+
+            report(request, response, metrics)
+
+            return response
+
+    return middleware
+
+
+def get_token_user_id(request):
+    """Return the user id of the request access token, if it is valid."""
+    header = authentication.get_header(request)
+
+    if header is None:
+        return None
+
+    raw_token = authentication.get_raw_token(header)
+
+    if raw_token is None:
+        return None
+
+    try:
+        return AccessToken(raw_token).get(api_settings.USER_ID_CLAIM)
+    except TokenError:
+        return None
+
+
+def get_sticky_cache():
+    return caches[settings.REPLICA_STICKY_CACHE]
+
+
+def check_sticky_cache():
+    """
+    Refuse a read replica when the writes of a user would only keep the
+    process that handled them on the primary.
+    """
+    if settings.DATABASE_REPLICA_HOST and not is_shared(get_sticky_cache()):
+        raise ImproperlyConfigured(
+            'DATABASE_REPLICA_HOST requires REPLICA_STICKY_CACHE to be a '
+            'cache shared by every process, such as Redis or Memcached.'
+        )
+
+
+@sync_and_async_middleware
+def replica_middleware(get_response):
+    """
+    Send every read of unsafe requests to the primary database and keep
+    the user on it for ``REPLICA_STICKY_SECONDS`` afterwards, so users read
+    their own writes while the replica catches up.
+    """
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            unsafe = request.method not in SAFE_METHODS
+            user_id = get_token_user_id(request)
+            key = STICKY_KEY.format(user_id)
+
+            if unsafe or (
+                user_id is not None and await get_sticky_cache().aget(key)
+            ):
+                with primary():
+                    response = await get_response(request)
+            else:
+                response = await get_response(request)
+
+            if unsafe and user_id is not None:
+                await get_sticky_cache().aset(
+                    key,
+                    True,
+                    settings.REPLICA_STICKY_SECONDS
+                )
+
+            return response
+    else:
+        def middleware(request):
+            unsafe = request.method not in SAFE_METHODS
+            user_id = get_token_user_id(request)
+            key = STICKY_KEY.format(user_id)
+
+            if unsafe or (
+                user_id is not None and get_sticky_cache().get(key)
+            ):
+                with primary():
+                    response = get_response(request)
+            else:
+                response = get_response(request)
+
+            if unsafe and user_id is not None:
+                get_sticky_cache().set(
+                    key,
+                    True,
+                    settings.REPLICA_STICKY_SECONDS
+                )
+
+            return response
+
+    return middleware
@@ -0,0 +1,156 @@
+import json
+
+from base64 import (
+    b64decode,
+    b64encode
+)
+from datetime import datetime
+from binascii import Error as BinasciiError
+
+from django.db.models import Q
+from django.core.exceptions import ValidationError
+
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class CursorPagination(pagination.CursorPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = 'id'
+
+
+class AllocationCursorPagination(CursorPagination):
+    ordering = ('-allocation_date', 'id')
+
+
+class ReservationCursorPagination(CursorPagination):
+    ordering = ('starts_at', 'id')
+
+
+class SearchCursorPagination(CursorPagination):
+    ordering = ('-similarity', 'id')
+
+
+class UtilizationCursorPagination(CursorPagination):
+    ordering = 'group_id'
+
+
+class KeysetPagination:
+    """
+    Cursor pagination for the async views.
+
+    The cursor holds the ordering values of the last row of the page, so
+    each page is a single range query over the ordering index.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = CursorPagination.page_size_query_param
+    max_page_size = CursorPagination.max_page_size
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering):
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+
+        self.ordering = ordering
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.GET[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE
+
+        if page_size <= 0:
+            return api_settings.PAGE_SIZE
+
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.GET.get(self.cursor_query_param)
+
+        if encoded is None:
+            return None
+
+        try:
+            position = json.loads(b64decode(encoded.encode('ascii')))
+        except (TypeError, ValueError, BinasciiError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list):
+            raise NotFound(self.invalid_cursor_message)
+        elif len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position
+
+    def encode_cursor(self, row):
+        position = []
+
+        for field in self.ordering:
+            name = field.lstrip('-')
+
+            if isinstance(row, dict):
+                value = row[name]
+            else:
+                value = getattr(row, name)
+
+            if isinstance(value, datetime):
+                value = value.isoformat()
+
+            position.append(value)
+
+        return b64encode(json.dumps(position).encode()).decode('ascii')
+
+    def get_position_query(self, position):
+        """Match the rows that come after ``position`` in the ordering."""
+        query = Q()
+        equal = Q()
+
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+
+            query |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+
+        return query
+
+    async def paginate_queryset(self, queryset, request):
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        if position is not None:
+            try:
+                queryset = queryset.filter(
+                    self.get_position_query(position)
+                )
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        queryset = queryset.order_by(*self.ordering)[:page_size + 1]
+
+        page = [row async for row in queryset.aiterator()]
+
+        self.next_row = page[page_size - 1] if len(page) > page_size else None
+
+        return page[:page_size]
+
+    def get_next_link(self):
+        if self.next_row is None:
+            return None
+
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            self.encode_cursor(self.next_row)
+        )
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'results': data
+        }
@@ -7,3 +7,11 @@ class IsAdminOrReadOnly(permissions.BasePermission):
             return True
 
         return bool(request.user and request.user.is_staff)
+
+
+class IsOwnerOrAdmin(permissions.BasePermission):
+    def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+
+        return bool(request.user.is_staff or obj.user_id == request.user.id)
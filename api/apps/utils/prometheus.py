@@ -0,0 +1,97 @@
+import os
+
+from api.apps.core.models import Allocation
+
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    multiprocess
+)
+from prometheus_client.core import GaugeMetricFamily
+
+
+REQUESTS = Counter(
+    'api_requests',
+    'Requests by view, method and status.',
+    ('view', 'method', 'status')
+)
+
+REQUEST_DURATION = Histogram(
+    'api_request_duration_seconds',
+    'Request latency by view, method and status.',
+    ('view', 'method', 'status')
+)
+
+REQUEST_QUERIES = Histogram(
+    'api_request_queries',
+    'SQL queries per request by view.',
+    ('view',),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+)
+
+REQUEST_DB_DURATION = Histogram(
+    'api_request_db_duration_seconds',
+    'Database time per request by view.',
+    ('view',)
+)
+
+CACHE_REQUESTS = Counter(
+    'api_cache_requests',
+    'Cache lookups by cache and result, hit or miss.',
+    ('cache', 'result')
+)
+
+JWT_TOKENS = Counter(
+    'api_jwt_tokens',
+    'Access tokens issued, by grant: password or refresh.',
+    ('grant',)
+)
+
+
+class ActiveAllocationsCollector:
+    """Count the open allocations when the metrics are scraped."""
+
+    name = 'api_active_allocations'
+    documentation = 'Allocations that were not returned yet.'
+
+    def describe(self):
+        # Registering a collector without describe() would query the
+        # database at import time.
+        yield GaugeMetricFamily(self.name, self.documentation)
+
+    def collect(self):
+        yield GaugeMetricFamily(
+            self.name,
+            self.documentation,
+            value=Allocation.objects.filter(return_date__isnull=True).count()
+        )
+
+
+REGISTRY.register(ActiveAllocationsCollector())
+
+
+def observe_request(view, method, status, metrics, duration):
+    view = view or 'none'
+    status = str(status)
+
+    REQUESTS.labels(view, method, status).inc()
+    REQUEST_DURATION.labels(view, method, status).observe(duration)
+    REQUEST_QUERIES.labels(view).observe(metrics.queries)
+    REQUEST_DB_DURATION.labels(view).observe(metrics.db_time)
+
+
+def get_registry():
+    """
+    Return the registry of this process or, under gunicorn with
+    ``PROMETHEUS_MULTIPROC_DIR`` set, one aggregating every worker.
+    """
+    if 'PROMETHEUS_MULTIPROC_DIR' not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(ActiveAllocationsCollector())
+
+    return registry
@@ -0,0 +1,48 @@
+from rest_framework import renderers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    Render JSON with orjson when it is installed.
+
+    The output matches REST framework's renderer: datetimes, dates, times and
+    UUIDs are encoded natively with UTC as ``Z``, and the other types fall
+    back to REST framework's encoder, e.g. Decimals become numbers. Indented
+    output and non-compact settings use the stdlib renderer. Unlike the
+    stdlib with ``STRICT_JSON``, orjson writes NaN and infinity as null.
+    """
+
+    if orjson is not None:
+        options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+
+        if orjson is None or indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        elif self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=self.options
+        )
+
+        # Escape U+2028 and U+2029 like REST framework, so the output is
+        # still a strict JavaScript subset.
+        return ret.replace(
+            '\u2028'.encode(),
+            b'\\u2028'
+        ).replace(
+            '\u2029'.encode(),
+            b'\\u2029'
+        )
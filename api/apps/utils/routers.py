@@ -0,0 +1,49 @@
+from contextvars import ContextVar
+from contextlib import contextmanager
+
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    connections
+)
+
+
+REPLICA_DB_ALIAS = 'replica'
+
+use_primary = ContextVar('use_primary', default=False)
+
+
+@contextmanager
+def primary():
+    """Send the reads of the block to the primary database."""
+    token = use_primary.set(True)
+
+    try:
+        yield
+    finally:
+        use_primary.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Route reads to the replica database and writes to the primary.
+
+    Reads go to the primary inside ``primary()`` blocks, which the replica
+    middleware opens for unsafe requests and for users who wrote recently,
+    and inside transactions, which must see their own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        if use_primary.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same rows.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,69 @@
+from api.apps.core.lookups import ImmutableUnaccent
+from api.apps.utils.pagination import SearchCursorPagination
+
+from django.db.models import (
+    FloatField,
+    Value
+)
+from django.db.models.functions import (
+    Cast,
+    Upper
+)
+from django.contrib.postgres.search import TrigramWordSimilarity
+
+
+def search_queryset(queryset, term, field='name'):
+    """
+    Filter and annotate ``queryset`` with the trigram similarity of
+    ``field`` to ``term``.
+
+    The search expression matches the GIN trigram index on ``field``.
+    """
+    expression = Upper(ImmutableUnaccent(field))
+    term = Upper(Value(term))
+
+    # ImmutableUnaccent is bilateral, so the lookup unaccents the term.
+    return queryset.alias(
+        search_name=expression
+    ).filter(
+        search_name__trigram_word_similar=term
+    ).annotate(
+        # The similarity is a real. Cursors compare it with the double read
+        # back from a previous page, which would not be equal to the real,
+        # skipping or repeating the rows tied on the page boundary.
+        similarity=Cast(
+            TrigramWordSimilarity(ImmutableUnaccent(term), expression),
+            FloatField()
+        )
+    )
+
+
+class TrigramSearchMixin:
+    """Rank list results by trigram similarity to the ``search`` parameter."""
+
+    search_field = 'name'
+    search_pagination_class = SearchCursorPagination
+
+    @property
+    def search_term(self):
+        if self.action != 'list':
+            return None
+
+        return self.request.query_params.get('search')
+
+    @property
+    def paginator(self):
+        if self.search_term and not hasattr(self, '_paginator'):
+            self._paginator = self.search_pagination_class()
+
+        return super().paginator
+
+    def search_queryset(self, queryset):
+        return search_queryset(queryset, self.search_term, self.search_field)
+
+    def values_queryset(self, queryset, fields):
+        """Select ``fields`` and the columns of the pagination ordering."""
+        if self.search_term:
+            fields = (*fields, 'similarity')
+
+        return queryset.values(*fields)
@@ -0,0 +1,36 @@
+from django.utils.functional import cached_property
+
+from rest_framework import serializers
+
+
+class ValuesListSerializer(serializers.BaseSerializer):
+    """
+    Read-only list representation of ``.values()`` rows.
+
+    It renders the same output as the model serializer it mirrors without
+    instantiating models or running per-field ``to_representation``.
+    ``fields`` are the output fields in order and ``staff_fields`` those
+    only staff users see.
+    """
+
+    fields = ()
+    staff_fields = ()
+
+    @classmethod
+    def get_visible_fields(cls, user):
+        return tuple(
+            field for field in cls.fields
+            if user.is_staff or field not in cls.staff_fields
+        )
+
+    @classmethod
+    def get_values(cls, user):
+        """Return the columns to select for ``user``."""
+        return cls.get_visible_fields(user)
+
+    @cached_property
+    def visible_fields(self):
+        return self.get_visible_fields(self.context['request'].user)
+
+    def to_representation(self, row):
+        return {field: row[field] for field in self.visible_fields}
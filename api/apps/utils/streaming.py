@@ -0,0 +1,118 @@
+import re
+
+from gzip import GzipFile
+
+from asgiref.sync import sync_to_async
+
+from django import http
+from django.core.handlers import asgi
+from django.utils.cache import patch_vary_headers
+from django.utils.text import (
+    StreamingBuffer,
+    compress_sequence
+)
+
+
+re_accepts_gzip = re.compile(r'\bgzip\b')
+
+
+async def acompress_sequence(sequence):
+    """Async version of ``django.utils.text.compress_sequence``."""
+    buffer = StreamingBuffer()
+
+    with GzipFile(mode='wb', compresslevel=6, fileobj=buffer, mtime=0) as file:
+        # Output headers.
+        yield buffer.read()
+
+        async for item in sequence:
+            file.write(item)
+            data = buffer.read()
+
+            if data:
+                yield data
+
+    yield buffer.read()
+
+
+class AsyncStreamingHttpResponse(http.StreamingHttpResponse):
+    """
+    Streaming response with an async version of its content.
+
+    Django 4.1 iterates streaming responses synchronously, from the event
+    loop under ASGI, so content reading the database would stall every
+    other request of the worker. The ``ASGIHandler`` below sends the async
+    content instead. WSGI servers and the test client read the sync one.
+    """
+
+    def __init__(self, streaming_content, async_streaming_content, *args,
+                 **kwargs):
+        super().__init__(streaming_content, *args, **kwargs)
+
+        self.async_streaming_content = self.aencode(async_streaming_content)
+
+    async def aencode(self, content):
+        async for part in content:
+            yield self.make_bytes(part)
+
+    def gzip(self, request):
+        """Compress both contents, like ``GZipMiddleware``, if accepted."""
+        patch_vary_headers(self, ('Accept-Encoding',))
+
+        if not re_accepts_gzip.search(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        ):
+            return
+
+        self.streaming_content = compress_sequence(self.streaming_content)
+        self.async_streaming_content = acompress_sequence(
+            self.async_streaming_content
+        )
+        self['Content-Encoding'] = 'gzip'
+
+
+class ASGIHandler(asgi.ASGIHandler):
+    """ASGI handler sending async streaming responses from the event loop."""
+
+    async def send_response(self, response, send):
+        if not isinstance(response, AsyncStreamingHttpResponse):
+            return await super().send_response(response, send)
+
+        # As in ASGIHandler.send_response, but iterating the async content.
+        headers = []
+
+        for header, value in response.items():
+            if isinstance(header, str):
+                header = header.encode('ascii')
+            if isinstance(value, str):
+                value = value.encode('latin1')
+
+            headers.append((bytes(header), bytes(value)))
+
+        for cookie in response.cookies.values():
+            headers.append(
+                (
+                    b'Set-Cookie',
+                    cookie.output(header='').encode('ascii').strip()
+                )
+            )
+
+        await send(
+            {
+                'type': 'http.response.start',
+                'status': response.status_code,
+                'headers': headers
+            }
+        )
+
+        async for part in response.async_streaming_content:
+            for chunk, _ in self.chunk_bytes(part):
+                await send(
+                    {
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': True
+                    }
+                )
+
+        await send({'type': 'http.response.body'})
+        await sync_to_async(response.close, thread_sensitive=True)()
@@ -1,10 +1,30 @@
+import json
+
+from io import StringIO
 from unittest.mock import patch
 
 from psycopg2 import OperationalError as Psycopg2OpError
 
-from django.core.management import call_command
+from django.core.management import (
+    CommandError,
+    call_command
+)
 from django.db.utils import OperationalError
-from django.test import SimpleTestCase
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase
+)
+from django.contrib.auth import get_user_model
+
+from api.apps.core.models import (
+    Resource,
+    Allocation
+)
+from api.apps.utils.management.commands.seed_data import (
+    ADMIN_EMAIL,
+    BENCHMARK_EMAIL
+)
 
 
 @patch('api.apps.utils.management.commands.wait_for_db.Command.check')
@@ -28,3 +48,146 @@ class CommandTests(SimpleTestCase):
 
         self.assertEqual(patched_check.call_count, 6)
         patched_check.assert_called_with(databases=['default'])
+
+
+class ExplainQueriesCommandTests(TestCase):
+
+    def test_explain_queries(self):
+        """Test printing the plans of the API list queries."""
+        Allocation.objects.create(
+            resource=Resource.objects.create(name='Notebook'),
+            user=get_user_model().objects.create_user(
+                email='test@test.com',
+                password='testpass'
+            )
+        )
+
+        out = StringIO()
+
+        call_command('explain_queries', stdout=out)
+
+        output = out.getvalue()
+
+        self.assertIn('resource-list', output)
+        self.assertIn('allocation-list', output)
+        self.assertIn('user-list', output)
+        self.assertIn('actual time', output)
+
+
+class BenchmarkDbConnectionsCommandTests(TransactionTestCase):
+
+    def test_benchmark_db_connections(self):
+        """Test timing requests with and without persistent connections."""
+        out = StringIO()
+
+        call_command('benchmark_db_connections', requests=5, stdout=out)
+
+        output = out.getvalue()
+
+        self.assertIn('closed after each request', output)
+        self.assertIn('persistent', output)
+        self.assertNotIn('PgBouncer', output)
+
+    def test_benchmark_db_connections_with_invalid_pgbouncer(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_db_connections', pgbouncer='pgbouncer')
+
+
+class BenchmarkJsonCommandTests(SimpleTestCase):
+
+    def test_benchmark_json(self):
+        """Test timing the JSON renderers and parsers."""
+        out = StringIO()
+
+        call_command('benchmark_json', rows=10, repeat=2, stdout=out)
+
+        output = out.getvalue()
+
+        self.assertIn('resource list', output)
+        self.assertIn('allocation list', output)
+        self.assertEqual(output.count('identical output: True'), 2)
+
+
+class SeedDataCommandTests(TestCase):
+
+    def test_seed_data(self):
+        """Test seeding users, resources and allocation histories."""
+        call_command(
+            'seed_data',
+            users=5,
+            resources=20,
+            allocations=200,
+            open_ratio=0.5,
+            stdout=StringIO()
+        )
+
+        self.assertEqual(get_user_model().objects.count(), 5)
+        self.assertTrue(
+            get_user_model().objects.get(email=ADMIN_EMAIL).is_staff
+        )
+        self.assertFalse(
+            get_user_model().objects.get(email=BENCHMARK_EMAIL).is_staff
+        )
+        self.assertEqual(Resource.objects.count(), 20)
+        self.assertEqual(Allocation.objects.count(), 200)
+
+        open_allocations = Allocation.objects.filter(return_date__isnull=True)
+
+        self.assertTrue(open_allocations.exists())
+        self.assertEqual(
+            set(open_allocations.values_list('id', flat=True)),
+            set(
+                Resource.objects.filter(
+                    current_allocation__isnull=False
+                ).values_list('current_allocation_id', flat=True)
+            )
+        )
+
+        with self.assertRaises(CommandError):
+            call_command('seed_data', users=5, resources=20, allocations=0)
+
+
+class RunBenchmarksCommandTests(TransactionTestCase):
+
+    def test_run_benchmarks(self):
+        """Test reporting the latency of each route as JSON."""
+        call_command(
+            'seed_data',
+            users=5,
+            resources=20,
+            allocations=100,
+            open_ratio=0.5,
+            stdout=StringIO()
+        )
+
+        out = StringIO()
+
+        call_command(
+            'run_benchmarks',
+            requests=4,
+            concurrency=2,
+            warmup=1,
+            stdout=out
+        )
+
+        report = json.loads(out.getvalue())
+
+        self.assertIn('token-obtain', report['routes'])
+        self.assertIn('allocation-create', report['routes'])
+
+        for name, route in report['routes'].items():
+            self.assertEqual(route['errors'], 0, name)
+            self.assertGreater(route['queries_per_request'], 0, name)
+            self.assertLessEqual(
+                route['latency_ms']['p50'],
+                route['latency_ms']['p99']
+            )
+
+        # The created allocations were returned.
+        self.assertFalse(
+            Allocation.objects.filter(
+                return_date__isnull=True
+            ).exclude(
+                id__in=Resource.objects.values('current_allocation_id')
+            ).exists()
+        )
@@ -0,0 +1,98 @@
+import json
+
+from api.apps.core.models import Resource
+from api.apps.utils import metrics
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import (
+    modify_settings,
+    override_settings
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+RESOURCES_URL = reverse('resource_allocation:resource-list')
+
+MIDDLEWARE = 'api.apps.utils.middleware.request_metrics_middleware'
+
+
+@override_settings(REQUEST_METRICS=True)
+@modify_settings(MIDDLEWARE={'prepend': MIDDLEWARE})
+class RequestMetricsMiddlewareTests(APITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        metrics.install()
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            name='Test Báz',
+            email='test@test.com',
+            password='testpass'
+        )
+        self.resource = Resource.objects.create(name='Notebook')
+
+        self.client.force_authenticate(self.user)
+
+    def get_log(self, logs, index=0):
+        record = logs.records[index]
+
+        return record.levelname, json.loads(record.getMessage())
+
+    def test_list_metrics(self):
+        with self.assertLogs('api.requests', 'INFO') as logs, \
+                CaptureQueriesContext(connection) as queries:
+            response = self.client.get(RESOURCES_URL)
+
+        level, log = self.get_log(logs)
+
+        self.assertEqual(level, 'INFO')
+        self.assertEqual(log['view'], 'resource-list')
+        self.assertEqual(log['status'], 200)
+        self.assertEqual(log['queries'], len(queries))
+        self.assertIsInstance(log['serializer_ms'], float)
+        self.assertFalse(log['over_query_budget'])
+
+        server_timing = response['Server-Timing']
+
+        self.assertIn(f'desc="{len(queries)} queries"', server_timing)
+        self.assertIn('serializer;dur=', server_timing)
+        self.assertIn('total;dur=', server_timing)
+
+    def test_action_view_names(self):
+        with self.assertLogs('api.requests', 'INFO') as logs:
+            self.client.post(
+                reverse(
+                    'resource_allocation:allocation-list',
+                    args=[self.resource.id]
+                )
+            )
+            self.client.get(
+                reverse(
+                    'resource_allocation:resource-allocation-status',
+                    args=[self.resource.id]
+                )
+            )
+            self.client.get(reverse('user:me'))
+
+        self.assertEqual(
+            [self.get_log(logs, index)[1]['view'] for index in range(3)],
+            ['allocation-create', 'resource-allocation-status', 'me']
+        )
+
+    @override_settings(REQUEST_METRICS_QUERY_BUDGET=1)
+    def test_over_query_budget(self):
+        with self.assertLogs('api.requests', 'INFO') as logs:
+            self.client.get(RESOURCES_URL)
+
+        level, log = self.get_log(logs)
+
+        self.assertEqual(level, 'WARNING')
+        self.assertTrue(log['over_query_budget'])
@@ -0,0 +1,90 @@
+import uuid
+
+from io import BytesIO
+from decimal import Decimal
+from datetime import (
+    date,
+    datetime,
+    timezone
+)
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from rest_framework import (
+    parsers,
+    renderers
+)
+from rest_framework.exceptions import ParseError
+
+from api.apps.utils.renderers import JSONRenderer
+from api.apps.utils.parsers import JSONParser
+
+
+DATA = {
+    'id': 1,
+    'name': 'Notebook\u2028',
+    'allocation_date': datetime(2023, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc),
+    'return_date': None,
+    'date': date(2023, 1, 2),
+    'price': Decimal('10.50'),
+    'uuid': uuid.UUID('12345678123456781234567812345678'),
+    'tags': ('a', 'b')
+}
+
+
+class JSONRendererTests(SimpleTestCase):
+
+    def test_render_matches_rest_framework(self):
+        self.assertEqual(
+            JSONRenderer().render(DATA),
+            renderers.JSONRenderer().render(DATA)
+        )
+
+    def test_render_escapes_line_separators(self):
+        self.assertIn(b'Notebook\\u2028', JSONRenderer().render(DATA))
+
+    def test_render_indented(self):
+        self.assertEqual(
+            JSONRenderer().render(DATA, 'application/json; indent=4'),
+            renderers.JSONRenderer().render(
+                DATA,
+                'application/json; indent=4'
+            )
+        )
+
+    def test_render_none(self):
+        self.assertEqual(JSONRenderer().render(None), b'')
+
+    @patch('api.apps.utils.renderers.orjson', None)
+    def test_render_without_orjson(self):
+        self.assertEqual(
+            JSONRenderer().render(DATA),
+            renderers.JSONRenderer().render(DATA)
+        )
+
+
+class JSONParserTests(SimpleTestCase):
+
+    def test_parse(self):
+        content = b'{"resources": [1, 2], "name": "Notebook"}'
+
+        self.assertEqual(
+            JSONParser().parse(BytesIO(content)),
+            parsers.JSONParser().parse(BytesIO(content))
+        )
+
+    def test_parse_invalid_json(self):
+        with self.assertRaises(ParseError):
+            JSONParser().parse(BytesIO(b'{"name": '))
+
+    def test_parse_nan(self):
+        with self.assertRaises(ParseError):
+            JSONParser().parse(BytesIO(b'{"value": NaN}'))
+
+    @patch('api.apps.utils.parsers.orjson', None)
+    def test_parse_without_orjson(self):
+        self.assertEqual(
+            JSONParser().parse(BytesIO(b'{"name": "Notebook"}')),
+            {'name': 'Notebook'}
+        )
@@ -0,0 +1,142 @@
+from api.apps.core.models import Resource
+from api.apps.utils.middleware import (
+    check_sticky_cache,
+    replica_middleware
+)
+from api.apps.utils.routers import (
+    ReplicaRouter,
+    primary,
+    use_primary
+)
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings
+)
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+User = get_user_model()
+
+
+class ReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_from_replica(self):
+        """Test reads go to the replica and writes to the primary."""
+        self.assertEqual(self.router.db_for_read(Resource), 'replica')
+        self.assertEqual(self.router.db_for_write(Resource), 'default')
+
+    def test_reads_from_primary(self):
+        """Test reads go to the primary inside primary blocks."""
+        with primary():
+            self.assertEqual(self.router.db_for_read(Resource), 'default')
+
+        self.assertEqual(self.router.db_for_read(Resource), 'replica')
+
+    def test_migrates_primary(self):
+        """Test only the primary is migrated."""
+        self.assertTrue(self.router.allow_migrate('default', 'core'))
+        self.assertFalse(self.router.allow_migrate('replica', 'core'))
+
+
+class ReplicaRouterTransactionTests(TestCase):
+
+    def test_reads_in_transaction(self):
+        """Test reads inside transactions go to the primary."""
+        with transaction.atomic():
+            self.assertEqual(
+                ReplicaRouter().db_for_read(Resource),
+                'default'
+            )
+
+
+class ReplicaMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.factory = RequestFactory()
+        self.middleware = replica_middleware(self.get_response)
+
+    def get_response(self, request):
+        self.used_primary = use_primary.get()
+
+        return HttpResponse()
+
+    def send(self, method, user_id=1, **headers):
+        if user_id is not None:
+            token = AccessToken.for_user(User(id=user_id))
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+
+        self.middleware(getattr(self.factory, method)('/', **headers))
+
+        return self.used_primary
+
+    def test_safe_request(self):
+        """Test safe requests read from the replica."""
+        self.assertFalse(self.send('get'))
+        self.assertFalse(self.send('get', user_id=None))
+
+    def test_unsafe_request(self):
+        """Test unsafe requests read from the primary."""
+        self.assertTrue(self.send('post'))
+        self.assertTrue(self.send('patch', user_id=None))
+
+    def test_sticky_primary(self):
+        """Test users read from the primary after they write."""
+        self.send('post')
+
+        self.assertTrue(self.send('get'))
+        self.assertFalse(self.send('get', user_id=2))
+        self.assertFalse(self.send('get', user_id=None))
+
+    @override_settings(REPLICA_STICKY_SECONDS=0)
+    def test_sticky_primary_expired(self):
+        """Test users read from the replica once the window is over."""
+        self.send('post')
+
+        self.assertFalse(self.send('get'))
+
+    def test_invalid_token(self):
+        """Test invalid tokens do not keep users on the primary."""
+        self.send('post', user_id=None, HTTP_AUTHORIZATION='Bearer invalid')
+
+        self.assertFalse(
+            self.send('get', user_id=None, HTTP_AUTHORIZATION='Bearer invalid')
+        )
+
+
+class ReplicaCacheTests(SimpleTestCase):
+
+    @override_settings(DATABASE_REPLICA_HOST='replica')
+    def test_local_memory_cache_is_refused(self):
+        """Test a replica requires a shared cache for the sticky users."""
+        with self.assertRaises(ImproperlyConfigured):
+            check_sticky_cache()
+
+    @override_settings(
+        DATABASE_REPLICA_HOST='replica',
+        REPLICA_STICKY_CACHE='shared',
+        CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
+            },
+            'shared': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': '/tmp/replica-sticky'
+            }
+        }
+    )
+    def test_shared_cache_is_accepted(self):
+        check_sticky_cache()
@@ -0,0 +1,76 @@
+import gzip
+
+from asgiref.sync import async_to_sync
+
+from django.test import (
+    RequestFactory,
+    SimpleTestCase
+)
+
+from api.apps.utils.streaming import (
+    ASGIHandler,
+    AsyncStreamingHttpResponse
+)
+
+
+def chunks():
+    yield 'sync\n'
+
+
+async def achunks():
+    yield 'async\n'
+    yield 'content\n'
+
+
+class AsyncStreamingHttpResponseTests(SimpleTestCase):
+
+    def send(self, response):
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        async_to_sync(ASGIHandler().send_response)(response, send)
+
+        return messages
+
+    def test_send_async_content(self):
+        """Test the ASGI handler sends the async content."""
+        messages = self.send(AsyncStreamingHttpResponse(chunks(), achunks()))
+
+        self.assertEqual(messages[0]['type'], 'http.response.start')
+        self.assertEqual(
+            b''.join(message.get('body', b'') for message in messages[1:]),
+            b'async\ncontent\n'
+        )
+        self.assertNotIn('more_body', messages[-1])
+
+    def test_sync_content(self):
+        """Test WSGI servers read the sync content."""
+        response = AsyncStreamingHttpResponse(chunks(), achunks())
+
+        self.assertEqual(b''.join(response), b'sync\n')
+
+    def test_gzip(self):
+        """Test both contents are compressed when gzip is accepted."""
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+        response = AsyncStreamingHttpResponse(chunks(), achunks())
+
+        response.gzip(request)
+        messages = self.send(response)
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(
+            gzip.decompress(
+                b''.join(message.get('body', b'') for message in messages[1:])
+            ),
+            b'async\ncontent\n'
+        )
+
+    def test_gzip_not_accepted(self):
+        response = AsyncStreamingHttpResponse(chunks(), achunks())
+
+        response.gzip(RequestFactory().get('/'))
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
@@ -0,0 +1,132 @@
+import json
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    modify_settings,
+    override_settings
+)
+from django.urls import reverse
+
+from api.apps.core.models import (
+    Allocation,
+    Resource
+)
+from api.apps.utils import (
+    metrics,
+    views
+)
+
+User = get_user_model()
+
+DOCUMENTATION_URL = reverse('documentation')
+DOCUMENTATION_JSON_URL = reverse('documentation-json')
+METRICS_URL = reverse('metrics')
+
+MIDDLEWARE = 'api.apps.utils.middleware.request_metrics_middleware'
+
+
+class DocumentationViewTests(SimpleTestCase):
+
+    def setUp(self):
+        views._specs.clear()
+
+    def test_documentation(self):
+        """Test rendering the documentation page."""
+        response = self.client.get(DOCUMENTATION_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+    def test_documentation_json(self):
+        """Test serving the raw spec as JSON."""
+        response = self.client.get(DOCUMENTATION_JSON_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('openapi', json.loads(response.content))
+
+    def test_documentation_not_modified(self):
+        """Test revalidating the documentation with its ETag."""
+        response = self.client.get(DOCUMENTATION_JSON_URL)
+
+        response = self.client.get(
+            DOCUMENTATION_JSON_URL,
+            HTTP_IF_NONE_MATCH=response['ETag']
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    @patch('api.apps.utils.views.yaml.safe_load', wraps=views.yaml.safe_load)
+    def test_spec_parsed_once(self, patched_safe_load):
+        """Test parsing the spec file only once per process."""
+        self.client.get(DOCUMENTATION_URL)
+        self.client.get(DOCUMENTATION_JSON_URL)
+
+        patched_safe_load.assert_called_once()
+
+
+@override_settings(PROMETHEUS_METRICS=True)
+@modify_settings(MIDDLEWARE={'prepend': MIDDLEWARE})
+class MetricsViewTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+
+        metrics.install()
+
+    def test_metrics(self):
+        """Test serving the request, token and allocation metrics."""
+        user = User.objects.create_user(
+            email='test@test.com',
+            password='testpass',
+            name='Test'
+        )
+        Allocation.objects.create(
+            resource=Resource.objects.create(name='Notebook'),
+            user=user
+        )
+
+        self.client.post(
+            reverse('user:token_obtain_pair'),
+            {'email': 'test@test.com', 'password': 'testpass'}
+        )
+
+        response = self.client.get(METRICS_URL)
+        content = response.content.decode()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'api_requests_total{view="token_obtain_pair",method="POST",'
+            'status="200"}',
+            content
+        )
+        self.assertIn('api_jwt_tokens_total{grant="password"}', content)
+        self.assertIn('api_active_allocations 1.0', content)
+
+    @override_settings(PROMETHEUS_METRICS=False)
+    def test_metrics_disabled(self):
+        """Test the metrics are not served unless enabled."""
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(PROMETHEUS_METRICS_TOKEN='secret')
+    def test_metrics_token(self):
+        """Test the metrics require the token when one is set."""
+        response = self.client.get(METRICS_URL)
+
+        self.assertEqual(response.status_code, 401)
+
+        response = self.client.get(
+            METRICS_URL,
+            HTTP_AUTHORIZATION='Bearer secret'
+        )
+
+        self.assertEqual(response.status_code, 200)
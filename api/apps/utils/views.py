@@ -1,22 +1,111 @@
+import os
 import json
 import yaml
+import hashlib
+import secrets
+
+from collections import namedtuple
+from datetime import (
+    datetime,
+    timezone
+)
 
 from django.core.exceptions import ImproperlyConfigured
+from django.views.decorators.http import (
+    condition,
+    require_GET
+)
+from django.http import (
+    Http404,
+    HttpResponse
+)
 from django.shortcuts import render
 from django.conf import settings
 
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    generate_latest
+)
 
-def documentation(request):
-    if hasattr(settings, 'SWAGGER_YAML_FILE'):
-        file = open(settings.SWAGGER_YAML_FILE)
-        spec = yaml.safe_load(file.read())
-
-        return render(
-            request,
-            template_name="utils/swagger-ui.html",
-            context={'data': json.dumps(spec)}
-        )
-    else:
+from api.apps.utils.prometheus import get_registry
+
+
+Spec = namedtuple('Spec', ('mtime', 'data', 'etag', 'last_modified'))
+
+_specs = {}
+
+
+def get_spec():
+    """
+    Return the documentation spec serialized as JSON.
+
+    The YAML file is parsed once per process and again only when its
+    modification time changes.
+    """
+    if not hasattr(settings, 'SWAGGER_YAML_FILE'):
         raise ImproperlyConfigured(
             'You should define SWAGGER_YAML_FILE in your settings'
         )
+
+    path = settings.SWAGGER_YAML_FILE
+    mtime = os.stat(path).st_mtime_ns
+    spec = _specs.get(path)
+
+    if spec is None or spec.mtime != mtime:
+        with open(path) as file:
+            data = json.dumps(yaml.safe_load(file))
+
+        spec = Spec(
+            mtime=mtime,
+            data=data,
+            etag=hashlib.sha1(data.encode()).hexdigest(),
+            last_modified=datetime.fromtimestamp(
+                mtime / 1e9,
+                tz=timezone.utc
+            )
+        )
+        _specs[path] = spec
+
+    return spec
+
+
+def spec_etag(request):
+    return get_spec().etag
+
+
+def spec_last_modified(request):
+    return get_spec().last_modified
+
+
+@condition(etag_func=spec_etag, last_modified_func=spec_last_modified)
+def documentation(request):
+    return render(
+        request,
+        template_name="utils/swagger-ui.html",
+        context={'data': get_spec().data}
+    )
+
+
+@condition(etag_func=spec_etag, last_modified_func=spec_last_modified)
+def documentation_json(request):
+    return HttpResponse(get_spec().data, content_type='application/json')
+
+
+@require_GET
+def metrics(request):
+    """Serve the Prometheus metrics, when ``PROMETHEUS_METRICS`` is set."""
+    if not settings.PROMETHEUS_METRICS:
+        raise Http404
+
+    token = settings.PROMETHEUS_METRICS_TOKEN
+
+    if token and not secrets.compare_digest(
+        request.headers.get('Authorization', ''),
+        f'Bearer {token}'
+    ):
+        return HttpResponse(status=401)
+
+    return HttpResponse(
+        generate_latest(get_registry()),
+        content_type=CONTENT_TYPE_LATEST
+    )
@@ -9,8 +9,21 @@ https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+
+from django.conf import settings
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api.settings')
 
-application = get_asgi_application()
+# As get_asgi_application(), with the handler streaming async responses.
+django.setup(set_prefix=False)
+
+from api.apps.utils.streaming import ASGIHandler  # noqa: E402
+
+application = ASGIHandler()
+
+if settings.DEBUG:
+    from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+
+    # Serve the admin static files like runserver does in development.
+    application = ASGIStaticFilesHandler(application)
@@ -1,3 +1,5 @@
+import os
+
 from pathlib import Path
 from decouple import (
     config,
@@ -43,6 +45,46 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per request query counts and timings, in Server-Timing headers and logs.
+REQUEST_METRICS = config('REQUEST_METRICS', default=False, cast=bool)
+
+# Requests running more queries are logged as warnings, 0 disables it.
+REQUEST_METRICS_QUERY_BUDGET = config(
+    'REQUEST_METRICS_QUERY_BUDGET',
+    default=0,
+    cast=int
+)
+
+# Prometheus metrics at /metrics. Under gunicorn, set
+# PROMETHEUS_MULTIPROC_DIR to aggregate the metrics of every worker.
+PROMETHEUS_METRICS = config('PROMETHEUS_METRICS', default=False, cast=bool)
+
+# Scrapers must send it as a bearer token, when set.
+PROMETHEUS_METRICS_TOKEN = config('PROMETHEUS_METRICS_TOKEN', default='')
+
+if REQUEST_METRICS or PROMETHEUS_METRICS:
+    MIDDLEWARE.insert(
+        0,
+        'api.apps.utils.middleware.request_metrics_middleware'
+    )
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler'
+        }
+    },
+    'loggers': {
+        'api.requests': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False
+        }
+    }
+}
+
 ROOT_URLCONF = 'api.urls'
 
 TEMPLATES = [
@@ -73,10 +115,82 @@ DATABASES = {
         'USER': config('POSTGRES_USER'),
         'PASSWORD': config('POSTGRES_PASSWORD'),
         'HOST': config('DATABASE_HOST'),
-        'PORT': config('DATABASE_PORT')
+        'PORT': config('DATABASE_PORT'),
+        # Seconds a connection is reused across requests, 0 closes it at the
+        # end of each request. Keep it at 0 under ASGI, where requests do not
+        # share threads, and pool through PgBouncer instead.
+        'CONN_MAX_AGE': config('DATABASE_CONN_MAX_AGE', default=0, cast=int),
+        'CONN_HEALTH_CHECKS': config(
+            'DATABASE_CONN_HEALTH_CHECKS',
+            default=True,
+            cast=bool
+        ),
+        # PgBouncer's transaction pooling cannot keep the server-side cursors
+        # of QuerySet.iterator() open across transactions.
+        'DISABLE_SERVER_SIDE_CURSORS': config(
+            'DATABASE_PGBOUNCER',
+            default=False,
+            cast=bool
+        )
     }
 }
 
+# Safe requests read from the replica, when one is configured. Users are kept
+# on the primary for REPLICA_STICKY_SECONDS after a write, so they read their
+# own writes despite the replication lag.
+DATABASE_REPLICA_HOST = config('DATABASE_REPLICA_HOST', default='')
+
+if DATABASE_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': DATABASE_REPLICA_HOST,
+        'PORT': config(
+            'DATABASE_REPLICA_PORT',
+            default=DATABASES['default']['PORT']
+        ),
+        # Tests run against the primary only.
+        'TEST': {'MIRROR': 'default'}
+    }
+    DATABASE_ROUTERS = ['api.apps.utils.routers.ReplicaRouter']
+    MIDDLEWARE.append('api.apps.utils.middleware.replica_middleware')
+
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=5, cast=int)
+
+# Writes must be visible to every process, so local memory caches are refused
+# along with a replica.
+REPLICA_STICKY_CACHE = config('REPLICA_STICKY_CACHE', default='default')
+
+
+# Cache
+
+CACHES = {
+    'default': {
+        'BACKEND': config(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': config('CACHE_LOCATION', default='')
+    }
+}
+
+# Cache the allocation status of the resources. Invalidations must reach every
+# process, so the cache is disabled by default and local memory caches are
+# refused.
+ALLOCATION_STATUS_CACHE = config('ALLOCATION_STATUS_CACHE', default='')
+
+ALLOCATION_STATUS_CACHE_TIMEOUT = config(
+    'ALLOCATION_STATUS_CACHE_TIMEOUT',
+    default=300,
+    cast=int
+)
+
+# Authenticate requests from the access token claims instead of loading the
+# user. Revoked claims must be visible to every process, so JWT_CLAIMS_CACHE
+# must be a shared cache backend, local memory caches are refused.
+JWT_CLAIMS_AUTH = config('JWT_CLAIMS_AUTH', default=False, cast=bool)
+
+JWT_CLAIMS_CACHE = config('JWT_CLAIMS_CACHE', default='default')
+
 
 # Password validation
 
@@ -96,6 +210,22 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Bulk user import
+
+USER_IMPORT_BATCH_SIZE = config(
+    'USER_IMPORT_BATCH_SIZE',
+    default=1000,
+    cast=int
+)
+
+# Processes hashing the passwords of the import_users command, the endpoint
+# hashes them in the request.
+USER_IMPORT_WORKERS = config(
+    'USER_IMPORT_WORKERS',
+    default=os.cpu_count() or 1,
+    cast=int
+)
+
 # Internationalization
 
 LANGUAGE_CODE = 'en-us'
@@ -117,10 +247,24 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        'api.apps.user.authentication.ClaimsJWTAuthentication',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'api.apps.utils.pagination.CursorPagination',
+    'PAGE_SIZE': config('PAGE_SIZE', default=20, cast=int)
 }
 
+# Render and parse JSON with orjson, when it is installed.
+if config('FAST_JSON', default=False, cast=bool):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'api.apps.utils.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer'
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = (
+        'api.apps.utils.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser'
+    )
+
 # Documentation
 
 SWAGGER_YAML_FILE = BASE_DIR / 'documentation/v1.yaml'
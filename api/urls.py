@@ -1,4 +1,8 @@
-from api.apps.utils.views import documentation
+from api.apps.utils.views import (
+    documentation,
+    documentation_json,
+    metrics
+)
 
 from django.contrib import admin
 from django.urls import (
@@ -12,7 +16,15 @@ urlpatterns = [
     path('admin/', admin.site.urls),
 
     # Documentation
-    path('documentation/', documentation, name="documentation")
+    path('documentation/', documentation, name="documentation"),
+    path(
+        'documentation/v1.json',
+        documentation_json,
+        name="documentation-json"
+    ),
+
+    # Monitoring
+    path('metrics', metrics, name="metrics")
 ]
 
 
@@ -20,6 +32,10 @@ urlpatterns = [
 urlpatterns += [
     path('api/v1/', include(
         [
+            path(
+                'async/',
+                include('api.apps.resource_allocation.async_urls')
+            ),
             path('', include('api.apps.resource_allocation.urls')),
             path('users/', include('api.apps.user.urls'))
         ]
@@ -0,0 +1,52 @@
+"""
+Gunicorn configuration serving ``api.asgi:application`` with Uvicorn workers.
+
+Each worker runs an event loop, so the async views handle many concurrent
+slow clients without a thread each. Sync views still run in a thread per
+request. Usage:
+
+    gunicorn -c gunicorn.conf.py api.asgi:application
+"""
+import os
+import shutil
+import multiprocessing
+
+from decouple import config
+
+
+bind = config('GUNICORN_BIND', default='0.0.0.0:8000')
+
+workers = config(
+    'WEB_CONCURRENCY',
+    default=multiprocessing.cpu_count(),
+    cast=int
+)
+
+worker_class = 'uvicorn.workers.UvicornWorker'
+
+# Slow clients are held by the event loop, so only hung workers time out.
+timeout = config('GUNICORN_TIMEOUT', default=30, cast=int)
+
+graceful_timeout = 30
+
+keepalive = 5
+
+reload = config('DEBUG', default=False, cast=bool)
+
+accesslog = '-'
+
+
+def on_starting(server):
+    # Metrics of a previous run would be aggregated with the new ones.
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+
+def child_exit(server, worker):
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)